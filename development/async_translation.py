@@ -0,0 +1,112 @@
+"""
+Async Translation Facade
+Keeps network translation lookups off the Tk main thread: cached and
+dictionary translations come back immediately, everything else is
+resolved in the background and delivered through a callback
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional
+
+from translation_service import TranslationService
+
+# Shown in the UI until a background lookup finishes
+TRANSLATION_PENDING_TEXT = "henter oversettelse…"
+
+# After a failed background lookup, the word gets the placeholder for this long
+# instead of a new lookup (views redraw on delivery and would ask again at once)
+FAILED_LOOKUP_RETRY_SECONDS = 60
+
+
+class AsyncTranslator:
+    """
+    Non-blocking front end for TranslationService. `schedule` runs a function
+    on the UI thread (for Tk: lambda fn: root.after(0, fn)).
+    """
+
+    def __init__(self, service: TranslationService, schedule: Callable[[Callable[[], None]], None],
+                 max_workers: int = 2):
+        self.service = service
+        self.schedule = schedule
+        self._callbacks: Dict[str, List[Callable[[str], None]]] = {}  # word -> waiting callbacks
+        self._failed: Dict[str, float] = {}  # word -> time.monotonic() of its failed lookup
+        self._lock = threading.Lock()
+        self._closed = False
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="translation")
+
+    def get(self, word: str, callback: Optional[Callable[[str], None]] = None) -> Optional[str]:
+        """Return the translation if it is available locally; otherwise start a
+        background lookup, return None and call callback(translation) later on
+        the UI thread"""
+        translation = self.service.lookup_local(word)
+        if translation is not None:
+            return translation
+
+        with self._lock:
+            if self._closed:
+                return None
+            failed_at = self._failed.get(word)
+            if failed_at is not None:
+                if time.monotonic() - failed_at < FAILED_LOOKUP_RETRY_SECONDS:
+                    return self.service.missing_translation(word)
+                del self._failed[word]
+            in_flight = word in self._callbacks
+            waiting = self._callbacks.setdefault(word, [])
+            if callback is not None:
+                waiting.append(callback)
+        if not in_flight:
+            self._executor.submit(self._resolve, [word])
+        return None
+
+    def prefetch(self, words: Iterable[str]):
+        """Resolve translations for upcoming words in one background batch"""
+        with self._lock:
+            if self._closed:
+                return
+            pending = [word for word in dict.fromkeys(words) if word not in self._callbacks]
+            for word in pending:
+                self._callbacks[word] = []
+        if pending:
+            self._executor.submit(self._resolve, pending)
+
+    def _resolve(self, words: List[str]):
+        try:
+            translations = self.service.get_translations(words)
+        except Exception as e:
+            print(f"Error fetching translations: {e}")
+            translations = {}
+
+        for word in words:
+            with self._lock:
+                callbacks = self._callbacks.pop(word, [])
+                if word not in translations:
+                    self._failed[word] = time.monotonic()
+            # Waiting views get the usual placeholder instead of the pending text
+            translation = translations.get(word) or self.service.missing_translation(word)
+            for callback in callbacks:
+                self._deliver(callback, translation)
+
+    def _deliver(self, callback: Callable[[str], None], translation: str):
+        def run():
+            try:
+                callback(translation)
+            except Exception as e:
+                print(f"Error updating translation: {e}")
+        try:
+            self.schedule(run)
+        except Exception as e:
+            # The UI may already be gone at shutdown
+            print(f"⚠️ Could not deliver translation: {e}")
+
+    def is_pending(self, word: str) -> bool:
+        with self._lock:
+            return word in self._callbacks
+
+    def shutdown(self):
+        """Stop accepting lookups and drop waiting callbacks"""
+        with self._lock:
+            self._closed = True
+            self._callbacks.clear()
+        self._executor.shutdown(wait=False, cancel_futures=True)
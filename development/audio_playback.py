@@ -0,0 +1,399 @@
+"""
+Audio Playback for PREPP-Lingo
+Decoded audio cache and playback backends that avoid re-decoding and
+re-spawning a player for every repeat of a word
+"""
+
+import os
+import threading
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from pydub import AudioSegment
+from pydub.playback import play as pydub_play
+
+try:
+    import pygame
+except ImportError:
+    pygame = None
+
+try:
+    import pyaudio
+except ImportError:
+    pyaudio = None
+
+
+class DecodedAudioCache:
+    """
+    Bounded LRU cache of decoded audio, keyed by file path and mtime
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # (path, mtime) -> AudioSegment
+        self._lock = threading.Lock()
+
+    def _make_key(self, audio_path: str) -> Tuple[str, float]:
+        return (os.path.abspath(audio_path), os.path.getmtime(audio_path))
+
+    def get(self, audio_path: str) -> AudioSegment:
+        """Return the decoded audio for a file, decoding it on a miss"""
+        key = self._make_key(audio_path)
+        with self._lock:
+            segment = self._entries.get(key)
+            if segment is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return segment
+            self.misses += 1
+
+        # Decode outside the lock so other lookups are not blocked
+        segment = AudioSegment.from_file(audio_path)
+        self._store(key, segment)
+        return segment
+
+    def contains(self, audio_path: str) -> bool:
+        """Check whether a file is already decoded (without counting a hit)"""
+        try:
+            key = self._make_key(audio_path)
+        except OSError:
+            return False
+        with self._lock:
+            return key in self._entries
+
+    def _store(self, key, segment: AudioSegment):
+        size = len(segment.raw_data)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return
+
+            # Drop stale entries for the same path (file was regenerated)
+            for old_key in [k for k in self._entries if k[0] == key[0]]:
+                self.current_bytes -= len(self._entries.pop(old_key).raw_data)
+
+            self._entries[key] = segment
+            self.current_bytes += size
+
+            # Evict least recently used entries, but always keep the newest one
+            while self.current_bytes > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self.current_bytes -= len(evicted.raw_data)
+
+    def clear(self):
+        """Drop all cached audio"""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def get_stats(self) -> dict:
+        """Get cache statistics"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+
+class AudioPrefetcher:
+    """
+    Decodes upcoming words' audio in the background so first playback is instant
+    """
+
+    def __init__(self, cache: DecodedAudioCache, depth: int = 3):
+        self.cache = cache
+        self.depth = depth
+        self.hits = 0
+        self.misses = 0
+        self._pending = {}  # audio path -> Future
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="audio-prefetch")
+
+    def prefetch(self, audio_paths: List[str]):
+        """Queue decoding of the next `depth` audio files"""
+        with self._lock:
+            for audio_path in audio_paths[:self.depth]:
+                if audio_path in self._pending or not os.path.exists(audio_path):
+                    continue
+                if self.cache.contains(audio_path):
+                    continue
+                self._pending[audio_path] = self._executor.submit(self.cache.get, audio_path)
+
+    def get(self, audio_path: str) -> AudioSegment:
+        """Get decoded audio, counting whether the prefetcher had it ready"""
+        with self._lock:
+            future = self._pending.pop(audio_path, None)
+
+        if (future is not None and future.done()) or self.cache.contains(audio_path):
+            self.hits += 1
+        else:
+            self.misses += 1
+
+        if future is not None:
+            try:
+                # Wait for an in-flight decode instead of starting a second one
+                future.result()
+            except Exception as e:
+                print(f"⚠️ Prefetch failed for {audio_path}: {e}")
+        return self.cache.get(audio_path)
+
+    def cancel(self):
+        """Forget queued prefetches (e.g. when a session ends)"""
+        with self._lock:
+            for future in self._pending.values():
+                future.cancel()
+            self._pending.clear()
+
+    def get_stats(self) -> dict:
+        """Get prefetch statistics"""
+        with self._lock:
+            pending = len(self._pending)
+        return {
+            "depth": self.depth,
+            "pending": pending,
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+    def shutdown(self):
+        """Stop the background worker"""
+        self.cancel()
+        self._executor.shutdown(wait=False)
+
+
+class PlaybackBackend:
+    """
+    Base class for audio playback backends
+    """
+
+    name = "base"
+
+    def prepare(self, segment: AudioSegment):
+        """Do any per-sound conversion ahead of time (no-op by default)"""
+        return segment
+
+    def play(self, segment: AudioSegment):
+        """Play a decoded segment, blocking until it finishes or is stopped"""
+        raise NotImplementedError
+
+    def play_effect(self, segment: AudioSegment):
+        """Play a short sound without blocking; effects may overlap each other"""
+        thread = threading.Thread(target=self._play_effect_worker, args=(segment,))
+        thread.daemon = True
+        thread.start()
+
+    def _play_effect_worker(self, segment: AudioSegment):
+        try:
+            pydub_play(segment)
+        except Exception as e:
+            print(f"Error playing sound effect: {e}")
+
+    def stop(self):
+        """Stop the current playback as soon as possible"""
+
+    def close(self):
+        """Release any resources held by the backend"""
+
+
+class PydubPlaybackBackend(PlaybackBackend):
+    """
+    Fallback backend using pydub.playback.play (spawns a player per call)
+    """
+
+    name = "pydub"
+
+    def play(self, segment: AudioSegment):
+        pydub_play(segment)
+
+
+class PygameMixerBackend(PlaybackBackend):
+    """
+    Backend using pygame.mixer: words play on a reserved channel that can be
+    stopped instantly, effects play on any free channel so they can overlap
+    """
+
+    name = "pygame"
+
+    def __init__(self):
+        if pygame is None:
+            raise RuntimeError("pygame is not installed")
+        if not pygame.mixer.get_init():
+            pygame.mixer.init()
+        self._frequency, mixer_format, self._channels = pygame.mixer.get_init()
+        self._sample_width = abs(mixer_format) // 8
+
+        # Channel 0 is kept for word playback; effects use the others
+        pygame.mixer.set_reserved(1)
+        self._word_channel = pygame.mixer.Channel(0)
+        self._sounds = {}  # id(segment) -> pygame.mixer.Sound
+        self._stop_event = threading.Event()
+
+    def prepare(self, segment: AudioSegment):
+        """Convert a segment to the mixer format once and keep the Sound"""
+        key = id(segment)
+        sound = self._sounds.get(key)
+        if sound is None:
+            converted = (segment.set_frame_rate(self._frequency)
+                         .set_channels(self._channels)
+                         .set_sample_width(self._sample_width))
+            sound = pygame.mixer.Sound(buffer=converted.raw_data)
+            self._sounds[key] = sound
+            # Forget the Sound once the cache drops the decoded segment
+            weakref.finalize(segment, self._sounds.pop, key, None)
+        return sound
+
+    def play(self, segment: AudioSegment):
+        sound = self.prepare(segment)
+        self._stop_event.clear()
+        self._word_channel.play(sound)
+        while self._word_channel.get_busy():
+            if self._stop_event.wait(0.01):
+                self._word_channel.stop()
+                break
+
+    def play_effect(self, segment: AudioSegment):
+        self.prepare(segment).play()
+
+    def stop(self):
+        self._stop_event.set()
+        self._word_channel.stop()
+
+    def close(self):
+        self.stop()
+        self._sounds.clear()
+
+
+class StreamPlaybackBackend(PlaybackBackend):
+    """
+    Backend that keeps one PyAudio output stream open and writes PCM to it
+    """
+
+    name = "stream"
+    chunk_ms = 50
+
+    def __init__(self):
+        if pyaudio is None:
+            raise RuntimeError("pyaudio is not installed")
+        self._pyaudio = pyaudio.PyAudio()
+        self._stream = None
+        self._stream_format = None
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+
+    def _get_stream(self, segment: AudioSegment):
+        """Return the open stream, reopening it only if the PCM format changes"""
+        stream_format = (segment.sample_width, segment.channels, segment.frame_rate)
+        if self._stream is None or self._stream_format != stream_format:
+            if self._stream is not None:
+                self._stream.stop_stream()
+                self._stream.close()
+            self._stream = self._pyaudio.open(
+                format=self._pyaudio.get_format_from_width(segment.sample_width),
+                channels=segment.channels,
+                rate=segment.frame_rate,
+                output=True
+            )
+            self._stream_format = stream_format
+        return self._stream
+
+    def play(self, segment: AudioSegment):
+        with self._lock:
+            self._stop_event.clear()
+            stream = self._get_stream(segment)
+
+            # Write in small chunks so stop() takes effect quickly
+            data = segment.raw_data
+            chunk_size = segment.frame_width * int(segment.frame_rate * self.chunk_ms / 1000)
+            for start in range(0, len(data), chunk_size):
+                if self._stop_event.is_set():
+                    break
+                stream.write(data[start:start + chunk_size])
+
+    def stop(self):
+        self._stop_event.set()
+
+    def close(self):
+        self.stop()
+        with self._lock:
+            if self._stream is not None:
+                self._stream.stop_stream()
+                self._stream.close()
+                self._stream = None
+            self._pyaudio.terminate()
+
+
+class SoundBank:
+    """
+    Resident, pre-decoded UI sounds (answer feedback and other cues)
+    """
+
+    def __init__(self, backend: PlaybackBackend):
+        self.backend = backend
+        self._sounds = {}  # cue name -> AudioSegment
+
+    def load(self, name: str, audio_path: str) -> bool:
+        """Decode a cue once and keep it in memory"""
+        if not os.path.exists(audio_path):
+            return False
+        try:
+            segment = AudioSegment.from_file(audio_path)
+            self.backend.prepare(segment)
+            self._sounds[name] = segment
+            return True
+        except Exception as e:
+            print(f"Error loading sound '{name}': {e}")
+            return False
+
+    def load_directory(self, directory: str, cues: Dict[str, str]) -> int:
+        """Load every cue (name -> file name) found in a directory"""
+        loaded = 0
+        for name, file_name in cues.items():
+            if self.load(name, os.path.join(directory, file_name)):
+                loaded += 1
+        return loaded
+
+    def has(self, name: str) -> bool:
+        return name in self._sounds
+
+    def play(self, name: str, fallback: Optional[str] = None) -> bool:
+        """Play a cue without decoding or blocking; returns False if not loaded"""
+        segment = self._sounds.get(name)
+        if segment is None and fallback:
+            segment = self._sounds.get(fallback)
+        if segment is None:
+            return False
+        try:
+            self.backend.play_effect(segment)
+            return True
+        except Exception as e:
+            print(f"Error playing sound '{name}': {e}")
+            return False
+
+
+def create_playback_backend(preferred: Optional[str] = None) -> PlaybackBackend:
+    """Create the best available playback backend, falling back to pydub"""
+    backends = {
+        "pygame": PygameMixerBackend,
+        "stream": StreamPlaybackBackend,
+        "pydub": PydubPlaybackBackend
+    }
+    order = ["pygame", "stream", "pydub"]
+    if preferred in backends:
+        order.remove(preferred)
+        order.insert(0, preferred)
+
+    for name in order:
+        try:
+            return backends[name]()
+        except Exception as e:
+            print(f"⚠️ Audio backend '{name}' not available: {e}")
+
+    return PydubPlaybackBackend()
@@ -0,0 +1,188 @@
+"""
+Content-Addressed Audio Store
+Each synthesized phrase is stored once under a hash of (text, lang, voice,
+speed); chapter and script audio folders get hardlinks to it (or copies
+where hardlinks aren't possible)
+"""
+
+import filecmp
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+DEFAULT_STORE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "audio_store")
+DEFAULT_VOICE = "gtts"
+
+
+def audio_key(text: str, lang: str = "no", voice: str = DEFAULT_VOICE, speed: float = 1.0) -> str:
+    """Content key for a synthesized phrase"""
+    data = json.dumps({"text": text.strip(), "lang": lang, "voice": voice, "speed": float(speed)},
+                      sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def link_or_copy(source: str, destination: str) -> str:
+    """Make destination refer to source's content: a hardlink if possible,
+    otherwise a copy. Returns "existing", "linked" or "copied"."""
+    try:
+        if os.path.samefile(source, destination):
+            return "existing"
+    except OSError:
+        pass
+
+    directory = os.path.dirname(os.path.abspath(destination))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".link.", suffix=".tmp")
+    os.close(fd)
+    os.remove(tmp_path)
+    try:
+        try:
+            os.link(source, tmp_path)
+            mode = "linked"
+        except OSError:
+            # Different filesystem or no hardlink support
+            shutil.copy2(source, tmp_path)
+            mode = "copied"
+        os.replace(tmp_path, destination)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return mode
+
+
+class AudioStore:
+    """
+    Shared store of synthesized audio files keyed by content hash
+    """
+
+    def __init__(self, store_dir: str = DEFAULT_STORE_DIR, extension: str = ".mp3"):
+        self.store_dir = store_dir
+        self.extension = extension
+        self.hits = 0
+        self.synthesized = 0
+        self.linked = 0
+        self.copied = 0
+        self._lock = threading.Lock()
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self.store_dir, key[:2], key + self.extension)
+
+    def get(self, text: str, lang: str = "no", voice: str = DEFAULT_VOICE,
+            speed: float = 1.0) -> Optional[str]:
+        """Path of the stored audio for a phrase, or None"""
+        path = self.path_for(audio_key(text, lang, voice, speed))
+        return path if os.path.exists(path) else None
+
+    def get_or_create(self, text: str, synthesize: Callable[[str], None], lang: str = "no",
+                      voice: str = DEFAULT_VOICE, speed: float = 1.0) -> Tuple[str, bool]:
+        """Return (stored path, created). synthesize(path) is only called when the
+        phrase isn't stored yet, and writes the audio to the given path."""
+        path = self.path_for(audio_key(text, lang, voice, speed))
+        if os.path.exists(path):
+            with self._lock:
+                self.hits += 1
+            return path, False
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".synth.", suffix=self.extension)
+        os.close(fd)
+        try:
+            synthesize(tmp_path)
+            if os.path.getsize(tmp_path) == 0:
+                raise ValueError(f"synthesis produced no audio for '{text}'")
+            # Atomic publish: concurrent writers of the same phrase just overwrite each other
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        with self._lock:
+            self.synthesized += 1
+        return path, True
+
+    def add_file(self, audio_path: str, text: str, lang: str = "no",
+                 voice: str = DEFAULT_VOICE, speed: float = 1.0) -> str:
+        """Adopt an existing audio file into the store. A stored phrase with
+        different audio is replaced (files already linked from it keep the old
+        audio); returns the store path, which then holds audio_path's content."""
+        path = self.path_for(audio_key(text, lang, voice, speed))
+        if not os.path.exists(path) or not filecmp.cmp(audio_path, path, shallow=False):
+            self._count(link_or_copy(audio_path, path))
+        return path
+
+    def materialize(self, text: str, destination: str, synthesize: Callable[[str], None],
+                    lang: str = "no", voice: str = DEFAULT_VOICE, speed: float = 1.0) -> bool:
+        """Make destination hold the audio for a phrase, synthesizing it only if no
+        script has stored it before. Returns True if synthesis was needed."""
+        path, created = self.get_or_create(text, synthesize, lang, voice, speed)
+        self._count(link_or_copy(path, destination))
+        return created
+
+    def materialize_many(self, items: List[Tuple[str, str]],
+                         synthesize_batch: Callable[[List[Tuple[str, str]]], Dict[str, Optional[str]]],
+                         lang: str = "no", voice: str = DEFAULT_VOICE,
+                         speed: float = 1.0) -> Dict[str, Optional[bool]]:
+        """Batch version of materialize for (text, destination) pairs. Phrases not
+        stored yet go to synthesize_batch([(text, path), ...]) in one call, which
+        returns text -> error (None on success). Returns text -> created, or None
+        for phrases that failed."""
+        results = {}
+        missing = []  # (text, temp path, store path)
+        for text, _ in items:
+            path = self.path_for(audio_key(text, lang, voice, speed))
+            if os.path.exists(path):
+                with self._lock:
+                    self.hits += 1
+                results[text] = False
+            elif text not in results:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".synth.", suffix=self.extension)
+                os.close(fd)
+                missing.append((text, tmp_path, path))
+                results[text] = True
+
+        if missing:
+            try:
+                errors = synthesize_batch([(text, tmp_path) for text, tmp_path, _ in missing])
+                for text, tmp_path, path in missing:
+                    error = errors.get(text)
+                    if error is None and os.path.getsize(tmp_path) == 0:
+                        error = "synthesis produced no audio"
+                    if error is not None:
+                        print(f"❌ Error synthesizing '{text}': {error}")
+                        results[text] = None
+                        continue
+                    os.replace(tmp_path, path)
+                    with self._lock:
+                        self.synthesized += 1
+            finally:
+                for _, tmp_path, _ in missing:
+                    if os.path.exists(tmp_path):
+                        os.remove(tmp_path)
+
+        for text, destination in items:
+            if results.get(text) is not None:
+                self._count(link_or_copy(self.path_for(audio_key(text, lang, voice, speed)), destination))
+        return results
+
+    def _count(self, mode: str):
+        with self._lock:
+            if mode == "linked":
+                self.linked += 1
+            elif mode == "copied":
+                self.copied += 1
+
+    def get_stats(self) -> dict:
+        """Get store statistics"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "synthesized": self.synthesized,
+                "linked": self.linked,
+                "copied": self.copied
+            }
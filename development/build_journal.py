@@ -0,0 +1,61 @@
+"""
+Chapter Build Journal
+Append-only checkpoint of the words a chapter build has finished, so an
+interrupted build resumes where it stopped instead of starting over
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Dict
+
+JOURNAL_FILE_NAME = "build_journal.jsonl"
+
+
+class BuildJournal:
+    """
+    One JSON line per finished word. The journal is removed once the
+    chapter's metadata files have been written.
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._lock = threading.Lock()
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def load(self) -> Dict[str, Dict]:
+        """Finished words and their metadata entries (skips a torn last line)"""
+        finished = {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                        finished[record["word"]] = record["entry"]
+                    except (ValueError, KeyError, TypeError):
+                        continue
+        except FileNotFoundError:
+            pass
+        return finished
+
+    def record(self, word: str, entry: Dict):
+        """Checkpoint one finished word (flushed to disk before returning)"""
+        line = json.dumps({"word": word, "entry": entry, "time": datetime.now().isoformat()},
+                          ensure_ascii=False)
+        with self._lock:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+    def complete(self):
+        """Remove the journal after the build has been committed"""
+        with self._lock:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
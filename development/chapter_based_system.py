@@ -3,11 +3,39 @@ Chapter-Based Learning System for Norwegian Words
 Organized by chapters with progressive unlocking
 """
 
+import argparse
 import os
 import json
-import shutil
 from typing import Dict, List, Optional
 
+from audio_store import AudioStore, link_or_copy
+from chapter_index import ChapterIndex
+
+# Chapters created by init_chapters()
+DEFAULT_CHAPTERS = [
+    {
+        "name": "Kapital En",
+        "folder": "capital_one",
+        "description": "Basic Norwegian words and phrases",
+        "required_score": 0,  # First chapter is always unlocked
+        "words": []  # Will be populated when you provide the data
+    },
+    {
+        "name": "Kapital To", 
+        "folder": "capital_two",
+        "description": "Intermediate Norwegian vocabulary",
+        "required_score": 70,  # Need 70% in previous chapter
+        "words": []
+    },
+    {
+        "name": "Kapital Tre",
+        "folder": "capital_three", 
+        "description": "Advanced Norwegian expressions",
+        "required_score": 70,  # Need 70% in previous chapter
+        "words": []
+    }
+]
+
 
 class ChapterBasedWordManager:
     """
@@ -17,52 +45,52 @@ class ChapterBasedWordManager:
     def __init__(self, base_directory: str = "chapters"):
         self.base_directory = base_directory
         self.chapters_data = {}
+        self.chapter_index = ChapterIndex(base_directory)
+        self.audio_store = AudioStore()
+        self._chapter_catalog = None  # Chapter metadata records, sorted
+        self._catalog_folders = []  # Chapter folder names from the last scan
+        self._catalog_signature = None  # mtimes the catalog was built from
         self.chapter_progress_file = "chapter_progress.json"
         self.progress_data = self.load_chapter_progress()
         self.ensure_chapter_structure()
     
+    def is_chapter_structure_complete(self) -> bool:
+        """Check (with stat calls only) that every default chapter exists"""
+        for chapter in DEFAULT_CHAPTERS:
+            chapter_path = os.path.join(self.base_directory, chapter["folder"])
+            required = [
+                os.path.join(chapter_path, "audio"),
+                os.path.join(chapter_path, "chapter_metadata.json"),
+                os.path.join(chapter_path, "data", "words_metadata.json")
+            ]
+            if not all(os.path.exists(path) for path in required):
+                return False
+        return True
+    
     def ensure_chapter_structure(self):
-        """Ensure the chapter directory structure exists"""
-        if not os.path.exists(self.base_directory):
-            os.makedirs(self.base_directory)
+        """Ensure the chapter directory structure exists, writing only if something is missing"""
+        if self.is_chapter_structure_complete():
+            return
+        
+        try:
+            self.init_chapters()
+        except OSError as e:
+            # Read-only deployments play whatever chapters are already there
+            print(f"⚠️ Could not create chapter structure in '{self.base_directory}': {e}")
+    
+    def init_chapters(self):
+        """Create the chapter directories and metadata files that are missing"""
+        os.makedirs(self.base_directory, exist_ok=True)
         
         # Create example chapter structure
         self.create_chapter_structure()
     
     def create_chapter_structure(self):
         """Create the organized chapter structure"""
-        chapters = [
-            {
-                "name": "Kapital En",
-                "folder": "capital_one",
-                "description": "Basic Norwegian words and phrases",
-                "required_score": 0,  # First chapter is always unlocked
-                "words": []  # Will be populated when you provide the data
-            },
-            {
-                "name": "Kapital To", 
-                "folder": "capital_two",
-                "description": "Intermediate Norwegian vocabulary",
-                "required_score": 70,  # Need 70% in previous chapter
-                "words": []
-            },
-            {
-                "name": "Kapital Tre",
-                "folder": "capital_three", 
-                "description": "Advanced Norwegian expressions",
-                "required_score": 70,  # Need 70% in previous chapter
-                "words": []
-            }
-        ]
-        
-        for chapter in chapters:
+        for chapter in DEFAULT_CHAPTERS:
             chapter_path = os.path.join(self.base_directory, chapter["folder"])
             
-            # Create chapter directory
-            if not os.path.exists(chapter_path):
-                os.makedirs(chapter_path)
-            
-            # Create subdirectories
+            # Create chapter directory and subdirectories
             os.makedirs(os.path.join(chapter_path, "audio"), exist_ok=True)
             os.makedirs(os.path.join(chapter_path, "data"), exist_ok=True)
             
@@ -88,6 +116,8 @@ class ChapterBasedWordManager:
                         "words": {},
                         "last_updated": "2024-01-01T00:00:00"
                     }, f, indent=2, ensure_ascii=False)
+        
+        self.invalidate_catalog()
     
     def load_chapter_progress(self) -> Dict:
         """Load chapter progress and unlocking status"""
@@ -138,28 +168,84 @@ class ChapterBasedWordManager:
         except Exception as e:
             print(f"Error saving progress: {e}")
     
-    def get_available_chapters(self) -> List[Dict]:
-        """Get list of available (unlocked) chapters"""
-        available = []
+    def _stat_mtime(self, path: str) -> Optional[int]:
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+    
+    def _current_catalog_signature(self, folders: List[str]) -> tuple:
+        """Directory and metadata mtimes that decide whether the catalog is stale"""
+        signature = [self._stat_mtime(self.base_directory)]
+        for chapter_folder in folders:
+            chapter_path = os.path.join(self.base_directory, chapter_folder)
+            signature.append((
+                chapter_folder,
+                self._stat_mtime(chapter_path),
+                self._stat_mtime(os.path.join(chapter_path, "chapter_metadata.json"))
+            ))
+        return tuple(signature)
+    
+    def _load_chapter_catalog(self) -> List[Dict]:
+        """Scan the chapters directory and read every chapter_metadata.json"""
+        catalog = []
+        if not os.path.isdir(self.base_directory):
+            return catalog
         
-        for chapter_folder in os.listdir(self.base_directory):
+        for chapter_folder in sorted(os.listdir(self.base_directory)):
             chapter_path = os.path.join(self.base_directory, chapter_folder)
             if os.path.isdir(chapter_path):
                 metadata_file = os.path.join(chapter_path, "chapter_metadata.json")
                 if os.path.exists(metadata_file):
-                    with open(metadata_file, 'r', encoding='utf-8') as f:
-                        chapter_info = json.load(f)
-                    
-                    # Check if chapter is unlocked
-                    chapter_key = chapter_info["folder"]
-                    is_unlocked = self.progress_data["chapters"].get(chapter_key, {}).get("unlocked", False)
-                    
-                    chapter_info["unlocked"] = is_unlocked
-                    chapter_info["progress"] = self.progress_data["chapters"].get(chapter_key, {})
-                    available.append(chapter_info)
+                    try:
+                        with open(metadata_file, 'r', encoding='utf-8') as f:
+                            catalog.append(json.load(f))
+                    except Exception as e:
+                        print(f"Error reading {metadata_file}: {e}")
         
         # Sort by required score
-        available.sort(key=lambda x: x.get("required_score", 0))
+        catalog.sort(key=lambda x: x.get("required_score", 0))
+        return catalog
+    
+    def get_chapter_catalog(self) -> List[Dict]:
+        """Get chapter metadata records, re-reading disk only when mtimes change"""
+        if self._chapter_catalog is not None:
+            if self._current_catalog_signature(self._catalog_folders) == self._catalog_signature:
+                return self._chapter_catalog
+        
+        # Folder list comes from one directory scan; reused until the directory changes
+        if os.path.isdir(self.base_directory):
+            folders = sorted(
+                folder for folder in os.listdir(self.base_directory)
+                if os.path.isdir(os.path.join(self.base_directory, folder))
+            )
+        else:
+            folders = []
+        self._catalog_folders = folders
+        self._catalog_signature = self._current_catalog_signature(folders)
+        self._chapter_catalog = self._load_chapter_catalog()
+        return self._chapter_catalog
+    
+    def invalidate_catalog(self):
+        """Force the next catalog lookup to re-read chapter metadata"""
+        self._chapter_catalog = None
+        self._catalog_signature = None
+    
+    def get_available_chapters(self) -> List[Dict]:
+        """Get list of available (unlocked) chapters"""
+        available = []
+        
+        for record in self.get_chapter_catalog():
+            chapter_info = dict(record)
+            
+            # Check if chapter is unlocked
+            chapter_key = chapter_info["folder"]
+            is_unlocked = self.progress_data["chapters"].get(chapter_key, {}).get("unlocked", False)
+            
+            chapter_info["unlocked"] = is_unlocked
+            chapter_info["progress"] = self.progress_data["chapters"].get(chapter_key, {})
+            available.append(chapter_info)
+        
         return available
     
     def unlock_next_chapter(self, current_chapter: str, score: float):
@@ -225,13 +311,15 @@ class ChapterBasedWordManager:
         with open(words_file, 'w', encoding='utf-8') as f:
             json.dump(metadata, f, indent=2, ensure_ascii=False)
         
-        # Copy audio files to chapter's audio directory
+        # Link audio files into the chapter's audio directory through the shared store
         audio_dir = os.path.join(chapter_path, "audio")
         for audio_file in audio_files:
             if os.path.exists(audio_file):
-                destination = os.path.join(audio_dir, os.path.basename(audio_file))
-                shutil.copy2(audio_file, destination)
-                print(f"Copied audio: {os.path.basename(audio_file)}")
+                file_name = os.path.basename(audio_file)
+                destination = os.path.join(audio_dir, file_name)
+                stored_path = self.audio_store.add_file(audio_file, os.path.splitext(file_name)[0])
+                mode = link_or_copy(stored_path, destination)
+                print(f"Added audio ({mode}): {file_name}")
         
         # Update chapter metadata
         metadata_file = os.path.join(chapter_path, "chapter_metadata.json")
@@ -244,6 +332,10 @@ class ChapterBasedWordManager:
             
             with open(metadata_file, 'w', encoding='utf-8') as f:
                 json.dump(chapter_info, f, indent=2, ensure_ascii=False)
+            self.invalidate_catalog()
+        
+        # Keep the chapter index manifest in sync
+        self.chapter_index.update_chapter(chapter_folder)
         
         print(f"✅ Added {len(words_data)} words to chapter '{chapter_folder}'")
         return True
@@ -280,59 +372,56 @@ class ChapterBasedWordManager:
             "chapters": {}
         }
         
-        for chapter_folder in os.listdir(self.base_directory):
-            chapter_path = os.path.join(self.base_directory, chapter_folder)
-            if os.path.isdir(chapter_path):
-                stats["total_chapters"] += 1
-                
-                # Get chapter info
-                metadata_file = os.path.join(chapter_path, "chapter_metadata.json")
-                words_file = os.path.join(chapter_path, "data", "words_metadata.json")
-                
-                chapter_info = {}
-                if os.path.exists(metadata_file):
-                    with open(metadata_file, 'r', encoding='utf-8') as f:
-                        chapter_info = json.load(f)
-                
-                # Count words
-                word_count = 0
-                if os.path.exists(words_file):
-                    with open(words_file, 'r', encoding='utf-8') as f:
-                        words_data = json.load(f)
-                        word_count = len(words_data.get("words", {}))
-                
-                # Check progress
-                chapter_key = chapter_folder
-                progress = self.progress_data["chapters"].get(chapter_key, {})
-                
-                chapter_stats = {
-                    "name": chapter_info.get("name", chapter_folder),
-                    "words_count": word_count,
-                    "unlocked": progress.get("unlocked", False),
-                    "completed": progress.get("completed", False),
-                    "best_score": progress.get("best_score", 0),
-                    "attempts": progress.get("attempts", 0)
-                }
-                
-                stats["chapters"][chapter_folder] = chapter_stats
-                
-                if chapter_stats["unlocked"]:
-                    stats["unlocked_chapters"] += 1
-                if chapter_stats["completed"]:
-                    stats["completed_chapters"] += 1
-                
-                stats["total_words"] += word_count
+        # Names and word counts come from the chapter index manifest
+        for chapter_folder, chapter_entry in self.chapter_index.get_chapters().items():
+            stats["total_chapters"] += 1
+            word_count = chapter_entry["words_count"]
+            
+            # Check progress
+            chapter_key = chapter_folder
+            progress = self.progress_data["chapters"].get(chapter_key, {})
+            
+            chapter_stats = {
+                "name": chapter_entry["name"],
+                "words_count": word_count,
+                "unlocked": progress.get("unlocked", False),
+                "completed": progress.get("completed", False),
+                "best_score": progress.get("best_score", 0),
+                "attempts": progress.get("attempts", 0)
+            }
+            
+            stats["chapters"][chapter_folder] = chapter_stats
+            
+            if chapter_stats["unlocked"]:
+                stats["unlocked_chapters"] += 1
+            if chapter_stats["completed"]:
+                stats["completed_chapters"] += 1
+            
+            stats["total_words"] += word_count
         
         return stats
 
 
 def main():
     """Demo of the chapter-based system"""
+    parser = argparse.ArgumentParser(description="Chapter-based learning system")
+    parser.add_argument("--init-chapters", action="store_true",
+                        help="create any missing chapter folders and metadata files, then exit")
+    parser.add_argument("--chapters-dir", default="chapters",
+                        help="chapters directory (default: chapters)")
+    args = parser.parse_args()
+    
+    if args.init_chapters:
+        chapter_manager = ChapterBasedWordManager(args.chapters_dir)
+        chapter_manager.init_chapters()
+        print(f"✅ Chapter structure ready in '{args.chapters_dir}'")
+        return
+    
     print("📚 Chapter-Based Learning System Demo")
     print("=" * 50)
     
     # Initialize chapter manager
-    chapter_manager = ChapterBasedWordManager()
+    chapter_manager = ChapterBasedWordManager(args.chapters_dir)
     
     # Show available chapters
     chapters = chapter_manager.get_available_chapters()
@@ -0,0 +1,167 @@
+"""
+Chapter Index
+One generated manifest (chapters/chapter_index.json) with the chapter list,
+word counts, a word -> chapter map and content hashes, so statistics and
+cross-chapter duplicate checks don't have to parse every chapter's JSON
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+from typing import Dict, Optional, Set
+
+from persistence import atomic_write_json
+
+INDEX_FILE_NAME = "chapter_index.json"
+INDEX_VERSION = 1
+
+
+def file_sha1(path: str) -> Optional[str]:
+    """Content hash of a file, or None if it doesn't exist"""
+    try:
+        digest = hashlib.sha1()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(65536), b""):
+                digest.update(block)
+        return digest.hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def _mtime_ns(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+class ChapterIndex:
+    """
+    Reads and maintains the chapter index manifest. Chapters are re-read only
+    when their metadata files' mtimes differ from what the index recorded.
+    """
+
+    def __init__(self, chapters_dir: str):
+        self.chapters_dir = str(chapters_dir)
+        self.index_file = os.path.join(self.chapters_dir, INDEX_FILE_NAME)
+        self._index = None
+
+    def _chapter_files(self, chapter_folder: str) -> Dict[str, str]:
+        chapter_path = os.path.join(self.chapters_dir, chapter_folder)
+        metadata_file = os.path.join(chapter_path, "chapter_metadata.json")
+        if not os.path.exists(metadata_file):
+            # Chapters built by generate_chapter_audio.py keep it under data/
+            metadata_file = os.path.join(chapter_path, "data", "chapter_metadata.json")
+        return {
+            "metadata": metadata_file,
+            "words": os.path.join(chapter_path, "data", "words_metadata.json")
+        }
+
+    def _read_index_file(self) -> Dict:
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            if index.get("version") == INDEX_VERSION:
+                return index
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"⚠️ Rebuilding unreadable chapter index: {e}")
+        return {"version": INDEX_VERSION, "chapters": {}, "words": {}}
+
+    def _index_chapter(self, chapter_folder: str) -> Dict:
+        """Read one chapter's files and build its index entry"""
+        files = self._chapter_files(chapter_folder)
+        chapter_info = {}
+        if os.path.exists(files["metadata"]):
+            with open(files["metadata"], 'r', encoding='utf-8') as f:
+                chapter_info = json.load(f)
+
+        words = []
+        if os.path.exists(files["words"]):
+            with open(files["words"], 'r', encoding='utf-8') as f:
+                words = list(json.load(f).get("words", {}))
+
+        return {
+            "name": chapter_info.get("name", chapter_folder),
+            "description": chapter_info.get("description", ""),
+            "required_score": chapter_info.get("required_score", 70),
+            "words_count": len(words),
+            "metadata_hash": file_sha1(files["metadata"]),
+            "words_hash": file_sha1(files["words"]),
+            "metadata_mtime_ns": _mtime_ns(files["metadata"]),
+            "words_mtime_ns": _mtime_ns(files["words"]),
+            "word_list": words
+        }
+
+    def _is_current(self, chapter_folder: str, entry: Dict) -> bool:
+        files = self._chapter_files(chapter_folder)
+        return (entry.get("metadata_mtime_ns") == _mtime_ns(files["metadata"])
+                and entry.get("words_mtime_ns") == _mtime_ns(files["words"]))
+
+    def _rebuild_word_map(self, index: Dict):
+        words = {}
+        for chapter_folder in sorted(index["chapters"]):
+            for word in index["chapters"][chapter_folder]["word_list"]:
+                words.setdefault(word, chapter_folder)
+        index["words"] = words
+
+    def refresh(self) -> Dict:
+        """Load the index, re-indexing only chapters whose files changed"""
+        index = self._index if self._index is not None else self._read_index_file()
+        if not os.path.isdir(self.chapters_dir):
+            self._index = index
+            return index
+
+        folders = sorted(
+            folder for folder in os.listdir(self.chapters_dir)
+            if os.path.isdir(os.path.join(self.chapters_dir, folder))
+        )
+
+        changed = set(index["chapters"]) != set(folders)
+        chapters = {}
+        for chapter_folder in folders:
+            entry = index["chapters"].get(chapter_folder)
+            if entry is None or not self._is_current(chapter_folder, entry):
+                try:
+                    entry = self._index_chapter(chapter_folder)
+                except Exception as e:
+                    print(f"Error indexing chapter '{chapter_folder}': {e}")
+                    continue
+                changed = True
+            chapters[chapter_folder] = entry
+        index["chapters"] = chapters
+
+        if changed:
+            self._rebuild_word_map(index)
+            self._save(index)
+        self._index = index
+        return index
+
+    def update_chapter(self, chapter_folder: str):
+        """Re-index one chapter after it was written"""
+        index = self._index if self._index is not None else self._read_index_file()
+        index["chapters"][chapter_folder] = self._index_chapter(chapter_folder)
+        self._rebuild_word_map(index)
+        self._save(index)
+        self._index = index
+
+    def _save(self, index: Dict):
+        index["generated"] = datetime.now().isoformat()
+        try:
+            atomic_write_json(self.index_file, index, ensure_ascii=False)
+        except OSError as e:
+            # Read-only deployments still get the in-memory index
+            print(f"⚠️ Could not write {self.index_file}: {e}")
+
+    def get_chapters(self) -> Dict[str, Dict]:
+        return self.refresh()["chapters"]
+
+    def get_word_chapter(self, word: str) -> Optional[str]:
+        """Which chapter a word belongs to (first chapter if it is in several)"""
+        return self.refresh()["words"].get(word)
+
+    def get_existing_words(self) -> Set[str]:
+        """All words across chapters, lowercased for duplicate checks"""
+        return {word.lower() for word in self.refresh()["words"]}
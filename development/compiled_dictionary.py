@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Compiled Translation Dictionary
+A memory-mapped, sorted-key dictionary file so large vocabularies cost
+nothing at startup and are read straight from the page cache when used
+
+File layout (little-endian):
+    header   magic "PRPD", version, entry count, SHA-1 of the rest of the file
+    offsets  (count + 1) uint32 offsets into the records blob
+    records  "key\\0value" in UTF-8 for every entry, sorted by key bytes
+Keys are stored lowercased; lookups are case-insensitive exact matches.
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+from typing import Dict, Iterable, Optional
+
+MAGIC = b"PRPD"
+VERSION = 1
+HEADER = struct.Struct("<4sII20s")
+OFFSET = struct.Struct("<I")
+
+
+class CompiledDictionary:
+    """
+    Read-only lookups in a compiled dictionary file. The file is opened and
+    mapped on the first lookup, not when the object is created.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.count = 0
+        self._file = None
+        self._mm = None
+        self._records_start = 0
+        self._load_lock = threading.Lock()
+
+    def _load(self):
+        if self._mm is not None:
+            return
+        # Lookups may start on several threads at once; map the file only once
+        with self._load_lock:
+            if self._mm is not None:
+                return
+            self._file = open(self.path, 'rb')
+            try:
+                mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty file
+                self._file.close()
+                self._file = None
+                raise ValueError(f"{self.path} is not a compiled dictionary")
+            magic, version, count, _ = HEADER.unpack_from(mm, 0)
+            if magic != MAGIC or version != VERSION:
+                mm.close()
+                self._file.close()
+                self._file = None
+                raise ValueError(f"{self.path} is not a compiled dictionary (version {VERSION})")
+            self.count = count
+            self._records_start = HEADER.size + (count + 1) * OFFSET.size
+            self._mm = mm  # Set last: other threads skip the lock once it is there
+
+    @property
+    def checksum(self) -> str:
+        """Content hash from the header (reads only the header)"""
+        with open(self.path, 'rb') as f:
+            header = f.read(HEADER.size)
+        if len(header) < HEADER.size:
+            return ""
+        return HEADER.unpack(header)[3].hex()
+
+    def _record(self, index: int):
+        """(key bytes, value start, value end) for entry index"""
+        offsets_at = HEADER.size + index * OFFSET.size
+        start = self._records_start + OFFSET.unpack_from(self._mm, offsets_at)[0]
+        end = self._records_start + OFFSET.unpack_from(self._mm, offsets_at + OFFSET.size)[0]
+        separator = self._mm.find(b"\0", start, end)
+        return self._mm[start:separator], separator + 1, end
+
+    def get(self, word: str) -> Optional[str]:
+        """Binary search for a word (case-insensitive)"""
+        self._load()
+        target = word.lower().encode("utf-8")
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            key, value_start, value_end = self._record(middle)
+            if key == target:
+                return self._mm[value_start:value_end].decode("utf-8")
+            if key < target:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    def __contains__(self, word: str) -> bool:
+        return self.get(word) is not None
+
+    def __len__(self):
+        self._load()
+        return self.count
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def build_dictionary(translations: Dict[str, str], output_path: str) -> int:
+    """Write a compiled dictionary file; returns the number of entries"""
+    entries = {}
+    for key, value in translations.items():
+        key = key.strip().lower()
+        if key and value and "\0" not in key:
+            entries[key.encode("utf-8")] = value.strip().encode("utf-8")
+
+    offsets = [0]
+    records = bytearray()
+    for key in sorted(entries):
+        records += key + b"\0" + entries[key]
+        offsets.append(len(records))
+
+    body = b"".join(OFFSET.pack(offset) for offset in offsets) + bytes(records)
+    header = HEADER.pack(MAGIC, VERSION, len(entries), hashlib.sha1(body).digest())
+
+    # Write atomically so readers with the old file mapped are unaffected
+    tmp_path = output_path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(header + body)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, output_path)
+    return len(entries)
+
+
+def read_csv_translations(csv_path: str) -> Dict[str, str]:
+    """Read Norwegian/English pairs from a CSV file such as Data.csv.
+    Uses the Norsk/English header columns if present, else the last two columns."""
+    translations = {}
+    with open(csv_path, 'r', encoding='utf-8-sig', newline='') as f:
+        rows = list(csv.reader(f))
+    if not rows:
+        return translations
+
+    header = [column.strip().lower() for column in rows[0]]
+    if "norsk" in header and "english" in header:
+        norwegian_column, english_column = header.index("norsk"), header.index("english")
+        rows = rows[1:]
+    else:
+        norwegian_column, english_column = -2, -1
+
+    for row in rows:
+        if len(row) >= 2:
+            translations[row[norwegian_column]] = row[english_column]
+    return translations
+
+
+def read_json_translations(json_path: str) -> Dict[str, str]:
+    """Read a {"norsk": "english"} object or a list of [norsk, english] pairs"""
+    with open(json_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        return {str(key): str(value) for key, value in data.items()}
+    return {str(pair[0]): str(pair[1]) for pair in data if len(pair) >= 2}
+
+
+def read_sources(paths: Iterable[str]) -> Dict[str, str]:
+    """Merge translations from CSV/JSON files (later files win)"""
+    translations = {}
+    for path in paths:
+        if path.lower().endswith(".json"):
+            translations.update(read_json_translations(path))
+        else:
+            translations.update(read_csv_translations(path))
+    return translations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a compiled translation dictionary")
+    parser.add_argument("sources", nargs="+", help="CSV (Norsk,English columns) or JSON files")
+    parser.add_argument("-o", "--output", default=os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                                "translations.dict"),
+                        help="output file (default: translations.dict next to this script)")
+    args = parser.parse_args()
+
+    try:
+        translations = read_sources(args.sources)
+    except (OSError, ValueError) as e:
+        print(f"❌ Could not read sources: {e}")
+        sys.exit(1)
+
+    count = build_dictionary(translations, args.output)
+    print(f"✅ Compiled {count} translations into {args.output}")
+
+
+if __name__ == "__main__":
+    main()
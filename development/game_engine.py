@@ -2,12 +2,15 @@ import pygame
 import random
 import time
 import os
-from pydub import AudioSegment
-from pydub.playback import play
 import threading
 import tkinter as tk
 from tkinter import ttk, messagebox
 from translation_service import TranslationService
+from async_translation import AsyncTranslator, TRANSLATION_PENDING_TEXT
+from review_store import ReviewStore
+from persistence import WriteBehindWriter
+from session_history import SessionHistory
+from audio_playback import AudioPrefetcher, DecodedAudioCache, SoundBank, create_playback_backend
 import json
 from datetime import datetime, timedelta
 
@@ -35,8 +38,24 @@ class PREPPLingoGame:
         self.max_hearts = 3
         self.current_hearts = 3
         
-        # Translation service
+        # Translation service (network lookups run off the UI thread)
         self.translation_service = TranslationService()
+        self.async_translator = AsyncTranslator(self.translation_service,
+                                                lambda fn: self.root.after(0, fn))
+        
+        # Audio playback (decoded audio is cached so repeats skip the decode)
+        self.audio_cache = DecodedAudioCache()
+        self.audio_prefetcher = AudioPrefetcher(self.audio_cache, depth=3)
+        self.playback = create_playback_backend(os.environ.get("PREPP_AUDIO_BACKEND"))
+        
+        # UI sounds are decoded once here and played from memory
+        self.ui_sound_files = {
+            'correct': "correct.mp3",
+            'incorrect': "incorrect.mp3",
+            'hint': "hint.mp3"
+        }
+        self.sound_bank = SoundBank(self.playback)
+        self.sound_bank.load_directory(self.audio_directory, self.ui_sound_files)
         
         # Game state
         self.current_word = ""
@@ -48,9 +67,9 @@ class PREPPLingoGame:
         self.game_running = False
         self.answer_submitted = False
         self.audio_thread = None
+        self.audio_stop_event = threading.Event()
         self.timer_thread = None
         self.reveal_thread = None
-        self.feedback_thread = None
         
         # Session management
         self.session_words = []
@@ -58,9 +77,17 @@ class PREPPLingoGame:
         self.incorrect_answers = []
         self.words_per_session = 10
         self.attempted_words = set()
-        self.review_words_file = "words_to_review.json"  # Changed to JSON for SRS
+        self.review_words_file = "words_to_review.json"  # Legacy JSON, imported once
+        self.review_db_file = "words_to_review.db"
         self.stats_file = "game_stats.json"
         
+        # Stats and review updates are buffered and written in the background
+        self.persistence = WriteBehindWriter(flush_interval=5.0)
+        self.review_store = ReviewStore(self.review_db_file, legacy_json_path=self.review_words_file,
+                                        write_behind=True)
+        self.persistence.add_flush_hook(self.review_store.flush)
+        self.session_history = SessionHistory("session_log.jsonl", writer=self.persistence)
+        
         # Load words dynamically
         self.words_data = self.load_words_data()
         self.difficulty_levels = self.categorize_difficulty()
@@ -74,8 +101,10 @@ class PREPPLingoGame:
             print("⚠️ Chapter system not available, using legacy system")
             self.chapter_manager = None
         
-        # Load game statistics
+        # Load game statistics (older history is rolled up to keep the file small)
         self.game_stats = self.load_game_stats()
+        if self.session_history.migrate(self.game_stats):
+            self.save_game_stats()
         
         # GUI setup
         self.root = tk.Tk()
@@ -136,10 +165,9 @@ class PREPPLingoGame:
         return default_stats
     
     def save_game_stats(self):
-        """Save game statistics to file"""
+        """Queue game statistics to be written to file in the background"""
         try:
-            with open(self.stats_file, 'w', encoding='utf-8') as f:
-                json.dump(self.game_stats, f, indent=2)
+            self.persistence.write_json(self.stats_file, self.game_stats)
         except Exception as e:
             print(f"Error saving game stats: {e}")
     
@@ -178,6 +206,22 @@ class PREPPLingoGame:
         """Get English translation using translation service"""
         return self.translation_service.get_translation(norwegian_word)
     
+    def get_translation_nonblocking(self, norwegian_word, on_ready):
+        """Get a translation without waiting on the network. If it isn't cached,
+        a placeholder is returned and on_ready(translation) runs later on the UI thread"""
+        translation = self.async_translator.get(norwegian_word, on_ready)
+        return translation if translation is not None else TRANSLATION_PENDING_TEXT
+    
+    def record_answer(self, answers, word, user_answer):
+        """Store an answer for the session summary; the translation is filled in
+        when it arrives if it wasn't available yet"""
+        entry = {'word': word, 'translation': None, 'user_answer': user_answer}
+        def fill(translation):
+            entry['translation'] = translation
+        entry['translation'] = self.get_translation_nonblocking(word, fill)
+        answers.append(entry)
+        return entry
+    
     def categorize_difficulty(self):
         """Categorize words by difficulty based on length and complexity"""
         easy = []
@@ -1140,20 +1184,26 @@ class PREPPLingoGame:
             self.input_entry.tag_add("center", "1.0", "end")
         
         # Show feedback
-        if hasattr(self, 'result_text') and self.result_text.winfo_exists():
+        word = self.current_word
+        def show_hint(translation):
+            if word != self.current_word or self.answer_submitted:
+                return
+            if not (hasattr(self, 'result_text') and self.result_text.winfo_exists()):
+                return
             self.result_text.config(state='normal')
             self.result_text.delete(1.0, tk.END)
             
-            translation = self.get_translation(self.current_word)
-            hint_message = f"💡 Hint brukt! (-1 ❤️)\n\n🎯 Riktig svar: '{self.current_word}'\n📖 Betydning: '{translation}'\n\n⏰ Du har fortsatt tid til å sende inn svaret!"
+            hint_message = f"💡 Hint brukt! (-1 ❤️)\n\n🎯 Riktig svar: '{word}'\n📖 Betydning: '{translation}'\n\n⏰ Du har fortsatt tid til å sende inn svaret!"
             
             self.result_text.insert(tk.END, hint_message)
             self.result_text.tag_add("hint", "1.0", "end")
             self.result_text.tag_config("hint", foreground=self.colors['orange'])
             self.result_text.config(state='disabled')
         
-        # Play hint sound (optional)
-        self.play_feedback_sound(True)
+        show_hint(self.get_translation_nonblocking(word, show_hint))
+        
+        # Play hint sound (falls back to the correct-answer sound)
+        self.sound_bank.play('hint', fallback='correct')
     
     def update_display_state(self):
         """Update the UI based on game state"""
@@ -1248,6 +1298,12 @@ class PREPPLingoGame:
         # Update game stats
         self.game_stats["total_sessions"] += 1
         
+        # Start decoding the first words' audio while the UI updates
+        self.prefetch_upcoming_audio(0)
+        
+        # Resolve the session's translations in the background
+        self.async_translator.prefetch(self.session_words)
+        
         # Update UI
         self.update_display_state()
         if hasattr(self, 'input_entry'):
@@ -1315,6 +1371,12 @@ class PREPPLingoGame:
         # Update game stats
         self.game_stats["total_sessions"] += 1
         
+        # Start decoding the first words' audio while the UI updates
+        self.prefetch_upcoming_audio(0)
+        
+        # Resolve the session's translations in the background
+        self.async_translator.prefetch(self.session_words)
+        
         # Update UI
         self.update_display_state()
         if hasattr(self, 'input_entry'):
@@ -1340,9 +1402,6 @@ class PREPPLingoGame:
         if self.reveal_thread and self.reveal_thread.is_alive():
             self.reveal_thread.join(timeout=1)
         
-        if self.feedback_thread and self.feedback_thread.is_alive():
-            self.feedback_thread.join(timeout=1)
-        
         self.update_display_state()
     
     def next_word(self):
@@ -1362,6 +1421,9 @@ class PREPPLingoGame:
         self.current_word = self.session_words[self.total_words]
         self.current_audio_file = self.words_data[self.current_word]['audio_file']
         
+        # Decode the following words' audio while the user types this one
+        self.prefetch_upcoming_audio(self.total_words + 1)
+        
         # Update difficulty level for action mode
         game_mode = getattr(self, 'game_mode_var', tk.StringVar(value="practice")).get()
         if game_mode == "action":
@@ -1378,6 +1440,16 @@ class PREPPLingoGame:
         # Setup dictation mode
         self.setup_dictation_mode()
     
+    def get_word_audio_path(self, word):
+        """Get the audio file path for a word"""
+        return os.path.join(self.audio_directory, self.words_data[word]['audio_file'])
+    
+    def prefetch_upcoming_audio(self, start_index):
+        """Queue background decoding of session words starting at start_index"""
+        upcoming = self.session_words[start_index:start_index + self.audio_prefetcher.depth]
+        paths = [self.get_word_audio_path(word) for word in upcoming if word in self.words_data]
+        self.audio_prefetcher.prefetch(paths)
+    
     def update_difficulty_level(self):
         """Update the current difficulty level based on word position in action mode"""
         # Count words in each difficulty
@@ -1424,6 +1496,15 @@ class PREPPLingoGame:
         show_translation = getattr(self, 'show_translation_var', tk.BooleanVar(value=False)).get()
         game_mode = getattr(self, 'game_mode_var', tk.StringVar(value="practice")).get()
         
+        # Translation comes from the cache or arrives later and redraws this view
+        translation = None
+        if show_translation:
+            word = self.current_word
+            def redraw(_translation):
+                if word == self.current_word and not self.answer_submitted:
+                    self.show_word_translation()
+            translation = self.get_translation_nonblocking(word, redraw)
+        
         # Display word and translation
         self.result_text.config(state='normal')
         self.result_text.delete(1.0, tk.END)
@@ -1435,15 +1516,12 @@ class PREPPLingoGame:
             time_bank_text = f"⏰ Tid igjen: {self.current_time_bank}s"
             
             if show_translation:
-                translation = self.get_translation(self.current_word)
                 display_text = f"🎯 Vanskelighetsgrad: {difficulty_text}\n{time_bank_text}\n\n📖 Betydning: '{translation}'\n\n🎧 Lyt og skriv det norske ordet!"
             else:
                 display_text = f"🎯 Vanskelighetsgrad: {difficulty_text}\n{time_bank_text}\n\n🎧 Lyt til lyden og skriv det du hører!"
         else:
             # Practice mode: normal behavior
             if show_translation:
-                # Get translation - show only the English meaning, not the Norwegian word
-                translation = self.get_translation(self.current_word)
                 # Show only the English translation (the meaning you're listening for)
                 display_text = f"📖 Betydning: '{translation}'\n\n🎧 Lyt og skriv det norske ordet for denne betydningen!"
             else:
@@ -1458,26 +1536,34 @@ class PREPPLingoGame:
     def stop_audio(self):
         """Stop any currently playing audio"""
         self.answer_submitted = True  # This will stop the audio loop
+        self.audio_stop_event.set()  # Wake the loop if it is waiting to repeat
+        self.playback.stop()  # Cut off the word that is playing right now
         if hasattr(self, 'audio_thread') and self.audio_thread and self.audio_thread.is_alive():
             self.audio_thread.join(timeout=0.5)  # Wait for audio thread to finish
         self.answer_submitted = False  # Reset for new word
     
     def play_audio(self):
         """Play the audio file in a separate thread"""
+        # Each playback loop gets its own stop event so stopping an old loop
+        # can never affect the next word's loop
+        stop_event = threading.Event()
+        self.audio_stop_event = stop_event
+        
         def audio_worker():
             audio_path = os.path.join(self.audio_directory, self.current_audio_file)
             if os.path.exists(audio_path):
                 try:
-                    # Load and play audio
-                    audio = AudioSegment.from_mp3(audio_path)
+                    # Load audio (usually already decoded by the prefetcher)
+                    audio = self.audio_prefetcher.get(audio_path)
                     
                     # Keep playing until time runs out or answer is submitted
-                    while self.game_running and not self.answer_submitted:
-                        play(audio)
+                    while self.game_running and not self.answer_submitted and not stop_event.is_set():
+                        self.playback.play(audio)
                         
                         # Wait before next repeat, but check if we should stop
                         if self.game_running and not self.answer_submitted:
-                            time.sleep(self.repeat_interval)
+                            if stop_event.wait(self.repeat_interval):
+                                break
                         else:
                             break
                             
@@ -1497,8 +1583,8 @@ class PREPPLingoGame:
             audio_path = os.path.join(self.audio_directory, self.current_audio_file)
             if os.path.exists(audio_path):
                 try:
-                    audio = AudioSegment.from_mp3(audio_path)
-                    play(audio)
+                    audio = self.audio_cache.get(audio_path)
+                    self.playback.play(audio)
                 except Exception as e:
                     print(f"Error playing audio: {e}")
         
@@ -1509,19 +1595,7 @@ class PREPPLingoGame:
     
     def play_feedback_sound(self, correct):
         """Play audio feedback for correct or incorrect answer"""
-        def worker():
-            sound_file = "correct.mp3" if correct else "incorrect.mp3"
-            sound_path = os.path.join(self.audio_directory, sound_file)
-            if os.path.exists(sound_path):
-                try:
-                    audio = AudioSegment.from_mp3(sound_path)
-                    play(audio)
-                except Exception as e:
-                    print(f"Error playing feedback sound: {e}")
-        
-        self.feedback_thread = threading.Thread(target=worker)
-        self.feedback_thread.daemon = True
-        self.feedback_thread.start()
+        self.sound_bank.play('correct' if correct else 'incorrect')
     
     def start_timer(self):
         """Start the countdown timer"""
@@ -1577,12 +1651,8 @@ class PREPPLingoGame:
         self.total_words += 1
         
         # Store incorrect answer with translation
-        translation = self.get_translation(self.current_word)
-        self.incorrect_answers.append({
-            'word': self.current_word,
-            'translation': translation,
-            'user_answer': "Tiden utløp"
-        })
+        word = self.current_word
+        self.record_answer(self.incorrect_answers, word, "Tiden utløp")
         
         # Update stats
         difficulty = getattr(self, 'difficulty_var', tk.StringVar(value="easy")).get()
@@ -1595,17 +1665,23 @@ class PREPPLingoGame:
         self.play_feedback_sound(False)
         
         # Show result
-        if hasattr(self, 'result_text') and self.result_text.winfo_exists():
+        def show_result(translation):
+            if word != self.current_word:
+                return
+            if not (hasattr(self, 'result_text') and self.result_text.winfo_exists()):
+                return
             self.result_text.config(state='normal')
             self.result_text.delete(1.0, tk.END)
             
-            timeout_message = f"⏰ Tiden er ute!\n\n🎯 Ord: '{self.current_word}'\n📖 Oversettelse: '{translation}'\n\n💡 Prøv å lytte mer nøye neste gang!"
+            timeout_message = f"⏰ Tiden er ute!\n\n🎯 Ord: '{word}'\n📖 Oversettelse: '{translation}'\n\n💡 Prøv å lytte mer nøye neste gang!"
             
             self.result_text.insert(tk.END, timeout_message)
             self.result_text.tag_add("timeout", "1.0", "end")
             self.result_text.tag_config("timeout", foreground=self.colors['red'])
             self.result_text.config(state='disabled')
         
+        show_result(self.get_translation_nonblocking(word, show_result))
+        
         # Wait a moment then load next word
         self.root.after(3000, self.next_word)
     
@@ -1618,12 +1694,7 @@ class PREPPLingoGame:
         self.game_running = False  # Game over in action mode
         
         # Store incorrect answer
-        translation = self.get_translation(self.current_word)
-        self.incorrect_answers.append({
-            'word': self.current_word,
-            'translation': translation,
-            'user_answer': "Tiden utløp"
-        })
+        self.record_answer(self.incorrect_answers, self.current_word, "Tiden utløp")
         
         # Update stats
         self.update_stats(self.current_difficulty_level, False)
@@ -1680,12 +1751,7 @@ class PREPPLingoGame:
                 self.score += 10
             
             # Store correct answer with translation
-            translation = self.get_translation(correct_answer)
-            self.correct_answers.append({
-                'word': correct_answer,
-                'translation': translation,
-                'user_answer': player_answer
-            })
+            self.record_answer(self.correct_answers, correct_answer, player_answer)
             
             # Update stats
             if game_mode == "action":
@@ -1718,7 +1784,11 @@ class PREPPLingoGame:
                     percentage = (self.current_time_bank / next_total_time) * 100
                     self.update_circular_progress(percentage)
             
-            if hasattr(self, 'result_text') and self.result_text.winfo_exists():
+            def show_result(translation):
+                if correct_answer != self.current_word:
+                    return
+                if not (hasattr(self, 'result_text') and self.result_text.winfo_exists()):
+                    return
                 self.result_text.config(state='normal')
                 self.result_text.delete(1.0, tk.END)
                 
@@ -1735,6 +1805,8 @@ class PREPPLingoGame:
                 self.result_text.tag_config("correct", foreground=self.colors['green'])
                 self.result_text.config(state='disabled')
             
+            show_result(self.get_translation_nonblocking(correct_answer, show_result))
+            
             # Wait a moment then load next word
             self.root.after(3000, self.next_word)
         else:
@@ -1782,53 +1854,27 @@ class PREPPLingoGame:
     def log_word_for_review(self, word, correct):
         """Log a word for review with spaced repetition interval"""
         try:
-            if os.path.exists(self.review_words_file):
-                with open(self.review_words_file, 'r', encoding='utf-8') as f:
-                    review_words = json.load(f)
-            else:
-                review_words = {}
-            
-            if word in review_words:
-                interval = review_words[word]["interval"]
-                if correct:
-                    interval = max(1, interval * 2)  # Double if correct
-                else:
-                    interval = 1  # Reset if wrong
-            else:
-                interval = 1
-            
-            next_review = datetime.now() + timedelta(days=interval)
-            review_words[word] = {
-                "next_review": next_review.isoformat(),
-                "interval": interval
-            }
-            
-            with open(self.review_words_file, 'w', encoding='utf-8') as f:
-                json.dump(review_words, f, indent=2)
+            # Interval doubles if correct, resets to 1 day if wrong
+            self.review_store.record_answer(word, correct)
         except Exception as e:
             print(f"Error logging word for review: {e}")
     
     def load_review_words(self):
         """Load words that need review with spaced repetition"""
-        review_words = {}
         try:
-            if os.path.exists(self.review_words_file):
-                with open(self.review_words_file, 'r', encoding='utf-8') as f:
-                    review_words = json.load(f)
+            return self.review_store.due_words()
         except Exception as e:
             print(f"Error loading review words: {e}")
-        
-        # Filter due words
-        now = datetime.now()
-        due_words = [word for word, data in review_words.items() 
-                     if datetime.fromisoformat(data["next_review"]) <= now]
-        return due_words
+            return []
     
     def end_session(self):
         """End the current session and show results"""
         # Stop all threads
         self.game_running = False
         self.answer_submitted = True
+        self.audio_prefetcher.cancel()
+        prefetch_stats = self.audio_prefetcher.get_stats()
+        print(f"🎵 Audio prefetch: {prefetch_stats['hits']} hits, {prefetch_stats['misses']} misses")
         
         # Wait for threads to finish
         if self.audio_thread and self.audio_thread.is_alive():
@@ -1837,8 +1883,6 @@ class PREPPLingoGame:
             self.timer_thread.join(timeout=1)
         if self.reveal_thread and self.reveal_thread.is_alive():
             self.reveal_thread.join(timeout=1)
-        if self.feedback_thread and self.feedback_thread.is_alive():
-            self.feedback_thread.join(timeout=1)
         
         # Calculate final statistics
         total_words = len(self.session_words)
@@ -1852,9 +1896,8 @@ class PREPPLingoGame:
         # Unlock next chapter if score is sufficient
         self.unlock_next_chapter(accuracy)
         
-        # Add to accuracy history
-        self.game_stats["accuracy_history"].append(accuracy)
-        self.game_stats["session_history"].append({
+        # Add to session history (bounded; older sessions are rolled up)
+        self.session_history.record(self.game_stats, {
             "date": datetime.now().isoformat(),
             "total_words": total_words,
             "correct_words": correct_words,
@@ -1862,8 +1905,9 @@ class PREPPLingoGame:
             "difficulty": getattr(self, 'difficulty_var', tk.StringVar(value="easy")).get()
         })
         
-        # Save updated stats
+        # Save updated stats and write them (plus review updates) out now
         self.save_game_stats()
+        self.persistence.request_flush()
         
         # Show comprehensive results screen
         self.show_results_screen(total_words, correct_words, incorrect_words, accuracy)
@@ -2030,7 +2074,6 @@ class PREPPLingoGame:
         self.audio_thread = None
         self.timer_thread = None
         self.reveal_thread = None
-        self.feedback_thread = None
         
         # Reset hearts
         self.current_hearts = self.max_hearts
@@ -2089,6 +2132,12 @@ class PREPPLingoGame:
     def run(self):
         """Run the game"""
         self.root.mainloop()
+        self.audio_prefetcher.shutdown()
+        self.async_translator.shutdown()
+        self.playback.close()
+        self.persistence.close()
+        self.review_store.close()
+        self.translation_service.close()
         
         
 
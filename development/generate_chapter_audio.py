@@ -2,7 +2,8 @@
 #!/usr/bin/env python3
 """
 Chapter Audio Generator
-Reads merged_chapter_x.txt files, generates audio with gTTS, and creates chapter structure
+Reads merged_chapter_x.txt files, generates audio with the configured TTS backend
+(gTTS by default), and creates chapter structure
 """
 
 import os
@@ -10,16 +11,45 @@ import json
 import shutil
 import re
 import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime
-import requests
-from gtts import gTTS
+
+from chapter_index import ChapterIndex
+from remote_translation import MyMemoryTranslator, RateLimiter
+from compiled_dictionary import CompiledDictionary
+from audio_store import AudioStore
+from tts_backends import create_tts_backend
+from build_journal import BuildJournal, JOURNAL_FILE_NAME
+from persistence import atomic_write_json
 
 class ChapterAudioGenerator:
-    def __init__(self):
+    def __init__(self, tts_workers=4, translation_workers=4,
+                 tts_requests_per_second=4.0, translation_requests_per_second=5.0,
+                 tts_backend=None):
         self.base_path = Path("/home/tuza/norskord/development")
         self.development_path = Path("/home/tuza/norskord/development")
         self.chapters_path = self.development_path / "chapters"
+        self.chapter_index = ChapterIndex(self.chapters_path)
+        
+        # Audio already synthesized by any script is reused from the shared store
+        self.audio_store = AudioStore()
+        
+        # A backend instance or name; defaults to $PREPP_TTS_BACKEND, else gTTS
+        if tts_backend is None or isinstance(tts_backend, str):
+            tts_backend = create_tts_backend(tts_backend)
+        self.tts_backend = tts_backend
+        
+        # Synthesis and translation run in separate bounded pools, each with its own rate limit
+        # (local TTS backends aren't throttled)
+        self.tts_workers = max(1, tts_workers)
+        self.tts_rate_limiter = RateLimiter(tts_requests_per_second, burst=self.tts_workers)
+        self.translator = MyMemoryTranslator(timeout=5, max_workers=max(1, translation_workers),
+                                             requests_per_second=translation_requests_per_second)
+        self.dictionary_path = self.development_path / "translations.dict"
+        self.compiled_dictionary = None
+        self._dictionary_lock = threading.Lock()  # Translations run on worker threads
         
     def get_english_translation(self, norwegian_word):
         """Get English translation using online dictionary API"""
@@ -39,20 +69,24 @@ class ChapterAudioGenerator:
     def try_my_memory_api(self, word):
         """Try MyMemory translation API"""
         try:
-            url = f"https://api.mymemory.translated.net/get?q={word}&langpair=no|en"
-            response = requests.get(url, timeout=5)
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('responseStatus') == 200:
-                    translation = data['responseData']['translatedText']
-                    if translation and translation != word:
-                        return translation
-        except:
-            pass
-        return None
+            return self.translator.translate(word)
+        except Exception:
+            return None
     
     def get_fallback_translation(self, word):
         """Fallback translations for common Norwegian words"""
+        # The compiled dictionary (built with compiled_dictionary.py) covers the full vocabulary
+        with self._dictionary_lock:
+            if self.compiled_dictionary is None and self.dictionary_path.exists():
+                self.compiled_dictionary = CompiledDictionary(str(self.dictionary_path))
+        if self.compiled_dictionary is not None:
+            try:
+                translation = self.compiled_dictionary.get(word)
+                if translation:
+                    return translation
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Compiled dictionary unavailable: {e}")
+        
         translations = {
             "hei": "hello",
             "takk": "thanks",
@@ -117,23 +151,50 @@ class ChapterAudioGenerator:
                 return "hard"
     
     def generate_audio_file(self, word, output_path):
-        """Generate audio file using gTTS"""
+        """Generate audio file with the TTS backend (or link it from the audio store)"""
         try:
-            # Create gTTS object for Norwegian
-            tts = gTTS(text=word, lang='no', slow=False)
+            def synthesize(store_path):
+                if self.tts_backend.rate_limited:
+                    self.tts_rate_limiter.acquire()
+                self.tts_backend.synthesize(word, store_path, lang='no')
             
             # Save to file
             audio_filename = f"{word}.mp3"
             audio_path = output_path / audio_filename
             
-            tts.save(str(audio_path))
-            print(f"🎵 Generated audio: {audio_filename}")
+            if self.audio_store.materialize(word, str(audio_path), synthesize, lang='no',
+                                            voice=self.tts_backend.voice_id):
+                print(f"🎵 Generated audio: {audio_filename}")
+            else:
+                print(f"♻️ Reused stored audio: {audio_filename}")
             return audio_filename
             
         except Exception as e:
             print(f"❌ Error generating audio for '{word}': {e}")
             return None
     
+    def generate_audio_batch(self, words, output_path):
+        """Generate audio for several words with one backend batch call.
+        Returns the audio file names in word order (None for failures)."""
+        try:
+            items = [(word, str(output_path / f"{word}.mp3")) for word in words]
+            results = self.audio_store.materialize_many(
+                items, lambda batch: self.tts_backend.synthesize_batch(batch, lang='no'),
+                lang='no', voice=self.tts_backend.voice_id)
+        except Exception as e:
+            print(f"❌ Error generating audio batch: {e}")
+            return [None] * len(words)
+        
+        audio_filenames = []
+        for word in words:
+            created = results.get(word)
+            if created is None:
+                audio_filenames.append(None)
+                continue
+            print(f"🎵 Generated audio: {word}.mp3" if created else f"♻️ Reused stored audio: {word}.mp3")
+            audio_filenames.append(f"{word}.mp3")
+        return audio_filenames
+    
     def find_chapter_files(self):
         """Find all merged_chapter_x.txt files"""
         chapter_files = []
@@ -146,24 +207,56 @@ class ChapterAudioGenerator:
     
     def get_existing_words(self):
         """Get all existing words from all chapters to avoid duplicates"""
-        existing_words = set()
-        
         if not self.chapters_path.exists():
-            return existing_words
-        
-        for chapter_dir in self.chapters_path.iterdir():
-            if chapter_dir.is_dir():
-                metadata_file = chapter_dir / "data" / "words_metadata.json"
-                if metadata_file.exists():
-                    try:
-                        with open(metadata_file, 'r', encoding='utf-8') as f:
-                            data = json.load(f)
-                            for word in data.get('words', {}):
-                                existing_words.add(word.lower())
-                    except Exception as e:
-                        print(f"Error reading {metadata_file}: {e}")
-        
-        return existing_words
+            return set()
+        
+        # One read of the chapter index instead of parsing every chapter
+        return self.chapter_index.get_existing_words()
+    
+    def read_chapter_words(self, chapter_file):
+        """Read the cleaned word names from a chapter file (None on error)"""
+        try:
+            with open(chapter_file, 'r', encoding='utf-8') as f:
+                lines = f.readlines()
+        except Exception as e:
+            print(f"❌ Error reading {chapter_file}: {e}")
+            return None
+        
+        return [
+            self.clean_word_name(line.strip()) for line in lines
+            if line.strip() and not line.strip().startswith('#')  # Skip empty lines and comments
+        ]
+    
+    def get_build_journal(self, chapter_path):
+        return BuildJournal(chapter_path / "data" / JOURNAL_FILE_NAME)
+    
+    def plan_chapter_file(self, chapter_file):
+        """Work a build of this chapter file would do, without doing any of it"""
+        match = re.search(r'merged_chapter_(\d+)', chapter_file.name)
+        word_names = self.read_chapter_words(chapter_file) if match else None
+        if word_names is None:
+            return None
+        
+        chapter_path = self.chapters_path / f"capital_{self.number_to_word(match.group(1))}"
+        journaled = self.get_build_journal(chapter_path).load()
+        existing_words = self.get_existing_words()
+        
+        plan = {"chapter": chapter_path.name, "words": len(word_names), "duplicates": 0,
+                "resumable": 0, "to_build": 0, "audio_stored": 0, "to_synthesize": 0}
+        seen = set()
+        for word_name in word_names:
+            if word_name in journaled:
+                plan["resumable"] += 1
+            elif word_name.lower() in existing_words or word_name.lower() in seen:
+                plan["duplicates"] += 1
+            else:
+                plan["to_build"] += 1
+                if self.audio_store.get(word_name, lang='no', voice=self.tts_backend.voice_id):
+                    plan["audio_stored"] += 1
+                else:
+                    plan["to_synthesize"] += 1
+            seen.add(word_name.lower())
+        return plan
     
     def process_chapter_file(self, chapter_file):
         """Process a single merged_chapter_x.txt file"""
@@ -178,9 +271,16 @@ class ChapterAudioGenerator:
         chapter_num = match.group(1)
         chapter_folder_name = f"capital_{self.number_to_word(chapter_num)}"
         
-        # Check if chapter already exists
+        # Finished words from an interrupted build of this chapter
         chapter_path = self.chapters_path / chapter_folder_name
-        if chapter_path.exists():
+        journal = self.get_build_journal(chapter_path)
+        journaled = journal.load()
+        
+        # Check if chapter already exists
+        if journaled:
+            print(f"⏯️ Resuming interrupted build of {chapter_folder_name} "
+                  f"({len(journaled)} words already done)")
+        elif chapter_path.exists():
             print(f"⚠️ Chapter {chapter_folder_name} already exists!")
             # Auto-update if running non-interactively (command-line mode)
             if hasattr(self, 'auto_update') and self.auto_update:
@@ -199,11 +299,8 @@ class ChapterAudioGenerator:
         existing_words = self.get_existing_words()
         
         # Read words from file
-        try:
-            with open(chapter_file, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-        except Exception as e:
-            print(f"❌ Error reading {chapter_file}: {e}")
+        word_names = self.read_chapter_words(chapter_file)
+        if word_names is None:
             return False
         
         # Load existing words metadata if updating
@@ -222,58 +319,105 @@ class ChapterAudioGenerator:
         new_words = 0
         skipped_words = 0
         
-        print(f"📝 Found {len(lines)} words in file")
+        print(f"📝 Found {len(word_names)} words in file")
         
-        for line in lines:
-            word = line.strip()
-            if not word or word.startswith('#'):  # Skip empty lines and comments
+        new_word_names = []
+        for word_name in word_names:
+            # Words checkpointed by an earlier run are not built again
+            if word_name in journaled:
+                words_metadata[word_name] = journaled[word_name]
+                existing_words.add(word_name.lower())
+                new_words += 1
                 continue
             
-            # Clean word name
-            word_name = self.clean_word_name(word)
-            
             # Check for duplicates
             if word_name.lower() in existing_words:
                 print(f"⚠️ Skipping duplicate word: {word_name}")
                 skipped_words += 1
                 continue
             
-            # Create chapter structure
+            existing_words.add(word_name.lower())
+            new_word_names.append(word_name)
+        
+        # Create chapter structure
+        if new_word_names:
             self.create_chapter_structure(chapter_path)
-            
-            # Generate audio file
-            audio_filename = self.generate_audio_file(word_name, chapter_path / "audio")
-            if not audio_filename:
-                print(f"❌ Failed to generate audio for: {word_name}")
-                continue
-            
-            # Get English translation
-            print(f"🔍 Getting translation for: {word_name}")
-            translation = self.get_english_translation(word_name)
-            
-            # Determine difficulty
-            difficulty = self.get_difficulty_level(word_name)
-            
-            # Add to metadata
-            words_metadata[word_name] = {
-                "audio_file": audio_filename,
-                "difficulty": difficulty,
-                "category": "general",
-                "chapter": chapter_num,
-                "tags": [],
-                "translation": translation,
-                "last_updated": datetime.now().isoformat(),
-                "auto_generated": True
+        
+        # Synthesis and translation run concurrently, one translation per word, so each
+        # word is checkpointed as soon as both its audio and its translation are done
+        batch_size = self.tts_backend.batch_size
+        # Batching backends already use every core within a batch; run their batches one at a time
+        tts_workers = 1 if batch_size > 1 else self.tts_workers
+        print(f"🎵 Generating audio with {self.tts_backend.name} ({tts_workers} workers, "
+              f"batches of {batch_size}), translating with {self.translator.max_workers} workers")
+        audio_filenames = {}
+        translations = {}
+        finished = {}
+        with ThreadPoolExecutor(max_workers=self.translator.max_workers,
+                                thread_name_prefix="translate") as translation_pool, \
+                ThreadPoolExecutor(max_workers=tts_workers, thread_name_prefix="tts") as tts_pool:
+            # future -> (kind, the words it covers)
+            futures = {
+                translation_pool.submit(self.get_english_translation, word_name): ("translation", [word_name])
+                for word_name in new_word_names
             }
+            if batch_size > 1:
+                # Backends that synthesize in bulk get whole chunks of the chapter
+                for i in range(0, len(new_word_names), batch_size):
+                    chunk = new_word_names[i:i + batch_size]
+                    futures[tts_pool.submit(self.generate_audio_batch, chunk, chapter_path / "audio")] = \
+                        ("audio", chunk)
+            else:
+                for word_name in new_word_names:
+                    futures[tts_pool.submit(self.generate_audio_file, word_name, chapter_path / "audio")] = \
+                        ("audio", [word_name])
             
-            existing_words.add(word_name.lower())
-            new_words += 1
-            print(f"✅ Added: {word_name} ({difficulty}) - {translation}")
+            for future in as_completed(futures):
+                kind, future_words = futures[future]
+                if kind == "translation":
+                    translations[future_words[0]] = future.result()
+                elif batch_size > 1:
+                    audio_filenames.update(zip(future_words, future.result()))
+                else:
+                    audio_filenames[future_words[0]] = future.result()
+                
+                for word_name in future_words:
+                    if word_name not in translations or word_name not in audio_filenames:
+                        continue
+                    audio_filename = audio_filenames[word_name]
+                    if not audio_filename:
+                        print(f"❌ Failed to generate audio for: {word_name}")
+                        continue
+                    
+                    translation = translations[word_name]
+                    
+                    # Determine difficulty
+                    difficulty = self.get_difficulty_level(word_name)
+                    
+                    finished[word_name] = {
+                        "audio_file": audio_filename,
+                        "difficulty": difficulty,
+                        "category": "general",
+                        "chapter": chapter_num,
+                        "tags": [],
+                        "translation": translation,
+                        "last_updated": datetime.now().isoformat(),
+                        "auto_generated": True
+                    }
+                    
+                    # Checkpoint so a restart doesn't redo this word
+                    journal.record(word_name, finished[word_name])
+                    print(f"✅ Added: {word_name} ({difficulty}) - {translation}")
+        
+        # Add to metadata in file order
+        for word_name in new_word_names:
+            if word_name in finished:
+                words_metadata[word_name] = finished[word_name]
+                new_words += 1
         
         # Save words metadata
         words_metadata_file = chapter_path / "data" / "words_metadata.json"
-        with open(words_metadata_file, 'w', encoding='utf-8') as f:
-            json.dump({"words": words_metadata}, f, ensure_ascii=False, indent=2)
+        atomic_write_json(str(words_metadata_file), {"words": words_metadata}, ensure_ascii=False)
         
         # Get total word count (including existing words)
         total_words = len(words_metadata)
@@ -305,6 +449,12 @@ class ChapterAudioGenerator:
         with open(chapter_metadata_file, 'w', encoding='utf-8') as f:
             json.dump(chapter_metadata, f, ensure_ascii=False, indent=2)
         
+        # Keep the chapter index manifest in sync
+        self.chapter_index.update_chapter(chapter_folder_name)
+        
+        # Build committed; the checkpoints are no longer needed
+        journal.complete()
+        
         print(f"\n✅ Chapter {chapter_folder_name} created successfully!")
         print(f"📊 Added {new_words} new words, skipped {skipped_words} duplicates")
         print(f"🎵 Audio files generated in: {chapter_path / 'audio'}")
@@ -334,20 +484,33 @@ class ChapterAudioGenerator:
         }
         return numbers.get(num, f"Kapittel {num}")
     
-    def run(self, chapter_number=None, auto_update=False):
+    def print_plan(self, chapter_files):
+        """Show how much work building the chapter files would take"""
+        print("📋 Dry run - nothing will be generated or written")
+        totals = {"to_build": 0, "to_synthesize": 0, "resumable": 0}
+        for chapter_file in chapter_files:
+            plan = self.plan_chapter_file(chapter_file)
+            if plan is None:
+                print(f"  - {chapter_file.name}: ❌ could not be read")
+                continue
+            print(f"  - {chapter_file.name} -> {plan['chapter']}: {plan['words']} words, "
+                  f"{plan['duplicates']} duplicates, {plan['resumable']} already done, "
+                  f"{plan['to_build']} to build ({plan['to_synthesize']} to synthesize, "
+                  f"{plan['audio_stored']} audio already stored)")
+            for key in totals:
+                totals[key] += plan[key]
+        print(f"\n📊 Remaining: {totals['to_build']} words to build, "
+              f"{totals['to_synthesize']} TTS calls, {totals['resumable']} resumable from journals")
+        return totals
+    
+    def run(self, chapter_number=None, auto_update=False, dry_run=False):
         """Main execution function"""
         self.auto_update = auto_update
         
         print("🚀 Chapter Audio Generator - Processing merged_chapter_x.txt files")
         print("=" * 70)
         
-        # Check if gTTS is available
-        try:
-            from gtts import gTTS
-            print("✅ gTTS (Google Text-to-Speech) is available")
-        except ImportError:
-            print("❌ gTTS not installed. Install with: pip install gtts")
-            return
+        print(f"✅ TTS backend: {self.tts_backend.name} (voice {self.tts_backend.voice_id})")
         
         # Find chapter files
         if chapter_number:
@@ -374,6 +537,10 @@ class ChapterAudioGenerator:
         for file in chapter_files:
             print(f"  - {file.name}")
         
+        if dry_run:
+            self.print_plan(chapter_files)
+            return
+        
         # Process each file
         success_count = 0
         for chapter_file in chapter_files:
@@ -384,13 +551,24 @@ class ChapterAudioGenerator:
         print(f"🎉 Processing complete!")
         print(f"✅ Successfully created/updated {success_count} chapters")
         print(f"📚 Your chapters are ready to use in the app!")
-        print(f"🎵 All audio files generated with Norwegian TTS")
+        print(f"🎵 All audio files generated with Norwegian TTS ({self.tts_backend.name})")
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Generate audio files for Norwegian learning chapters')
     parser.add_argument('--chapter', type=int, help='Chapter number to process (e.g., 3 for merged_chapter_3.txt)')
     parser.add_argument('--auto-update', action='store_true', help='Automatically update existing chapters without prompting')
+    parser.add_argument('--tts-workers', type=int, default=4, help='Parallel audio generation workers for per-word backends such as gTTS (default: 4)')
+    parser.add_argument('--translation-workers', type=int, default=4, help='Parallel translation workers (default: 4)')
+    parser.add_argument('--tts-backend', choices=['gtts', 'espeak', 'piper', 'fake'],
+                        help='TTS engine (default: $PREPP_TTS_BACKEND or gtts; espeak/piper run offline)')
+    parser.add_argument('--dry-run', action='store_true', help='Show how much work is left without generating anything')
     args = parser.parse_args()
     
-    generator = ChapterAudioGenerator()
-    generator.run(chapter_number=args.chapter, auto_update=args.auto_update)
+    try:
+        generator = ChapterAudioGenerator(tts_workers=args.tts_workers,
+                                          translation_workers=args.translation_workers,
+                                          tts_backend=args.tts_backend)
+    except (ImportError, RuntimeError, ValueError) as e:
+        print(f"❌ TTS backend unavailable: {e}")
+        raise SystemExit(1)
+    generator.run(chapter_number=args.chapter, auto_update=args.auto_update, dry_run=args.dry_run)
@@ -0,0 +1,183 @@
+"""
+MP3 Frame Utilities
+Header-level parsing of MPEG audio layer III streams, so MP3 data can be
+appended, measured and sliced on frame boundaries without decoding it
+"""
+
+import os
+from typing import BinaryIO, Iterator, NamedTuple, Optional
+
+# Bitrates in kbit/s by bitrate index (layer III)
+MPEG1_BITRATES = [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 0]
+MPEG2_BITRATES = [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160, 0]
+SAMPLE_RATES = {3: [44100, 48000, 32000], 2: [22050, 24000, 16000], 0: [11025, 12000, 8000]}
+
+ID3V1_SIZE = 128
+
+
+class FrameHeader(NamedTuple):
+    length: int  # Bytes, including the header
+    samples: int  # Samples per channel
+    sample_rate: int
+    channels: int
+    side_info: int  # Bytes of side information after the header (and CRC)
+
+
+class Frame(NamedTuple):
+    offset: int
+    header: FrameHeader
+
+
+def parse_frame_header(data: bytes) -> Optional[FrameHeader]:
+    """Parse a 4-byte layer III frame header (None if it isn't one)"""
+    if len(data) < 4 or data[0] != 0xFF or (data[1] & 0xE0) != 0xE0:
+        return None
+    version = (data[1] >> 3) & 0x3  # 3 = MPEG1, 2 = MPEG2, 0 = MPEG2.5
+    layer = (data[1] >> 1) & 0x3
+    bitrate_index = data[2] >> 4
+    sample_rate_index = (data[2] >> 2) & 0x3
+    if version == 1 or layer != 1 or sample_rate_index == 3:
+        return None
+    bitrate = (MPEG1_BITRATES if version == 3 else MPEG2_BITRATES)[bitrate_index] * 1000
+    if bitrate == 0:
+        return None  # Free-format and invalid bitrates aren't supported
+
+    sample_rate = SAMPLE_RATES[version][sample_rate_index]
+    padding = (data[2] >> 1) & 0x1
+    mono = (data[3] >> 6) == 3
+    crc = 0 if data[1] & 0x1 else 2
+    if version == 3:
+        length = 144 * bitrate // sample_rate + padding
+        samples = 1152
+        side_info = 17 if mono else 32
+    else:
+        length = 72 * bitrate // sample_rate + padding
+        samples = 576
+        side_info = 9 if mono else 17
+    return FrameHeader(length, samples, sample_rate, 1 if mono else 2, crc + side_info)
+
+
+def id3v2_size(data: bytes) -> int:
+    """Size of a leading ID3v2 tag (0 if there is none)"""
+    if len(data) < 10 or data[:3] != b"ID3":
+        return 0
+    size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+    footer = 10 if data[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def is_info_frame(frame: bytes, header: FrameHeader) -> bool:
+    """True for the Xing/Info/VBRI frame encoders put first; it describes the
+    whole file, so it's wrong once anything is appended"""
+    tag = frame[4 + header.side_info:8 + header.side_info]
+    return tag in (b"Xing", b"Info") or frame[36:40] == b"VBRI"
+
+
+def iter_frames(f: BinaryIO, start: int = 0, end: Optional[int] = None) -> Iterator[Frame]:
+    """Frames in f between byte offsets start and end, reading only headers.
+    Stops at the first byte that isn't a frame (e.g. an ID3v1 tag)."""
+    if end is None:
+        end = os.fstat(f.fileno()).st_size
+    offset = start
+    while offset + 4 <= end:
+        f.seek(offset)
+        header = parse_frame_header(f.read(4))
+        if header is None or offset + header.length > end:
+            break
+        yield Frame(offset, header)
+        offset += header.length
+
+
+def audio_frames(data: bytes) -> bytes:
+    """Only the audio frames of an MP3 file: no ID3v2/ID3v1 tags and no Info
+    frame, so the result can be appended to another stream as it is"""
+    offset = id3v2_size(data)
+    end = len(data)
+    if end - offset >= ID3V1_SIZE and data[end - ID3V1_SIZE:end - ID3V1_SIZE + 3] == b"TAG":
+        end -= ID3V1_SIZE
+
+    frames = bytearray()
+    first = True
+    while offset + 4 <= end:
+        header = parse_frame_header(data[offset:offset + 4])
+        if header is None or offset + header.length > end:
+            break
+        frame = data[offset:offset + header.length]
+        if not (first and is_info_frame(frame, header)):
+            frames += frame
+        first = False
+        offset += header.length
+    return bytes(frames)
+
+
+def stream_format(path: str) -> Optional[FrameHeader]:
+    """Header of the first audio frame of an MP3 file (None if there are none)"""
+    with open(path, 'rb') as f:
+        head = f.read(64 * 1024)
+    frames = audio_frames(head)
+    return parse_frame_header(frames[:4]) if frames else None
+
+
+def needs_cleanup(path: str) -> bool:
+    """True if the file has tags or an Info frame that appending would invalidate"""
+    with open(path, 'rb') as f:
+        head = f.read(64 * 1024)
+        f.seek(max(0, os.fstat(f.fileno()).st_size - ID3V1_SIZE))
+        tail = f.read(3)
+    if id3v2_size(head) or tail == b"TAG":
+        return True
+    header = parse_frame_header(head[:4])
+    return header is not None and is_info_frame(head[:header.length], header)
+
+
+def strip_file(path: str):
+    """Rewrite an MP3 file in place as bare audio frames (a stream copy, no
+    re-encode), one frame at a time so large files aren't read into memory"""
+    tmp_path = path + ".tmp"
+    with open(path, 'rb') as source, open(tmp_path, 'wb') as output:
+        size = os.fstat(source.fileno()).st_size
+        start = id3v2_size(source.read(10))
+        end = size
+        if size - start >= ID3V1_SIZE:
+            source.seek(size - ID3V1_SIZE)
+            if source.read(3) == b"TAG":
+                end -= ID3V1_SIZE
+
+        first = True
+        for frame in iter_frames(source, start, end):
+            source.seek(frame.offset)
+            data = source.read(frame.header.length)
+            if not (first and is_info_frame(data, frame.header)):
+                output.write(data)
+            first = False
+        output.flush()
+        os.fsync(output.fileno())
+    os.replace(tmp_path, path)
+
+
+def append_frames(path: str, frames: bytes):
+    """Append audio frames to an MP3 file. If writing fails, the file is
+    truncated back to its previous size so it never ends mid-frame."""
+    with open(path, 'ab') as f:
+        size = f.tell()
+        try:
+            f.write(frames)
+            f.flush()
+            os.fsync(f.fileno())
+        except BaseException:
+            f.truncate(size)
+            raise
+    return size
+
+
+def duration_seconds(frames: bytes) -> float:
+    """Duration of a run of audio frames"""
+    seconds = 0.0
+    offset = 0
+    while offset + 4 <= len(frames):
+        header = parse_frame_header(frames[offset:offset + 4])
+        if header is None:
+            break
+        seconds += header.samples / header.sample_rate
+        offset += header.length
+    return seconds
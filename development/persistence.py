@@ -0,0 +1,135 @@
+"""
+Write-Behind Persistence
+Collects state changes in memory and writes them from a background thread,
+always through an atomic temp-file rename
+"""
+
+import atexit
+import copy
+import json
+import os
+import tempfile
+import threading
+from typing import Callable, List
+
+
+def atomic_write_text(path: str, text: str):
+    """Write a file so readers (and crashes) only ever see the old or new version"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def atomic_write_json(path: str, data, indent: int = 2, ensure_ascii: bool = True):
+    """Serialize data to JSON and write it atomically"""
+    atomic_write_text(path, json.dumps(data, indent=indent, ensure_ascii=ensure_ascii))
+
+
+class WriteBehindWriter:
+    """
+    Buffers JSON snapshots and flush hooks, and flushes them on a timer,
+    on request (e.g. session end) and at shutdown
+    """
+
+    def __init__(self, flush_interval: float = 5.0):
+        self.flush_interval = flush_interval
+        self.flush_count = 0
+        self._pending_json = {}  # path -> snapshot, latest snapshot wins
+        self._pending_lines = {}  # path -> lines to append, in order
+        self._flush_hooks: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+
+        self._thread = threading.Thread(target=self._run, name="write-behind")
+        self._thread.daemon = True
+        self._thread.start()
+        atexit.register(self.close)
+
+    def write_json(self, path: str, data):
+        """Stage a snapshot of data to be written to path"""
+        snapshot = copy.deepcopy(data)
+        with self._lock:
+            self._pending_json[path] = snapshot
+
+    def append_line(self, path: str, line: str):
+        """Stage a line to be appended to a log file"""
+        with self._lock:
+            self._pending_lines.setdefault(path, []).append(line)
+
+    def add_flush_hook(self, hook: Callable[[], None]):
+        """Register a callable that persists its own buffered changes"""
+        with self._lock:
+            self._flush_hooks.append(hook)
+
+    def request_flush(self):
+        """Ask the background thread to flush now without waiting for it"""
+        self._wake.set()
+
+    def has_pending(self) -> bool:
+        with self._lock:
+            return bool(self._pending_json or self._pending_lines)
+
+    def flush(self):
+        """Write everything that is pending (runs on the calling thread)"""
+        with self._flush_lock:
+            with self._lock:
+                pending = self._pending_json
+                self._pending_json = {}
+                pending_lines = self._pending_lines
+                self._pending_lines = {}
+                hooks = list(self._flush_hooks)
+
+            for path, data in pending.items():
+                try:
+                    atomic_write_json(path, data)
+                except Exception as e:
+                    print(f"Error saving {path}: {e}")
+                    # Keep the snapshot for the next flush unless a newer one arrived
+                    with self._lock:
+                        self._pending_json.setdefault(path, data)
+
+            for path, lines in pending_lines.items():
+                try:
+                    with open(path, 'a', encoding='utf-8') as f:
+                        f.write("".join(line + "\n" for line in lines))
+                        f.flush()
+                        os.fsync(f.fileno())
+                except Exception as e:
+                    print(f"Error appending to {path}: {e}")
+
+            for hook in hooks:
+                try:
+                    hook()
+                except Exception as e:
+                    print(f"Error in flush hook: {e}")
+
+            self.flush_count += 1
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            if self._closed:
+                break
+            self.flush()
+
+    def close(self):
+        """Stop the background thread and flush whatever is left"""
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join(timeout=5)
+        self.flush()
@@ -0,0 +1,187 @@
+"""
+Remote Translation Client
+Pooled HTTP session, rate limiting, retry with backoff and concurrent batch
+lookups for the online translation APIs
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+GOOGLE_TRANSLATE_URL = "https://translate.googleapis.com/translate_a/single"
+MYMEMORY_URL = "https://api.mymemory.translated.net/get"
+
+# Status codes worth retrying (rate limited or temporary server trouble)
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class RemoteUnavailable(Exception):
+    """
+    The translation API couldn't be reached or didn't answer usefully (after
+    retries). Unlike a None result, this says nothing about the word.
+    """
+
+
+class RateLimiter:
+    """
+    Token bucket shared by all worker threads: at most `rate` requests per
+    second on average, with bursts of up to `burst` requests
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a request may be sent"""
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class RemoteTranslator:
+    """
+    Norwegian -> English lookups against the Google Translate endpoint.
+    Subclasses change the request parameters and response parsing.
+    """
+
+    name = "google"
+
+    def __init__(self, base_url: str = GOOGLE_TRANSLATE_URL, max_workers: int = 4,
+                 requests_per_second: float = 5.0, max_retries: int = 3,
+                 backoff: float = 0.5, timeout: float = 10):
+        self.base_url = base_url
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.rate_limiter = RateLimiter(requests_per_second, burst=max_workers)
+        self.requests_sent = 0
+
+        # One connection pool reused by every request and worker thread
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._count_lock = threading.Lock()
+
+    def _build_params(self, word: str) -> Dict[str, str]:
+        return {
+            "client": "gtx",
+            "sl": "no",  # Norwegian
+            "tl": "en",  # English
+            "dt": "t",
+            "q": word
+        }
+
+    def _parse_response(self, word: str, data) -> Optional[str]:
+        if data and len(data) > 0 and data[0] and len(data[0]) > 0:
+            translation = data[0][0][0]
+            if translation and translation != word:
+                return translation
+        return None
+
+    def _retry_delay(self, attempt: int, response=None) -> float:
+        """Exponential backoff, or the server's Retry-After if it sent one (capped
+        at the request timeout, so a long Retry-After can't stall a worker)"""
+        if response is not None:
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                return min(float(retry_after), self.timeout)
+        return self.backoff * (2 ** attempt)
+
+    def translate(self, word: str) -> Optional[str]:
+        """Translate one word, retrying temporary failures. Returns None if the
+        API answered without a translation; raises RemoteUnavailable if it
+        couldn't be asked."""
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire()
+            with self._count_lock:
+                self.requests_sent += 1
+
+            response = None
+            try:
+                response = self.session.get(self.base_url, params=self._build_params(word),
+                                            timeout=self.timeout)
+                if response.status_code == 200:
+                    return self._parse_response(word, response.json())
+                error = f"HTTP {response.status_code}"
+                if response.status_code not in RETRY_STATUS_CODES:
+                    break
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = str(e)
+            except requests.RequestException as e:
+                # Not worth retrying: redirect loops, broken transfers
+                error = repr(e)
+                break
+            except (ValueError, LookupError, TypeError, AttributeError) as e:
+                # An answer, just not one we understand
+                print(f"Error with {self.name} translation for '{word}': {e!r}")
+                return None
+
+            if attempt < self.max_retries:
+                time.sleep(self._retry_delay(attempt, response))
+
+        print(f"Error with {self.name} translation for '{word}': {error}")
+        raise RemoteUnavailable(f"{self.name}: {error}")
+
+    def translate_many(self, words: Iterable[str]) -> Dict[str, Optional[str]]:
+        """Translate words concurrently (duplicates are looked up once). Words the
+        API couldn't be asked about are left out of the result."""
+        unique_words = list(dict.fromkeys(words))
+        if not unique_words:
+            return {}
+
+        def lookup(word):
+            try:
+                return word, self.translate(word)
+            except RemoteUnavailable:
+                return None
+
+        workers = min(self.max_workers, len(unique_words))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="translate") as executor:
+            return dict(result for result in executor.map(lookup, unique_words) if result is not None)
+
+    def close(self):
+        self.session.close()
+
+
+class MyMemoryTranslator(RemoteTranslator):
+    """
+    Lookups against the MyMemory translation API
+    """
+
+    name = "MyMemory"
+
+    def __init__(self, base_url: str = MYMEMORY_URL, **kwargs):
+        super().__init__(base_url=base_url, **kwargs)
+
+    def _build_params(self, word: str) -> Dict[str, str]:
+        return {"q": word, "langpair": "no|en"}
+
+    def _parse_response(self, word: str, data) -> Optional[str]:
+        # MyMemory reports quota and server trouble in the body of a 200 response
+        if data.get('responseStatus') in RETRY_STATUS_CODES:
+            raise RemoteUnavailable(f"{self.name}: status {data['responseStatus']} "
+                                    f"{data.get('responseDetails', '')}")
+        if data.get('responseStatus') == 200:
+            translation = data['responseData']['translatedText']
+            if translation and translation != word:
+                return translation
+        return None
@@ -0,0 +1,160 @@
+"""
+Spaced-Repetition Review Store
+SQLite-backed review intervals, replacing full rewrites of words_to_review.json
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+SECONDS_PER_DAY = 24 * 60 * 60
+
+
+class ReviewStore:
+    """
+    Stores each word's review interval and next review time.
+    Answers are single-row upserts and due words come from one indexed query.
+    With write_behind=True answers are buffered in memory until flush().
+    """
+
+    def __init__(self, db_path: str = "words_to_review.db", legacy_json_path: Optional[str] = None,
+                 write_behind: bool = False):
+        self.db_path = db_path
+        self.write_behind = write_behind
+        self._pending = []  # (word, correct, answered_at) in answer order
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+
+        if legacy_json_path:
+            self.import_json(legacy_json_path)
+
+    def _create_schema(self):
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS reviews (
+                    word TEXT PRIMARY KEY,
+                    next_review REAL NOT NULL,
+                    interval INTEGER NOT NULL
+                )
+            """)
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_reviews_next_review ON reviews (next_review)"
+            )
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                )
+            """)
+
+    def import_json(self, json_path: str) -> int:
+        """Import the legacy words_to_review.json once; returns words imported"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM meta WHERE key = 'json_imported'"
+            ).fetchone()
+        if row or not os.path.exists(json_path):
+            return 0
+
+        try:
+            with open(json_path, 'r', encoding='utf-8') as f:
+                review_words = json.load(f)
+        except Exception as e:
+            print(f"Error reading {json_path}: {e}")
+            return 0
+
+        rows = []
+        for word, data in review_words.items():
+            try:
+                next_review = datetime.fromisoformat(data["next_review"]).timestamp()
+                rows.append((word, next_review, int(data.get("interval", 1))))
+            except (KeyError, TypeError, ValueError) as e:
+                print(f"⚠️ Skipping review entry for '{word}': {e}")
+
+        with self._lock, self._conn:
+            # Words already in the database are newer than the JSON file
+            self._conn.executemany(
+                "INSERT INTO reviews (word, next_review, interval) VALUES (?, ?, ?) "
+                "ON CONFLICT (word) DO NOTHING",
+                rows
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('json_imported', ?)",
+                (datetime.now().isoformat(),)
+            )
+
+        print(f"✅ Imported {len(rows)} review words from {json_path}")
+        return len(rows)
+
+    def record_answer(self, word: str, correct: bool, now: Optional[float] = None):
+        """Double the interval on a correct answer, reset it to one day otherwise"""
+        now = time.time() if now is None else now
+        if self.write_behind:
+            with self._lock:
+                self._pending.append((word, bool(correct), now))
+            return
+        self._apply([(word, bool(correct), now)])
+
+    def _apply(self, answers):
+        new_interval = "CASE WHEN :correct THEN max(1, interval * 2) ELSE 1 END"
+        with self._lock, self._conn:
+            # executemany applies answers in order, so repeats of a word compound
+            self._conn.executemany(
+                "INSERT INTO reviews (word, next_review, interval) "
+                "VALUES (:word, :now + :day, 1) "
+                "ON CONFLICT (word) DO UPDATE SET "
+                f"interval = {new_interval}, "
+                f"next_review = :now + :day * ({new_interval})",
+                [{"word": word, "correct": correct, "now": now, "day": SECONDS_PER_DAY}
+                 for word, correct, now in answers]
+            )
+
+    def flush(self):
+        """Write buffered answers in a single transaction"""
+        with self._lock:
+            answers = self._pending
+            self._pending = []
+        if answers:
+            self._apply(answers)
+
+    def due_words(self, now: Optional[float] = None) -> List[str]:
+        """Get words whose next review time has passed, most overdue first"""
+        now = time.time() if now is None else now
+        self.flush()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT word FROM reviews WHERE next_review <= ? ORDER BY next_review",
+                (now,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def get_entry(self, word: str) -> Optional[Dict]:
+        """Get a word's review state in the same shape as the old JSON file"""
+        self.flush()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT next_review, interval FROM reviews WHERE word = ?", (word,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "next_review": datetime.fromtimestamp(row[0]).isoformat(),
+            "interval": row[1]
+        }
+
+    def count(self) -> int:
+        self.flush()
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM reviews").fetchone()[0]
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            self._conn.close()
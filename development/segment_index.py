@@ -0,0 +1,157 @@
+"""
+Merged Audio Segment Index
+Sidecar index of where each word's repeat block sits in the merged listening
+track (bytes and seconds), and a reader that seeks straight to word N
+"""
+
+import bisect
+import json
+import os
+from typing import Dict, List, Optional
+
+from mp3_frames import iter_frames
+
+INDEX_SUFFIX = ".index.jsonl"
+
+
+def index_path_for(audio_path: str) -> str:
+    """all_words_merged.mp3 -> all_words_merged.index.jsonl"""
+    return os.path.splitext(audio_path)[0] + INDEX_SUFFIX
+
+
+class SegmentIndex:
+    """
+    One JSON line per repeat block: word, source file, byte offset/length and
+    start/duration in seconds. Appended alongside the audio, so it stays in
+    step with the merged file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries: List[Dict] = self.load()
+
+    def load(self) -> List[Dict]:
+        """Index entries in file order (skips a torn last line)"""
+        entries = []
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entries.append(json.loads(line))
+                    except ValueError:
+                        continue
+        except FileNotFoundError:
+            pass
+        return entries
+
+    @property
+    def end_offset(self) -> int:
+        last = self.entries[-1] if self.entries else None
+        return last["offset"] + last["length"] if last else 0
+
+    @property
+    def end_time(self) -> float:
+        last = self.entries[-1] if self.entries else None
+        return last["start"] + last["duration"] if last else 0.0
+
+    def record(self, word: Optional[str], filename: Optional[str], offset: int, length: int,
+               duration: float) -> Dict:
+        """Append the entry for a block just written at offset"""
+        entry = {
+            "word": word,
+            "file": filename,
+            "offset": offset,
+            "length": length,
+            "start": round(self.end_time, 6),
+            "duration": round(duration, 6)
+        }
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.entries.append(entry)
+        return entry
+
+    def drop_uncommitted(self, audio_path: str) -> int:
+        """Cut audio past the last entry off the file: a block whose run died
+        before indexing it. Only once the index file exists (without one, the
+        track was merged before indexing existed; see cover). Returns bytes removed."""
+        if not os.path.exists(self.path) or not os.path.exists(audio_path):
+            return 0
+        size = os.path.getsize(audio_path)
+        if size <= self.end_offset:
+            return 0
+        with open(audio_path, 'r+b') as f:
+            f.truncate(self.end_offset)
+            f.flush()
+            os.fsync(f.fileno())
+        return size - self.end_offset
+
+    def cover(self, audio_path: str) -> Optional[Dict]:
+        """Index audio at the end of the file that has no entries yet (a track
+        merged before indexing existed) as one unnamed region, by reading frame
+        headers only. If the index doesn't match the file it is started over.
+        Afterwards the index file exists, even if empty: from then on every
+        appended block is indexed."""
+        size = os.path.getsize(audio_path) if os.path.exists(audio_path) else 0
+        if self.end_offset > size:
+            print(f"⚠️ {self.path} doesn't match {audio_path}; re-indexing")
+            os.remove(self.path)
+            self.entries = []
+        if self.end_offset >= size:
+            open(self.path, 'a', encoding='utf-8').close()
+            return None
+
+        duration = 0.0
+        with open(audio_path, 'rb') as f:
+            for frame in iter_frames(f, self.end_offset, size):
+                duration += frame.header.samples / frame.header.sample_rate
+        return self.record(None, None, self.end_offset, size - self.end_offset, duration)
+
+
+class MergedAudioReader:
+    """
+    Random access to the merged track through its index. Each block was
+    encoded on its own, so its bytes are a complete MP3 that starts without
+    borrowing bits from the block before it.
+    """
+
+    def __init__(self, audio_path: str, index_path: Optional[str] = None):
+        self.audio_path = audio_path
+        entries = SegmentIndex(index_path or index_path_for(audio_path)).entries
+        # Word N counts only blocks with a known word
+        self.words = [entry for entry in entries if entry["word"] is not None]
+        self._starts = [entry["start"] for entry in self.words]
+
+    def __len__(self):
+        return len(self.words)
+
+    def entry(self, n: int) -> Dict:
+        return self.words[n]
+
+    def find(self, word: str) -> Optional[int]:
+        """Position of a word (case-insensitive), or None"""
+        word = word.lower()
+        for n, entry in enumerate(self.words):
+            if entry["word"].lower() == word:
+                return n
+        return None
+
+    def word_at(self, seconds: float) -> Optional[int]:
+        """Word playing at a time in the track, for seeking and skipping"""
+        n = bisect.bisect_right(self._starts, seconds) - 1
+        if n < 0 or seconds >= self.words[n]["start"] + self.words[n]["duration"]:
+            return None
+        return n
+
+    def read(self, n: int, count: int = 1) -> bytes:
+        """MP3 bytes of the repeat blocks of words n..n+count-1 (one seek and read)"""
+        first, last = self.words[n], self.words[n + count - 1]
+        with open(self.audio_path, 'rb') as f:
+            f.seek(first["offset"])
+            return f.read(last["offset"] + last["length"] - first["offset"])
+
+    def extract(self, n: int, destination: str, count: int = 1):
+        """Write the repeat blocks of words n..n+count-1 to their own MP3 file"""
+        with open(destination, 'wb') as f:
+            f.write(self.read(n, count))
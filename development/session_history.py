@@ -0,0 +1,149 @@
+"""
+Session History
+Keeps recent sessions in full and rolls older ones up into daily, weekly and
+lifetime aggregates, so game_stats.json stays the same size over time.
+Every session is also appended to a JSON-lines log for the complete record.
+"""
+
+import json
+from datetime import datetime
+from typing import Dict, List
+
+
+def _empty_rollup() -> Dict:
+    return {"sessions": 0, "total_words": 0, "correct_words": 0, "accuracy_sum": 0.0}
+
+
+def _add_to_rollup(rollup: Dict, other: Dict):
+    for key in ("sessions", "total_words", "correct_words", "accuracy_sum"):
+        rollup[key] = rollup.get(key, 0) + other.get(key, 0)
+
+
+def _session_rollup(session: Dict) -> Dict:
+    return {
+        "sessions": 1,
+        "total_words": session.get("total_words", 0),
+        "correct_words": session.get("correct_words", 0),
+        "accuracy_sum": session.get("accuracy", 0.0)
+    }
+
+
+def _iso_week(day: str) -> str:
+    year, week, _ = datetime.fromisoformat(day).isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+class SessionHistory:
+    """
+    Bounded session history stored inside the game stats dict
+    """
+
+    def __init__(self, log_file: str = "session_log.jsonl", writer=None,
+                 max_recent: int = 50, max_daily: int = 60, max_weekly: int = 104):
+        self.log_file = log_file
+        self.writer = writer
+        self.max_recent = max_recent
+        self.max_daily = max_daily
+        self.max_weekly = max_weekly
+
+    def ensure_fields(self, stats: Dict):
+        """Add the rollup fields to stats if they are missing"""
+        stats.setdefault("accuracy_history", [])
+        stats.setdefault("session_history", [])
+        stats.setdefault("daily_rollups", {})
+        stats.setdefault("weekly_rollups", {})
+        stats.setdefault("lifetime_rollup", _empty_rollup())
+
+    def migrate(self, stats: Dict) -> bool:
+        """Log sessions recorded before the history log existed, then compact.
+        Returns True if stats changed and should be saved."""
+        self.ensure_fields(stats)
+        changed = False
+        if not stats.get("session_log_started"):
+            for session in stats["session_history"]:
+                self._append_to_log(session)
+            stats["session_log_started"] = True
+            changed = True
+        return self.compact(stats) or changed
+
+    def record(self, stats: Dict, session: Dict):
+        """Add a finished session and roll up anything that falls out of range"""
+        self.ensure_fields(stats)
+        stats["accuracy_history"].append(session.get("accuracy", 0.0))
+        stats["session_history"].append(session)
+        self._append_to_log(session)
+        self.compact(stats)
+
+    def compact(self, stats: Dict) -> bool:
+        """Apply the size limits, moving old data into coarser rollups.
+        Returns True if anything was rolled up."""
+        self.ensure_fields(stats)
+        changed = False
+
+        # Recent sessions -> daily rollups
+        sessions = stats["session_history"]
+        overflow = len(sessions) - self.max_recent
+        if overflow > 0:
+            for session in sessions[:overflow]:
+                day = str(session.get("date", ""))[:10] or "unknown"
+                _add_to_rollup(stats["daily_rollups"].setdefault(day, _empty_rollup()),
+                               _session_rollup(session))
+            del sessions[:overflow]
+            changed = True
+        if len(stats["accuracy_history"]) > self.max_recent:
+            del stats["accuracy_history"][:-self.max_recent]
+            changed = True
+
+        # Daily rollups -> weekly rollups (ISO date keys sort chronologically)
+        daily = stats["daily_rollups"]
+        if len(daily) > self.max_daily:
+            for day in sorted(daily)[:len(daily) - self.max_daily]:
+                week = _iso_week(day) if day != "unknown" else "unknown"
+                _add_to_rollup(stats["weekly_rollups"].setdefault(week, _empty_rollup()), daily.pop(day))
+            changed = True
+
+        # Weekly rollups -> lifetime totals
+        weekly = stats["weekly_rollups"]
+        if len(weekly) > self.max_weekly:
+            for week in sorted(weekly)[:len(weekly) - self.max_weekly]:
+                _add_to_rollup(stats["lifetime_rollup"], weekly.pop(week))
+            changed = True
+
+        return changed
+
+    def totals(self, stats: Dict) -> Dict:
+        """Aggregate over every session ever played"""
+        self.ensure_fields(stats)
+        total = _empty_rollup()
+        _add_to_rollup(total, stats["lifetime_rollup"])
+        for rollup in list(stats["weekly_rollups"].values()) + list(stats["daily_rollups"].values()):
+            _add_to_rollup(total, rollup)
+        for session in stats["session_history"]:
+            _add_to_rollup(total, _session_rollup(session))
+        total["average_accuracy"] = total["accuracy_sum"] / total["sessions"] if total["sessions"] else 0.0
+        return total
+
+    def _append_to_log(self, session: Dict):
+        line = json.dumps(session, ensure_ascii=False)
+        if self.writer is not None:
+            self.writer.append_line(self.log_file, line)
+            return
+        try:
+            with open(self.log_file, 'a', encoding='utf-8') as f:
+                f.write(line + "\n")
+        except Exception as e:
+            print(f"Error appending to {self.log_file}: {e}")
+
+    def read_log(self) -> List[Dict]:
+        """Read the full session log (skips a partially written last line)"""
+        sessions = []
+        try:
+            with open(self.log_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        sessions.append(json.loads(line))
+                    except ValueError:
+                        continue
+        except FileNotFoundError:
+            pass
+        return sessions
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Test the non-blocking translation facade
+"""
+
+import queue
+import threading
+
+
+class SlowRemote:
+    """Stands in for RemoteTranslator; blocks until released"""
+    
+    def __init__(self):
+        self.release = threading.Event()
+        self.batches = []
+    
+    def translate(self, word):
+        return self.translate_many([word])[word]
+    
+    def translate_many(self, words):
+        self.batches.append(list(words))
+        self.release.wait(5)
+        return {word: f"{word} (en)" for word in words}
+    
+    def close(self):
+        pass
+
+
+class FailingRemote(SlowRemote):
+    """Stands in for a RemoteTranslator whose batch blows up"""
+    
+    def translate_many(self, words):
+        self.batches.append(list(words))
+        raise RuntimeError("remote down")
+
+
+def test_async_translator():
+    print("🧪 Testing AsyncTranslator")
+    
+    from async_translation import AsyncTranslator
+    from translation_service import TranslationService
+    
+    remote = SlowRemote()
+    service = TranslationService(cache_path=None, remote=remote)
+    ui_queue = queue.Queue()  # Stands in for root.after(0, fn)
+    translator = AsyncTranslator(service, ui_queue.put)
+    
+    # Dictionary words come back immediately, without a callback
+    assert translator.get("Anlegg") == "Facility"
+    
+    # Unknown words return None at once while the lookup runs in the background
+    results = []
+    assert translator.get("fjellet", results.append) is None
+    assert translator.get("fjellet", results.append) is None  # Joins the same lookup
+    assert translator.is_pending("fjellet")
+    print("✅ Uncached lookup did not block")
+    
+    remote.release.set()
+    for _ in range(2):
+        ui_queue.get(timeout=5)()  # Run callbacks on the "UI thread"
+    assert results == ["fjellet (en)", "fjellet (en)"]
+    assert remote.batches == [["fjellet"]]
+    assert translator.get("fjellet") == "fjellet (en)"  # Cached now
+    print("✅ Callbacks delivered through the UI scheduler")
+    translator.shutdown()
+
+
+def test_prefetch_session_words():
+    print("🧪 Testing Session Translation Prefetch")
+    
+    from async_translation import AsyncTranslator
+    from translation_service import TranslationService
+    
+    remote = SlowRemote()
+    remote.release.set()
+    service = TranslationService(cache_path=None, remote=remote)
+    translator = AsyncTranslator(service, lambda fn: fn())
+    
+    translator.prefetch(["hytta", "Anlegg", "båten", "hytta"])
+    translator._executor.shutdown(wait=True)
+    
+    assert remote.batches == [["hytta", "båten"]]  # One batch, dictionary words skipped
+    assert service.lookup_local("båten") == "båten (en)"
+    print("✅ Session words resolved in one background batch")
+
+
+def test_failed_lookup_still_calls_back():
+    print("🧪 Testing Failed Background Lookup")
+    
+    from async_translation import AsyncTranslator
+    from translation_service import TranslationService
+    
+    service = TranslationService(cache_path=None, remote=FailingRemote())
+    ui_queue = queue.Queue()
+    translator = AsyncTranslator(service, ui_queue.put)
+    
+    results = []
+    assert translator.get("fjellet", results.append) is None
+    ui_queue.get(timeout=5)()
+    
+    # The view is told the lookup is over, rather than showing the pending text forever
+    assert results == ["Translation for 'fjellet' not available"]
+    assert not translator.is_pending("fjellet")
+    print("✅ Failed lookup delivered the missing-translation text")
+    
+    # The redraw that delivery triggers gets the placeholder without a new lookup
+    assert translator.get("fjellet", results.append) == "Translation for 'fjellet' not available"
+    assert not translator.is_pending("fjellet")
+    assert service.remote.batches == [["fjellet"]]
+    print("✅ Redraw after a failure did not start another lookup")
+    translator.shutdown()
+
+
+if __name__ == "__main__":
+    test_async_translator()
+    test_prefetch_session_words()
+    test_failed_lookup_still_calls_back()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Test the decoded audio cache used by the game engine
+"""
+
+import os
+import tempfile
+import threading
+import time
+
+
+def test_audio_cache():
+    print("🧪 Testing Decoded Audio Cache")
+    
+    try:
+        from pydub import AudioSegment
+        from audio_playback import DecodedAudioCache
+    except ImportError as e:
+        print(f"⚠️ Skipping, audio dependencies not installed: {e}")
+        return
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = []
+        for i in range(3):
+            path = os.path.join(tmp_dir, f"word_{i}.wav")
+            AudioSegment.silent(duration=200).export(path, format="wav")
+            paths.append(path)
+        
+        one_clip = len(AudioSegment.from_file(paths[0]).raw_data)
+        cache = DecodedAudioCache(max_bytes=one_clip * 2)
+        
+        # Repeats of the same word are served from the cache
+        first = cache.get(paths[0])
+        second = cache.get(paths[0])
+        assert first is second
+        assert cache.hits == 1 and cache.misses == 1
+        print("✅ Repeat playback served from cache")
+        
+        # The cache stays within its byte budget (LRU eviction)
+        cache.get(paths[1])
+        cache.get(paths[2])
+        assert cache.current_bytes <= one_clip * 2
+        assert not cache.contains(paths[0])
+        assert cache.contains(paths[2])
+        print("✅ Least recently used audio evicted")
+        
+        # A regenerated file (new mtime) is decoded again
+        stat = os.stat(paths[2])
+        os.utime(paths[2], (stat.st_atime, stat.st_mtime + 10))
+        assert not cache.contains(paths[2])
+        cache.get(paths[2])
+        assert cache.get_stats()["entries"] <= 2
+        print("✅ Changed file invalidated by mtime")
+
+
+def test_audio_prefetcher():
+    print("🧪 Testing Audio Prefetcher")
+    
+    try:
+        from pydub import AudioSegment
+        from audio_playback import AudioPrefetcher, DecodedAudioCache
+    except ImportError as e:
+        print(f"⚠️ Skipping, audio dependencies not installed: {e}")
+        return
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = []
+        for i in range(4):
+            path = os.path.join(tmp_dir, f"word_{i}.wav")
+            AudioSegment.silent(duration=100).export(path, format="wav")
+            paths.append(path)
+        
+        prefetcher = AudioPrefetcher(DecodedAudioCache(), depth=2)
+        try:
+            # Only the next `depth` words are staged
+            prefetcher.prefetch(paths)
+            assert prefetcher.get(paths[0]) is not None
+            assert prefetcher.get(paths[1]) is not None
+            assert prefetcher.get(paths[2]) is not None
+            
+            stats = prefetcher.get_stats()
+            assert stats["depth"] == 2
+            assert stats["hits"] + stats["misses"] == 3
+            assert stats["misses"] >= 1  # paths[2] was beyond the prefetch depth
+            assert not prefetcher.cache.contains(paths[3])
+            print(f"✅ Prefetch stats: {stats}")
+        finally:
+            prefetcher.shutdown()
+
+
+def test_pygame_backend_stop():
+    print("🧪 Testing pygame Mixer Backend")
+    
+    # Use SDL's dummy driver so the test runs without a sound card
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    try:
+        from pydub.generators import Sine
+        from audio_playback import PygameMixerBackend
+    except ImportError as e:
+        print(f"⚠️ Skipping, audio dependencies not installed: {e}")
+        return
+    
+    backend = PygameMixerBackend()
+    try:
+        word_audio = Sine(440).to_audio_segment(duration=2000)
+        
+        # Stopping a word interrupts it immediately instead of waiting for the end
+        worker = threading.Thread(target=backend.play, args=(word_audio,))
+        started = time.time()
+        worker.start()
+        time.sleep(0.1)
+        backend.stop()
+        worker.join(timeout=1)
+        assert not worker.is_alive()
+        assert time.time() - started < 1
+        print("✅ Word playback stopped instantly")
+        
+        # Effects do not block and can overlap
+        backend.play_effect(word_audio)
+        backend.play_effect(word_audio)
+        print("✅ Overlapping effects started")
+    finally:
+        backend.close()
+
+
+def test_sound_bank():
+    print("🧪 Testing Sound Bank")
+    
+    try:
+        from pydub import AudioSegment
+        from audio_playback import PlaybackBackend, SoundBank
+    except ImportError as e:
+        print(f"⚠️ Skipping, audio dependencies not installed: {e}")
+        return
+    
+    class RecordingBackend(PlaybackBackend):
+        def __init__(self):
+            self.effects = []
+        
+        def play_effect(self, segment):
+            self.effects.append(segment)
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        AudioSegment.silent(duration=100).export(os.path.join(tmp_dir, "correct.wav"), format="wav")
+        
+        backend = RecordingBackend()
+        bank = SoundBank(backend)
+        loaded = bank.load_directory(tmp_dir, {'correct': "correct.wav", 'incorrect': "incorrect.wav"})
+        assert loaded == 1
+        
+        # The file can disappear: cues play from memory
+        os.remove(os.path.join(tmp_dir, "correct.wav"))
+        assert bank.play('correct')
+        assert bank.play('correct')
+        assert backend.effects[0] is backend.effects[1]
+        print("✅ Cue played twice from one decode")
+        
+        assert not bank.play('incorrect')
+        assert bank.play('hint', fallback='correct')
+        print("✅ Missing cues handled with fallback")
+
+
+if __name__ == "__main__":
+    test_audio_cache()
+    test_audio_prefetcher()
+    test_pygame_backend_stop()
+    test_sound_bank()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Test the content-addressed audio store
+"""
+
+import os
+import tempfile
+
+
+def test_audio_store_reuse():
+    print("🧪 Testing Audio Store")
+    
+    from audio_store import AudioStore, audio_key
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = AudioStore(os.path.join(tmp_dir, "store"))
+        calls = []
+        
+        def synthesize(path):
+            calls.append(path)
+            with open(path, 'wb') as f:
+                f.write(b"ID3 fake mp3 data")
+        
+        chapter_one = os.path.join(tmp_dir, "chapters", "capital_one", "audio", "hus.mp3")
+        chapter_two = os.path.join(tmp_dir, "chapters", "capital_two", "audio", "hus.mp3")
+        assert store.materialize("hus", chapter_one, synthesize) is True
+        assert store.materialize("hus", chapter_two, synthesize) is False
+        assert len(calls) == 1
+        print("✅ Phrase synthesized once for two chapters")
+        
+        assert os.path.samefile(chapter_one, chapter_two)
+        assert store.get_stats()["linked"] == 2
+        print("✅ Chapters hardlinked to one stored file")
+        
+        # Different voice or speed is a different entry
+        assert audio_key("hus") != audio_key("hus", speed=0.8)
+        assert audio_key("hus") != audio_key("hus", voice="espeak")
+        assert store.get("hus", speed=0.8) is None
+        print("✅ Key covers text, language, voice and speed")
+
+
+def test_audio_store_adopt_and_copy_fallback():
+    print("🧪 Testing Audio Store Adoption and Copy Fallback")
+    
+    import audio_store
+    from audio_store import AudioStore
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        existing = os.path.join(tmp_dir, "audio", "bil.mp3")
+        os.makedirs(os.path.dirname(existing))
+        with open(existing, 'wb') as f:
+            f.write(b"existing audio")
+        
+        store = AudioStore(os.path.join(tmp_dir, "store"))
+        store.add_file(existing, "bil")
+        
+        def fail(path):
+            raise AssertionError("existing audio should be reused")
+        
+        # Hardlinks unavailable (e.g. another filesystem): fall back to copying
+        original_link = audio_store.os.link
+        def no_link(source, destination):
+            raise OSError("cross-device link")
+        audio_store.os.link = no_link
+        try:
+            destination = os.path.join(tmp_dir, "chapter", "bil.mp3")
+            assert store.materialize("bil", destination, fail) is False
+        finally:
+            audio_store.os.link = original_link
+        
+        with open(destination, 'rb') as f:
+            assert f.read() == b"existing audio"
+        assert store.get_stats()["copied"] == 1
+        print("✅ Existing audio adopted and copied where links fail")
+
+
+def test_audio_store_adopt_new_recording():
+    print("🧪 Testing Audio Store Adoption of a New Recording")
+    
+    from audio_store import AudioStore, link_or_copy
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = AudioStore(os.path.join(tmp_dir, "store"))
+        chapter_file = os.path.join(tmp_dir, "chapter", "hus.mp3")
+        other_chapter_file = os.path.join(tmp_dir, "other", "hus.mp3")
+        
+        old = os.path.join(tmp_dir, "old", "hus.mp3")
+        os.makedirs(os.path.dirname(old))
+        with open(old, 'wb') as f:
+            f.write(b"OLD RECORDING")
+        link_or_copy(store.add_file(old, "hus"), other_chapter_file)
+        
+        new = os.path.join(tmp_dir, "new", "hus.mp3")
+        os.makedirs(os.path.dirname(new))
+        with open(new, 'wb') as f:
+            f.write(b"NEW RECORDING")
+        assert link_or_copy(store.add_file(new, "hus"), chapter_file) != "existing"
+        
+        with open(chapter_file, 'rb') as f:
+            assert f.read() == b"NEW RECORDING"
+        with open(store.get("hus"), 'rb') as f:
+            assert f.read() == b"NEW RECORDING"
+        with open(other_chapter_file, 'rb') as f:
+            assert f.read() == b"OLD RECORDING"  # Earlier links keep their audio
+        print("✅ The file passed in is the one linked into the chapter")
+
+
+if __name__ == "__main__":
+    test_audio_store_reuse()
+    test_audio_store_adopt_and_copy_fallback()
+    test_audio_store_adopt_new_recording()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Test the cached chapter catalog in ChapterBasedWordManager
+"""
+
+import json
+import os
+import tempfile
+import time
+
+
+def test_chapter_catalog_cache():
+    print("🧪 Testing Chapter Catalog Cache")
+    
+    from chapter_based_system import ChapterBasedWordManager
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cm = ChapterBasedWordManager(os.path.join(tmp_dir, "chapters"))
+        
+        first = cm.get_chapter_catalog()
+        assert first[0]["folder"] == "capital_one"  # Sorted by required score
+        assert {c["folder"] for c in first} == {"capital_one", "capital_two", "capital_three"}
+        
+        # Unchanged directory: the same prebuilt records are returned
+        assert cm.get_chapter_catalog() is first
+        assert len(cm.get_available_chapters()) == 3
+        print("✅ Catalog reused while nothing changes")
+        
+        # Editing a chapter's metadata invalidates the catalog
+        metadata_file = os.path.join(tmp_dir, "chapters", "capital_two", "chapter_metadata.json")
+        with open(metadata_file, 'r', encoding='utf-8') as f:
+            metadata = json.load(f)
+        metadata["words_count"] = 42
+        time.sleep(0.01)
+        with open(metadata_file, 'w', encoding='utf-8') as f:
+            json.dump(metadata, f)
+        
+        chapters = {c["folder"]: c for c in cm.get_available_chapters()}
+        assert chapters["capital_two"]["words_count"] == 42
+        print("✅ Metadata change picked up via mtime")
+        
+        # A new chapter folder invalidates the catalog too
+        new_chapter = os.path.join(tmp_dir, "chapters", "capital_four")
+        os.makedirs(new_chapter)
+        with open(os.path.join(new_chapter, "chapter_metadata.json"), 'w', encoding='utf-8') as f:
+            json.dump({"name": "Kapital Fire", "folder": "capital_four", "required_score": 70}, f)
+        assert "capital_four" in [c["folder"] for c in cm.get_available_chapters()]
+        print("✅ New chapter folder picked up")
+
+
+def test_startup_without_writes():
+    print("🧪 Testing Side-Effect-Free Startup")
+    
+    import chapter_based_system
+    from chapter_based_system import ChapterBasedWordManager
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        chapters_dir = os.path.join(tmp_dir, "chapters")
+        cm = ChapterBasedWordManager(chapters_dir)
+        assert cm.is_chapter_structure_complete()
+        print("✅ Missing chapters created on first start")
+        
+        # Complete structure: startup must not create or write anything
+        original_makedirs = chapter_based_system.os.makedirs
+        def fail_makedirs(*args, **kwargs):
+            raise AssertionError("makedirs called on a complete chapter structure")
+        chapter_based_system.os.makedirs = fail_makedirs
+        try:
+            metadata_file = os.path.join(chapters_dir, "capital_one", "chapter_metadata.json")
+            before = os.stat(metadata_file).st_mtime_ns
+            ChapterBasedWordManager(chapters_dir)
+            assert os.stat(metadata_file).st_mtime_ns == before
+        finally:
+            chapter_based_system.os.makedirs = original_makedirs
+        print("✅ Existing chapters opened without touching disk")
+        
+        # Unwritable location: startup warns instead of crashing
+        blocker = os.path.join(tmp_dir, "not_a_directory")
+        with open(blocker, 'w') as f:
+            f.write("")
+        cm = ChapterBasedWordManager(os.path.join(blocker, "chapters"))
+        assert cm.get_available_chapters() == []
+        print("✅ Read-only location handled")
+
+
+if __name__ == "__main__":
+    test_chapter_catalog_cache()
+    test_startup_without_writes()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Test the parallel audio/translation pipeline in ChapterAudioGenerator
+"""
+
+import json
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+
+def make_generator(tmp_dir, **kwargs):
+    """Generator pointed at a temp directory, with fake TTS and translation"""
+    from generate_chapter_audio import ChapterAudioGenerator
+    from chapter_index import ChapterIndex
+    
+    generator = ChapterAudioGenerator(**kwargs)
+    generator.base_path = Path(tmp_dir)
+    generator.development_path = Path(tmp_dir)
+    generator.chapters_path = Path(tmp_dir) / "chapters"
+    generator.chapter_index = ChapterIndex(generator.chapters_path)
+    generator.auto_update = True
+    
+    active = {"now": 0, "peak": 0}
+    lock = threading.Lock()
+    
+    def fake_tts(word, output_path):
+        with lock:
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+        time.sleep(0.1)  # Simulated synthesis round-trip
+        (output_path / f"{word}.mp3").write_bytes(b"fake")
+        with lock:
+            active["now"] -= 1
+        return None if word == "feiler" else f"{word}.mp3"
+    
+    def fake_translate(word):
+        time.sleep(0.1)
+        return f"{word} (en)"
+    
+    generator.generate_audio_file = fake_tts
+    generator.translator.translate = fake_translate
+    return generator, active
+
+
+def test_parallel_chapter_build():
+    print("🧪 Testing Parallel Chapter Build")
+    
+    try:
+        import generate_chapter_audio  # noqa: F401 (needs gTTS installed)
+    except ImportError as e:
+        print(f"⚠️ Skipping: {e}")
+        return
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        words = ["hus", "bil", "Hus", "båt", "feiler", "fjell", "skog", "elv", "sjø", "by"]
+        chapter_file = Path(tmp_dir) / "merged_chapter_1.txt"
+        chapter_file.write_text("\n".join(words) + "\n# comment\n", encoding="utf-8")
+        
+        generator, active = make_generator(tmp_dir, tts_workers=4, tts_requests_per_second=0)
+        assert generator.process_chapter_file(chapter_file)
+        
+        metadata_file = Path(tmp_dir) / "chapters" / "capital_one" / "data" / "words_metadata.json"
+        with open(metadata_file, 'r', encoding='utf-8') as f:
+            saved = json.load(f)["words"]
+        
+        # File order kept, case-insensitive duplicate and failed audio left out
+        assert list(saved) == ["hus", "bil", "båt", "fjell", "skog", "elv", "sjø", "by"]
+        assert saved["båt"]["translation"] == "båt (en)"
+        print("✅ Results collected in file order")
+        
+        # Nine synthesis jobs on 4 workers, not one after another
+        assert active["peak"] == 4
+        print(f"✅ Chapter built with {active['peak']} parallel jobs")
+
+
+def test_resume_interrupted_build():
+    print("🧪 Testing Resumable Chapter Build")
+    
+    try:
+        import generate_chapter_audio  # noqa: F401 (needs gTTS installed)
+    except ImportError as e:
+        print(f"⚠️ Skipping: {e}")
+        return
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        chapter_file = Path(tmp_dir) / "merged_chapter_2.txt"
+        chapter_file.write_text("hus\nbil\nbåt\nfjell\n", encoding="utf-8")
+        
+        # First run dies on the third word
+        generator, _ = make_generator(tmp_dir, tts_workers=1, tts_requests_per_second=0)
+        fake_tts = generator.generate_audio_file
+        def crashing_tts(word, output_path):
+            if word == "båt":
+                raise ConnectionError("network down")
+            return fake_tts(word, output_path)
+        generator.generate_audio_file = crashing_tts
+        try:
+            generator.process_chapter_file(chapter_file)
+            assert False, "build should have failed"
+        except ConnectionError:
+            pass
+        
+        journal = generator.get_build_journal(Path(tmp_dir) / "chapters" / "capital_two")
+        assert list(journal.load()) == ["hus", "bil"]
+        print("✅ Finished words checkpointed before the failure")
+        
+        # Dry run shows the remaining work without writing anything
+        plan = generator.plan_chapter_file(chapter_file)
+        assert plan["resumable"] == 2 and plan["to_build"] == 2
+        print("✅ Dry-run plan reports remaining work")
+        
+        # Restart resumes without prompting and only builds the rest
+        built = []
+        generator, _ = make_generator(tmp_dir, tts_workers=1, tts_requests_per_second=0)
+        generator.auto_update = False
+        fake_tts = generator.generate_audio_file
+        def recording_tts(word, output_path):
+            built.append(word)
+            return fake_tts(word, output_path)
+        generator.generate_audio_file = recording_tts
+        assert generator.process_chapter_file(chapter_file)
+        assert built == ["båt", "fjell"]
+        
+        metadata_file = Path(tmp_dir) / "chapters" / "capital_two" / "data" / "words_metadata.json"
+        with open(metadata_file, 'r', encoding='utf-8') as f:
+            assert list(json.load(f)["words"]) == ["hus", "bil", "båt", "fjell"]
+        assert not journal.exists()
+        print("✅ Restart resumed at the failed word and cleared the journal")
+
+
+def test_resume_after_translation_crash():
+    print("🧪 Testing Resume After a Crash During Translation")
+    
+    try:
+        import generate_chapter_audio  # noqa: F401 (needs gTTS installed)
+    except ImportError as e:
+        print(f"⚠️ Skipping: {e}")
+        return
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        chapter_file = Path(tmp_dir) / "merged_chapter_3.txt"
+        chapter_file.write_text("hus\nbil\nbåt\nfjell\n", encoding="utf-8")
+        
+        # Audio for hus and bil is done long before the build dies translating båt
+        generator, _ = make_generator(tmp_dir, tts_workers=1, tts_requests_per_second=0)
+        translate = generator.get_english_translation
+        def crashing_translation(word):
+            if word == "båt":
+                time.sleep(0.35)
+                raise MemoryError("translation worker died")
+            return translate(word)
+        generator.get_english_translation = crashing_translation
+        try:
+            generator.process_chapter_file(chapter_file)
+            assert False, "build should have failed"
+        except MemoryError:
+            pass
+        
+        journal = generator.get_build_journal(Path(tmp_dir) / "chapters" / "capital_three")
+        assert sorted(journal.load()) == ["bil", "hus"]
+        print("✅ Words with audio and translation checkpointed before the crash")
+        
+        # Restart neither synthesizes nor translates the checkpointed words again
+        built, translated = [], []
+        generator, _ = make_generator(tmp_dir, tts_workers=1, tts_requests_per_second=0)
+        fake_tts = generator.generate_audio_file
+        def recording_tts(word, output_path):
+            built.append(word)
+            return fake_tts(word, output_path)
+        translate = generator.get_english_translation
+        def recording_translation(word):
+            translated.append(word)
+            return translate(word)
+        generator.generate_audio_file = recording_tts
+        generator.get_english_translation = recording_translation
+        assert generator.process_chapter_file(chapter_file)
+        assert built == ["båt", "fjell"]
+        assert sorted(translated) == ["båt", "fjell"]
+        
+        metadata_file = Path(tmp_dir) / "chapters" / "capital_three" / "data" / "words_metadata.json"
+        with open(metadata_file, 'r', encoding='utf-8') as f:
+            saved = json.load(f)["words"]
+        assert list(saved) == ["hus", "bil", "båt", "fjell"]
+        assert saved["hus"]["translation"] == "hus (en)"
+        print("✅ Restart only translated the unfinished words")
+
+
+if __name__ == "__main__":
+    test_parallel_chapter_build()
+    test_resume_interrupted_build()
+    test_resume_after_translation_crash()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Test the chapter index manifest
+"""
+
+import json
+import os
+import tempfile
+
+
+def write_chapter(chapters_dir, folder, name, words):
+    os.makedirs(os.path.join(chapters_dir, folder, "data"), exist_ok=True)
+    with open(os.path.join(chapters_dir, folder, "chapter_metadata.json"), 'w', encoding='utf-8') as f:
+        json.dump({"name": name, "folder": folder, "required_score": 0}, f)
+    with open(os.path.join(chapters_dir, folder, "data", "words_metadata.json"), 'w', encoding='utf-8') as f:
+        json.dump({"words": {word: {"audio_file": f"{word}.mp3"} for word in words}}, f)
+
+
+def test_chapter_index():
+    print("🧪 Testing Chapter Index")
+    
+    from chapter_index import ChapterIndex, INDEX_FILE_NAME
+    
+    with tempfile.TemporaryDirectory() as chapters_dir:
+        write_chapter(chapters_dir, "capital_one", "Kapital En", ["Måter", "dermed"])
+        write_chapter(chapters_dir, "capital_two", "Kapital To", ["kjølling"])
+        
+        index = ChapterIndex(chapters_dir)
+        chapters = index.get_chapters()
+        assert chapters["capital_one"]["words_count"] == 2
+        assert chapters["capital_two"]["name"] == "Kapital To"
+        assert chapters["capital_one"]["words_hash"]
+        assert index.get_word_chapter("kjølling") == "capital_two"
+        assert "måter" in index.get_existing_words()
+        assert os.path.exists(os.path.join(chapters_dir, INDEX_FILE_NAME))
+        print("✅ Index built with counts, hashes and word map")
+        
+        # A fresh reader uses the manifest without re-parsing chapters
+        reader = ChapterIndex(chapters_dir)
+        reader._index_chapter = None  # Would fail if a chapter were re-read
+        assert reader.get_word_chapter("dermed") == "capital_one"
+        print("✅ Unchanged chapters served from the manifest")
+        
+        # Updating a chapter re-indexes just that chapter
+        write_chapter(chapters_dir, "capital_two", "Kapital To", ["kjølling", "løst"])
+        index.update_chapter("capital_two")
+        assert ChapterIndex(chapters_dir).get_chapters()["capital_two"]["words_count"] == 2
+        print("✅ Chapter update reflected in the index")
+
+
+def test_chapter_statistics_from_index():
+    print("🧪 Testing Chapter Statistics")
+    
+    from chapter_based_system import ChapterBasedWordManager
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        chapters_dir = os.path.join(tmp_dir, "chapters")
+        write_chapter(chapters_dir, "capital_one", "Kapital En", ["Måter", "dermed"])
+        
+        stats = ChapterBasedWordManager(chapters_dir).get_chapter_statistics()
+        assert stats["chapters"]["capital_one"]["words_count"] == 2
+        assert stats["total_words"] == 2
+        print("✅ Statistics read from the index")
+
+
+if __name__ == "__main__":
+    test_chapter_index()
+    test_chapter_statistics_from_index()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test the compiled translation dictionary and its builder
+"""
+
+import json
+import os
+import tempfile
+
+
+def test_build_and_lookup():
+    print("🧪 Testing Compiled Dictionary")
+    
+    from compiled_dictionary import CompiledDictionary, build_dictionary, read_sources
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_path = os.path.join(tmp_dir, "Data.csv")
+        with open(csv_path, 'w', encoding='utf-8') as f:
+            f.write(",,Norsk,English\n,,oppusset bærbar PC,Refurbished laptop\n,,Mobiltilbehør,Phone accessories\n")
+        json_path = os.path.join(tmp_dir, "extra.json")
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump({"Mobiltilbehør": "mobile accessories", "fjell": "mountain"}, f)
+        
+        dict_path = os.path.join(tmp_dir, "translations.dict")
+        assert build_dictionary(read_sources([csv_path, json_path]), dict_path) == 3
+        
+        dictionary = CompiledDictionary(dict_path)
+        assert dictionary._mm is None  # Nothing mapped until the first lookup
+        assert dictionary.get("Oppusset bærbar PC") == "Refurbished laptop"
+        assert dictionary.get("mobiltilbehør") == "mobile accessories"  # Later source wins
+        assert "FJELL" in dictionary
+        assert dictionary.get("fjel") is None and dictionary.get("zzz") is None
+        assert len(dictionary) == 3
+        print("✅ Case-insensitive lookups from CSV and JSON sources")
+        
+        checksum = dictionary.checksum
+        dictionary.close()
+        build_dictionary({"fjell": "mountain"}, dict_path)
+        assert CompiledDictionary(dict_path).checksum != checksum
+        print("✅ Checksum changes with the contents")
+
+
+def test_large_dictionary():
+    print("🧪 Testing Large Compiled Dictionary")
+    
+    from compiled_dictionary import CompiledDictionary, build_dictionary
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        dict_path = os.path.join(tmp_dir, "translations.dict")
+        build_dictionary({f"ord{i}": f"word {i}" for i in range(200000)}, dict_path)
+        
+        dictionary = CompiledDictionary(dict_path)
+        for i in (0, 1, 99999, 199999):
+            assert dictionary.get(f"ord{i}") == f"word {i}"
+        assert dictionary.get("ord200000") is None
+        dictionary.close()
+        print("✅ 200k entries looked up by binary search")
+
+
+def test_service_uses_compiled_dictionary():
+    print("🧪 Testing TranslationService With Compiled Dictionary")
+    
+    from compiled_dictionary import build_dictionary
+    from translation_service import TranslationService
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        dict_path = os.path.join(tmp_dir, "translations.dict")
+        build_dictionary({"datatilbehør": "computer accessories"}, dict_path)
+        
+        service = TranslationService(cache_path=None, dictionary_path=dict_path)
+        service._try_google_translate = lambda word: None
+        assert service.compiled_dictionary._mm is None
+        assert service.get_translation("Datatilbehør") == "computer accessories"
+        assert service.get_translation("Anlegg") == "Facility"  # Built-in dictionary still used
+        service.close()
+        print("✅ Service resolves words from the compiled dictionary")
+
+
+if __name__ == "__main__":
+    test_build_and_lookup()
+    test_large_dictionary()
+    test_service_uses_compiled_dictionary()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Test the mobile audio optimization stage (mobile/optimize_audio.py)
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'mobile'))
+
+
+def test_trim_silence():
+    print("🧪 Testing Silence Trimming")
+    
+    try:
+        from pydub import AudioSegment
+        from pydub.generators import Sine
+    except ImportError as e:
+        print(f"⚠️ Skipping: {e}")
+        return
+    from optimize_audio import trim_silence
+    
+    tone = Sine(440).to_audio_segment(duration=500, volume=-10)
+    padded = AudioSegment.silent(duration=700) + tone + AudioSegment.silent(duration=900)
+    trimmed = trim_silence(padded, keep_ms=40)
+    assert 500 <= len(trimmed) <= 600, len(trimmed)
+    
+    # Pure silence is left alone rather than trimmed to nothing
+    silence = AudioSegment.silent(duration=300)
+    assert len(trim_silence(silence)) == 300
+    
+    print("✅ Leading and trailing silence is removed")
+
+
+def test_optimized_clips_are_reused():
+    print("🧪 Testing Optimization Manifest Reuse")
+    
+    from optimize_audio import MANIFEST_FILE, SETTINGS_KEY, file_hash, optimize_audio
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        source = os.path.join(tmp_dir, "hus.mp3")
+        with open(source, 'wb') as f:
+            f.write(b"fake mp3")
+        output_dir = os.path.join(tmp_dir, "audio_opt")
+        os.makedirs(output_dir)
+        outputs = {"opus": "aaaa.ogg", "aac": "bbbb.m4a", "mp3": "cccc.mp3"}
+        for filename in outputs.values():
+            with open(os.path.join(output_dir, filename), 'wb') as f:
+                f.write(b"encoded")
+        with open(os.path.join(output_dir, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+            json.dump({"settings": SETTINGS_KEY, "clips": {file_hash(source): outputs}}, f)
+        
+        # Already optimized: no worker processes, no decoding
+        assert optimize_audio([source, source], output_dir) == {source: outputs}
+    
+    print("✅ Unchanged clips aren't transcoded again")
+
+
+def test_full_optimization():
+    print("🧪 Testing Audio Transcoding")
+    
+    if not shutil.which("ffmpeg"):
+        print("⚠️ Skipping: ffmpeg not installed")
+        return
+    from pydub import AudioSegment
+    from pydub.generators import Sine
+    from optimize_audio import optimize_audio
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        source = os.path.join(tmp_dir, "hus.wav")
+        (AudioSegment.silent(duration=500) + Sine(440).to_audio_segment(duration=500)).export(source, format="wav")
+        output_dir = os.path.join(tmp_dir, "audio_opt")
+        results = optimize_audio([source], output_dir, workers=2)
+        assert set(results[source]) == {"opus", "aac", "mp3"}
+        for filename in results[source].values():
+            assert os.path.getsize(os.path.join(output_dir, filename)) < os.path.getsize(source)
+    
+    print("✅ Clips are transcoded to every format")
+
+
+def test_audio_sprite():
+    print("🧪 Testing Chapter Audio Sprite")
+    
+    from audio_sprite import build_sprite
+    
+    mono_24k = b"\xFF\xF3\x84\xC0" + b"\x00" * 188  # 192 bytes, 24 ms
+    stereo_24k = b"\xFF\xF3\x84\x00" + b"\x00" * 188
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        clips = {}
+        for word, data in [("hus", mono_24k * 10), ("bil", b"ID3\x04\x00\x00\x00\x00\x00\x00" + mono_24k * 5),
+                           ("båt", stereo_24k * 5), ("fjell", b"not audio")]:
+            clips[word] = os.path.join(tmp_dir, f"{word}.mp3")
+            with open(clips[word], 'wb') as f:
+                f.write(data)
+        
+        sprite_dir = os.path.join(tmp_dir, "sprites")
+        os.makedirs(sprite_dir)
+        with open(os.path.join(sprite_dir, "capital_one.old.mp3"), 'wb') as f:
+            f.write(b"stale")
+        
+        filename, offsets = build_sprite(clips, sprite_dir, "capital_one")
+        assert offsets == {"hus": [0.0, 0.24], "bil": [0.24, 0.12]}
+        assert os.listdir(sprite_dir) == [filename]
+        with open(os.path.join(sprite_dir, filename), 'rb') as f:
+            assert f.read() == mono_24k * 15
+        
+        # Same clips, same content-hashed name
+        assert build_sprite(clips, sprite_dir, "capital_one")[0] == filename
+    
+    print("✅ Clips are packed with their offsets")
+
+
+if __name__ == "__main__":
+    test_trim_silence()
+    test_optimized_clips_are_reused()
+    test_full_optimization()
+    test_audio_sprite()
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Test the incremental mobile export (mobile/export_words.py)
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'mobile'))
+
+
+class FakeMissCache:
+    """Stands in for TranslationCache: every miss is cached for an hour"""
+    
+    ttls = {"miss": 3600}
+    
+    def get(self, word):
+        return (None, "miss") if word.startswith("x") else None
+
+
+class FakeTranslator:
+    """Counts lookups; words starting with "x" have no translation"""
+    
+    def __init__(self, persistent_cache=None):
+        self.lookups = 0
+        self.persistent_cache = persistent_cache
+    
+    def get_translations(self, words):
+        self.lookups += len(words)
+        return {word: f"Translation for '{word}' not available" if word.startswith("x") else f"{word} (en)"
+                for word in words}
+    
+    def is_missing_translation(self, word, translation):
+        return translation == f"Translation for '{word}' not available"
+
+
+def make_chapter(chapters_dir, name, words):
+    chapter_path = os.path.join(chapters_dir, name)
+    os.makedirs(os.path.join(chapter_path, "data"), exist_ok=True)
+    os.makedirs(os.path.join(chapter_path, "audio"), exist_ok=True)
+    metadata = {}
+    for word, translation in words.items():
+        metadata[word] = {"audio_file": f"{word}.mp3", "difficulty": "easy"}
+        if translation:
+            metadata[word]["translation"] = translation
+        with open(os.path.join(chapter_path, "audio", f"{word}.mp3"), 'wb') as f:
+            f.write(b"fake")
+    with open(os.path.join(chapter_path, "data", "words_metadata.json"), 'w', encoding='utf-8') as f:
+        json.dump({"words": metadata, "last_updated": "2025-01-01T00:00:00"}, f, ensure_ascii=False)
+    return chapter_path
+
+
+def test_incremental_export():
+    print("🧪 Testing Incremental Mobile Export")
+    
+    from export_words import export_to_mobile_format
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        chapters_dir = os.path.join(tmp_dir, "chapters")
+        mobile_dir = os.path.join(tmp_dir, "mobile")
+        os.makedirs(mobile_dir)
+        one = make_chapter(chapters_dir, "capital_one", {"hus": "house", "bil": None, "xyz": None})
+        make_chapter(chapters_dir, "capital_two", {"båt": "boat"})
+        translator = FakeTranslator(FakeMissCache())
+        
+        exported = export_to_mobile_format(chapters_dir, mobile_dir, translator=translator)
+        assert exported == ["capital_one", "capital_two"]
+        assert translator.lookups == 2
+        
+        with open(os.path.join(mobile_dir, "words_capital_one.json"), encoding='utf-8') as f:
+            translations = {entry["word"]: entry["translation"] for entry in json.load(f)["easy"]}
+        assert translations["bil"] == "bil (en)"
+        assert translations["xyz"] == "Translation for 'xyz' not available"
+        
+        # Resolved translations are stored back; placeholders are not
+        with open(os.path.join(one, "data", "words_metadata.json"), encoding='utf-8') as f:
+            stored_metadata = json.load(f)
+        stored = stored_metadata["words"]
+        assert stored_metadata["last_updated"] == "2025-01-01T00:00:00"  # Other keys kept
+        assert stored["bil"]["translation"] == "bil (en)"
+        assert "translation" not in stored["xyz"]
+        
+        # Nothing changed: both chapters are skipped without reading them
+        start = time.perf_counter()
+        assert export_to_mobile_format(chapters_dir, mobile_dir, translator=translator) == []
+        print(f"   ⏱️ Unchanged re-export: {(time.perf_counter() - start) * 1000:.1f} ms")
+        
+        # A new audio file marks only its chapter as changed
+        with open(os.path.join(one, "audio", "ny.mp3"), 'wb') as f:
+            f.write(b"fake")
+        assert export_to_mobile_format(chapters_dir, mobile_dir, translator=translator) == ["capital_one"]
+        assert export_to_mobile_format(chapters_dir, mobile_dir, translator=translator, force=True) == \
+            ["capital_one", "capital_two"]
+    
+    print("✅ Only changed chapters are exported")
+
+
+def test_unresolved_words_retried():
+    print("🧪 Testing Export Retry of Untranslated Words")
+    
+    from export_words import MANIFEST_FILE, export_to_mobile_format
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        chapters_dir = os.path.join(tmp_dir, "chapters")
+        mobile_dir = os.path.join(tmp_dir, "mobile")
+        os.makedirs(mobile_dir)
+        make_chapter(chapters_dir, "capital_one", {"hus": "house", "xyz": None})
+        translator = FakeTranslator(FakeMissCache())
+        
+        assert export_to_mobile_format(chapters_dir, mobile_dir, translator=translator) == ["capital_one"]
+        manifest_path = os.path.join(mobile_dir, MANIFEST_FILE)
+        with open(manifest_path, encoding='utf-8') as f:
+            manifest = json.load(f)
+        entry = manifest["chapters"]["capital_one"]
+        assert entry["unresolved"] == ["xyz"]
+        assert entry["retry_after"] > time.time() + 3000
+        
+        # Cached miss still valid: skipped
+        assert export_to_mobile_format(chapters_dir, mobile_dir, translator=translator) == []
+        
+        # Miss expired: the chapter is exported (and the word looked up) again
+        entry["retry_after"] = time.time() - 1
+        with open(manifest_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f)
+        assert export_to_mobile_format(chapters_dir, mobile_dir, translator=translator) == ["capital_one"]
+        assert translator.lookups == 2
+        print("✅ Untranslated words retried once their miss expires")
+        
+        # Misses that weren't cached (API unreachable) are retried on the next export
+        offline = FakeTranslator()
+        assert export_to_mobile_format(chapters_dir, mobile_dir, translator=offline, force=True) == \
+            ["capital_one"]
+        assert export_to_mobile_format(chapters_dir, mobile_dir, translator=offline) == ["capital_one"]
+        print("✅ Uncached misses retried on the next export")
+
+
+def test_export_with_optimized_audio():
+    print("🧪 Testing Export With Optimized Audio")
+    
+    from export_words import export_to_mobile_format
+    from optimize_audio import MANIFEST_FILE, SETTINGS_KEY, file_hash
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        chapters_dir = os.path.join(tmp_dir, "chapters")
+        mobile_dir = os.path.join(tmp_dir, "mobile")
+        output_dir = os.path.join(mobile_dir, "audio_opt")
+        os.makedirs(output_dir)
+        one = make_chapter(chapters_dir, "capital_one", {"hus": "house"})
+        
+        # Pretend the clip was optimized by an earlier run
+        outputs = {"opus": "1234.ogg", "mp3": "5678.mp3"}
+        for filename in outputs.values():
+            with open(os.path.join(output_dir, filename), 'wb') as f:
+                f.write(b"encoded")
+        with open(os.path.join(output_dir, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+            json.dump({"settings": SETTINGS_KEY,
+                       "clips": {file_hash(os.path.join(one, "audio", "hus.mp3")): outputs}}, f)
+        
+        assert export_to_mobile_format(chapters_dir, mobile_dir, translator=FakeTranslator()) == ["capital_one"]
+        assert export_to_mobile_format(chapters_dir, mobile_dir, translator=FakeTranslator(),
+                                       optimize=True) == ["capital_one"]
+        with open(os.path.join(mobile_dir, "words_capital_one.json"), encoding='utf-8') as f:
+            entry = json.load(f)["easy"][0]
+        assert entry["audio"] == "audio/hus.mp3"
+        assert entry["sources"] == {"opus": "audio_opt/1234.ogg", "mp3": "audio_opt/5678.mp3"}
+        
+        # With real MP3 frames the chapter gets a sprite
+        with open(os.path.join(output_dir, "5678.mp3"), 'wb') as f:
+            f.write((b"\xFF\xF3\x84\xC0" + b"\x00" * 188) * 25)
+        assert export_to_mobile_format(chapters_dir, mobile_dir, translator=FakeTranslator(),
+                                       optimize=True, force=True) == ["capital_one"]
+        with open(os.path.join(mobile_dir, "words_capital_one.json"), encoding='utf-8') as f:
+            data = json.load(f)
+        assert data["sprite"].startswith("sprites/capital_one.")
+        assert data["easy"][0]["sprite"] == [0.0, 0.6]
+    
+    print("✅ Word entries list the optimized encodings")
+
+
+if __name__ == "__main__":
+    test_incremental_export()
+    test_unresolved_words_retried()
+    test_export_with_optimized_audio()
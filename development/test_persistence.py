@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Test write-behind persistence for game stats and review updates
+"""
+
+import json
+import os
+import tempfile
+import time
+
+
+def test_write_behind_writer():
+    print("🧪 Testing Write-Behind Persistence")
+    
+    from persistence import WriteBehindWriter, atomic_write_json
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        stats_file = os.path.join(tmp_dir, "game_stats.json")
+        atomic_write_json(stats_file, {"total_sessions": 1})
+        
+        writer = WriteBehindWriter(flush_interval=60)
+        flushed_hooks = []
+        writer.add_flush_hook(lambda: flushed_hooks.append(True))
+        
+        # Changes stay in memory until a flush
+        stats = {"total_sessions": 2}
+        writer.write_json(stats_file, stats)
+        stats["total_sessions"] = 99  # Later mutation must not leak into the snapshot
+        with open(stats_file, 'r', encoding='utf-8') as f:
+            assert json.load(f)["total_sessions"] == 1
+        print("✅ Writes are deferred")
+        
+        # Session end asks the background thread to flush
+        writer.request_flush()
+        deadline = time.time() + 2
+        while writer.has_pending() and time.time() < deadline:
+            time.sleep(0.01)
+        writer.close()
+        
+        with open(stats_file, 'r', encoding='utf-8') as f:
+            assert json.load(f)["total_sessions"] == 2
+        assert flushed_hooks
+        print("✅ Snapshot and review hook flushed")
+        
+        # Atomic writes leave no temp files behind
+        assert os.listdir(tmp_dir) == ["game_stats.json"]
+        print("✅ No temp files left behind")
+
+
+def test_review_store_write_behind():
+    print("🧪 Testing Buffered Review Updates")
+    
+    from review_store import ReviewStore
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = ReviewStore(os.path.join(tmp_dir, "reviews.db"), write_behind=True)
+        store.record_answer("dermed", True, now=0)
+        store.record_answer("dermed", True, now=0)
+        assert store._pending
+        
+        store.flush()
+        assert not store._pending
+        # Both buffered answers were applied in order (1 -> 2 days)
+        assert store.get_entry("dermed")["interval"] == 2
+        store.close()
+        print("✅ Buffered answers applied in one transaction")
+
+
+if __name__ == "__main__":
+    test_write_behind_writer()
+    test_review_store_write_behind()
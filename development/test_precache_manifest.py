@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Test the service worker precache manifest (mobile/precache_manifest.py)
+"""
+
+import json
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'mobile'))
+
+
+def write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+def test_precache_manifest():
+    print("🧪 Testing Precache Manifest")
+    
+    from precache_manifest import MANIFEST_FILE, SHELL_FILES, write_precache_manifest
+    
+    with tempfile.TemporaryDirectory() as mobile_dir:
+        for name in SHELL_FILES:
+            write(os.path.join(mobile_dir, name), name.encode())
+        write(os.path.join(mobile_dir, "sprites", "capital_one.abc.mp3"), b"sprite")
+        write(os.path.join(mobile_dir, "audio", "hus.mp3"), b"hus")
+        write(os.path.join(mobile_dir, "audio", "Færre enheter.mp3"), b"faerre")
+        write(os.path.join(mobile_dir, "audio", "bil.mp3"), b"bil")
+        for name in ("bil.ogg", "bil.m4a", "bil.mp3"):
+            write(os.path.join(mobile_dir, "audio_opt", name), name.encode())
+        words = {
+            "sprite": "sprites/capital_one.abc.mp3",
+            "easy": [{"word": "hus", "audio": "audio/hus.mp3", "sprite": [0, 1]}],
+            "medium": [{"word": "Færre enheter", "audio": "audio/Færre enheter.mp3"}],
+            "hard": [{"word": "bil", "audio": "audio/bil.mp3",
+                      "sources": {"opus": "audio_opt/bil.ogg", "aac": "audio_opt/bil.m4a",
+                                  "mp3": "audio_opt/bil.mp3"}}]
+        }
+        write(os.path.join(mobile_dir, "words_capital_one.json"), json.dumps(words).encode())
+        
+        version = write_precache_manifest(mobile_dir, ["words_capital_one.json"])
+        with open(os.path.join(mobile_dir, MANIFEST_FILE), encoding='utf-8') as f:
+            manifest = json.load(f)
+        assert manifest["version"] == version
+        urls = [entry["url"] for entry in manifest["files"]]
+        assert urls[0] == "./" and "app.js" in urls
+        assert "sprites/capital_one.abc.mp3" in urls
+        # Words covered by the sprite aren't precached separately; URLs are escaped like browsers do
+        assert "audio/hus.mp3" not in urls
+        assert "audio/F%C3%A6rre%20enheter.mp3" in urls
+        
+        # One format per clip: the optimized MP3; the others fall back to it offline
+        assert "audio_opt/bil.mp3" in urls
+        assert not {"audio_opt/bil.ogg", "audio_opt/bil.m4a", "audio/bil.mp3"} & set(urls)
+        assert manifest["fallbacks"] == {"audio/bil.mp3": "audio_opt/bil.mp3",
+                                         "audio_opt/bil.m4a": "audio_opt/bil.mp3",
+                                         "audio_opt/bil.ogg": "audio_opt/bil.mp3"}
+        
+        # Unchanged files: same version; a changed file: new version, only its hash differs
+        assert write_precache_manifest(mobile_dir, ["words_capital_one.json"]) == version
+        write(os.path.join(mobile_dir, "app.js"), b"new app")
+        assert write_precache_manifest(mobile_dir, ["words_capital_one.json"]) != version
+        with open(os.path.join(mobile_dir, MANIFEST_FILE), encoding='utf-8') as f:
+            changed = {entry["url"]: entry["hash"] for entry in json.load(f)["files"]}
+        old = {entry["url"]: entry["hash"] for entry in manifest["files"]}
+        assert [url for url in old if old[url] != changed[url]] == ["app.js"]
+    
+    print("✅ Manifest lists every offline file with its hash")
+
+
+if __name__ == "__main__":
+    test_precache_manifest()
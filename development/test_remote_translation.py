@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Test batched remote translation against a local stub HTTP server
+"""
+
+import json
+import os
+import socket
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+STUB_TRANSLATIONS = {"hus": "house", "bil": "car", "ustabil": "unstable"}
+
+
+class StubTranslateHandler(BaseHTTPRequestHandler):
+    """Answers in the Google Translate format; 'ustabil' fails once with 503"""
+    
+    requests_seen = []
+    failed_once = set()
+    lock = threading.Lock()
+    
+    def do_GET(self):
+        word = parse_qs(urlparse(self.path).query)["q"][0]
+        with self.lock:
+            self.requests_seen.append(word)
+            fail = word == "ustabil" and word not in self.failed_once
+            self.failed_once.add(word)
+        time.sleep(0.1)  # Simulated network latency
+        
+        if fail:
+            self.send_response(503)
+            self.end_headers()
+            return
+        
+        translation = STUB_TRANSLATIONS.get(word, word)
+        body = json.dumps([[[translation, word]]]).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        pass
+
+
+def test_batch_translation_with_stub_server():
+    print("🧪 Testing Batched Remote Translation")
+    
+    try:
+        from remote_translation import RemoteTranslator
+        from translation_service import TranslationService
+    except ImportError as e:
+        print(f"⚠️ Skipping: {e}")
+        return
+    
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubTranslateHandler)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/translate_a/single"
+        remote = RemoteTranslator(base_url=url, max_workers=4, requests_per_second=100,
+                                  backoff=0.01)
+        service = TranslationService(cache_path=None, remote=remote)
+        
+        words = ["hus", "bil", "hus", "Anlegg", "ustabil", "ukjentord", "bil"]
+        start = time.perf_counter()
+        translations = service.get_translations(words)
+        elapsed = time.perf_counter() - start
+        
+        assert translations["hus"] == "house"
+        assert translations["bil"] == "car"
+        assert translations["Anlegg"] == "Facility"  # From the dictionary, no request
+        assert translations["ustabil"] == "unstable"  # Retried after the 503
+        assert "not available" in translations["ukjentord"]
+        print("✅ Batch translated with dictionary, remote and retry")
+        
+        seen = StubTranslateHandler.requests_seen
+        assert sorted(seen) == ["bil", "hus", "ukjentord", "ustabil", "ustabil"]
+        assert remote.requests_sent == 5
+        print("✅ Duplicates and dictionary words sent no requests")
+        
+        # Five requests at 100 ms each: concurrent lookups beat the 500 ms serial time
+        assert elapsed < 0.4, elapsed
+        print(f"✅ Batch took {elapsed * 1000:.0f} ms")
+        
+        # Cached now: a second batch sends nothing
+        service.get_translations(words)
+        assert remote.requests_sent == 5
+        print("✅ Repeated batch served from cache")
+        service.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+class MalformedTranslateHandler(BaseHTTPRequestHandler):
+    """200 responses with bodies the parsers don't expect, in both API formats"""
+    
+    BODIES = {
+        "zqtom": [[None]],  # Google format, no translation inside
+        "zqrar": {"responseStatus": 200, "responseData": None},  # MyMemory format
+        "zqkort": [[]]
+    }
+    
+    def do_GET(self):
+        if self.path.startswith("/loop"):
+            self.send_response(302)
+            self.send_header("Location", self.path)
+            self.end_headers()
+            return
+        
+        word = parse_qs(urlparse(self.path).query)["q"][0]
+        body = json.dumps(self.BODIES.get(word, [[["ok", word]]])).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        pass
+
+
+def test_malformed_responses():
+    print("🧪 Testing Malformed Remote Responses")
+    
+    try:
+        from remote_translation import MyMemoryTranslator, RemoteTranslator
+        from translation_service import TranslationService
+    except ImportError as e:
+        print(f"⚠️ Skipping: {e}")
+        return
+    
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MalformedTranslateHandler)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/translate"
+        remote = RemoteTranslator(base_url=url, requests_per_second=100, backoff=0.01)
+        service = TranslationService(cache_path=None, remote=remote)
+        
+        # One odd body must not break a single lookup or the rest of a batch
+        assert "not available" in service.get_translation("zqtom")
+        translations = service.get_translations(["zqtom", "zqkort", "zqgodt"])
+        assert translations["zqgodt"] == "ok"
+        assert all("not available" in translations[word] for word in ("zqtom", "zqkort"))
+        print("✅ Google: malformed bodies count as not found, batch kept")
+        service.close()
+        
+        mymemory = MyMemoryTranslator(base_url=url, requests_per_second=100, backoff=0.01)
+        results = mymemory.translate_many(["zqrar", "zqtom"])
+        assert results == {"zqrar": None, "zqtom": None}
+        print("✅ MyMemory: malformed bodies count as not found")
+        mymemory.close()
+        
+        # Redirect loops and other request errors are per-word failures too
+        looping = RemoteTranslator(base_url=url.replace("/translate", "/loop"),
+                                   requests_per_second=100, backoff=0.01)
+        looping.session.max_redirects = 3
+        assert looping.translate_many(["hus", "bil"]) == {}
+        print("✅ Request errors leave the words out of the batch")
+        looping.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_unreachable_remote_not_cached():
+    print("🧪 Testing Unreachable Translation API")
+    
+    try:
+        from remote_translation import RemoteTranslator, RemoteUnavailable
+        from translation_service import TranslationService
+    except ImportError as e:
+        print(f"⚠️ Skipping: {e}")
+        return
+    
+    # A port nothing listens on
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    url = f"http://127.0.0.1:{port}/translate"
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache_path = os.path.join(tmp_dir, "cache.db")
+        remote = RemoteTranslator(base_url=url, requests_per_second=100, max_retries=1, backoff=0.01)
+        try:
+            remote.translate("zqhus")
+            assert False, "unreachable API should raise"
+        except RemoteUnavailable:
+            pass
+        
+        service = TranslationService(cache_path=cache_path, remote=remote)
+        assert "not available" in service.get_translation("zqhus")
+        assert "not available" in service.get_translations(["zqbil"])["zqbil"]
+        assert service.persistent_cache.get("zqhus") is None
+        assert service.persistent_cache.get("zqbil") is None
+        service.close()
+        print("✅ Offline lookups are not stored as misses")
+        
+        # Back online, a fresh process asks again
+        server = ThreadingHTTPServer(("127.0.0.1", 0), MalformedTranslateHandler)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        try:
+            remote = RemoteTranslator(base_url=f"http://127.0.0.1:{server.server_address[1]}/translate",
+                                      requests_per_second=100, backoff=0.01)
+            service = TranslationService(cache_path=cache_path, remote=remote)
+            assert service.get_translation("zqhus") == "ok"
+            service.close()
+        finally:
+            server.shutdown()
+            server.server_close()
+    print("✅ Words are looked up again once the API is reachable")
+
+
+def test_retry_after_is_capped():
+    print("🧪 Testing Retry-After Cap")
+    
+    try:
+        from remote_translation import RemoteTranslator
+    except ImportError as e:
+        print(f"⚠️ Skipping: {e}")
+        return
+    
+    class FakeResponse:
+        def __init__(self, retry_after):
+            self.headers = {"Retry-After": retry_after}
+    
+    remote = RemoteTranslator(timeout=10, backoff=0.5)
+    assert remote._retry_delay(0, FakeResponse("3600")) == 10
+    assert remote._retry_delay(0, FakeResponse("2")) == 2
+    assert remote._retry_delay(1, FakeResponse("")) == 1.0
+    remote.close()
+    print("✅ Retry-After capped at the request timeout")
+
+
+def test_rate_limiter():
+    print("🧪 Testing Rate Limiter")
+    
+    try:
+        from remote_translation import RateLimiter
+    except ImportError as e:
+        print(f"⚠️ Skipping: {e}")
+        return
+    
+    limiter = RateLimiter(rate=50, burst=2)
+    start = time.perf_counter()
+    for _ in range(7):
+        limiter.acquire()
+    elapsed = time.perf_counter() - start
+    
+    # Two burst tokens, then five more at 50 per second
+    assert elapsed >= 0.09, elapsed
+    print(f"✅ 7 requests took {elapsed * 1000:.0f} ms at 50/s")
+
+
+if __name__ == "__main__":
+    test_batch_translation_with_stub_server()
+    test_malformed_responses()
+    test_unreachable_remote_not_cached()
+    test_retry_after_is_capped()
+    test_rate_limiter()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Test the SQLite spaced-repetition review store
+"""
+
+import json
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+
+def test_review_store():
+    print("🧪 Testing Review Store")
+    
+    from review_store import ReviewStore, SECONDS_PER_DAY
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        json_path = os.path.join(tmp_dir, "words_to_review.json")
+        db_path = os.path.join(tmp_dir, "words_to_review.db")
+        
+        # Legacy JSON: one overdue word, one due in the future
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                "dermed": {"next_review": (datetime.now() - timedelta(days=1)).isoformat(), "interval": 2},
+                "Måter": {"next_review": (datetime.now() + timedelta(days=3)).isoformat(), "interval": 4}
+            }, f)
+        
+        store = ReviewStore(db_path, legacy_json_path=json_path)
+        assert store.count() == 2
+        assert store.due_words() == ["dermed"]
+        print("✅ Legacy JSON imported")
+        
+        # Import only happens once
+        assert store.import_json(json_path) == 0
+        
+        # Correct answers double the interval, wrong answers reset it
+        now = time.time()
+        store.record_answer("dermed", True, now=now)
+        assert store.get_entry("dermed")["interval"] == 4
+        store.record_answer("dermed", False, now=now)
+        assert store.get_entry("dermed")["interval"] == 1
+        store.record_answer("nytt", True, now=now)
+        assert store.get_entry("nytt")["interval"] == 1
+        print("✅ Intervals updated per answer")
+        
+        assert store.due_words(now=now) == []
+        assert set(store.due_words(now=now + SECONDS_PER_DAY)) == {"dermed", "nytt"}
+        print("✅ Due words queried by next review time")
+        store.close()
+        
+        # Data survives reopening the database
+        reopened = ReviewStore(db_path, legacy_json_path=json_path)
+        assert reopened.count() == 3
+        reopened.close()
+
+
+if __name__ == "__main__":
+    test_review_store()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Test the merged audio segment index and random-access reader
+"""
+
+import os
+import tempfile
+
+
+def make_frames(count, fill=0):
+    """MPEG2 layer III frames: 24 kHz mono 64 kbit/s, 192 bytes / 24 ms each"""
+    return (b"\xFF\xF3\x84\xC0" + bytes([fill]) * 188) * count
+
+
+def test_index_and_seek():
+    print("🧪 Testing Segment Index and Seeking")
+    
+    from mp3_frames import append_frames, duration_seconds
+    from segment_index import SegmentIndex, MergedAudioReader, index_path_for
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        audio_path = os.path.join(tmp_dir, "all_words_merged.mp3")
+        
+        # A track merged before indexing existed
+        with open(audio_path, 'wb') as f:
+            f.write(make_frames(10))
+        index = SegmentIndex(index_path_for(audio_path))
+        legacy = index.cover(audio_path)
+        assert legacy["word"] is None and legacy["length"] == 1920
+        assert abs(legacy["duration"] - 0.24) < 1e-6
+        assert index.cover(audio_path) is None
+        
+        for n, word in enumerate(["hus", "Bil", "båt"]):
+            frames = make_frames(5 + n, fill=n + 1)
+            offset = append_frames(audio_path, frames)
+            index.record(word, f"{word}.mp3", offset, len(frames), duration_seconds(frames))
+        
+        reader = MergedAudioReader(audio_path)
+        assert len(reader) == 3
+        assert reader.find("bil") == 1
+        assert reader.entry(1)["start"] == round(0.24 + 5 * 0.024, 6)
+        assert reader.read(1) == make_frames(6, fill=2)
+        assert reader.read(0, count=2) == make_frames(5, fill=1) + make_frames(6, fill=2)
+        assert reader.word_at(0.1) is None  # Unindexed region
+        assert reader.word_at(0.24 + 5 * 0.024 + 0.01) == 1
+        assert reader.word_at(1000) is None
+        
+        extracted = os.path.join(tmp_dir, "båt.mp3")
+        reader.extract(2, extracted)
+        with open(extracted, 'rb') as f:
+            assert f.read() == make_frames(7, fill=3)
+    
+    print("✅ Words are found by position, name and time")
+
+
+def test_index_reset_on_mismatch():
+    print("🧪 Testing Segment Index Reset")
+    
+    from segment_index import SegmentIndex, index_path_for
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        audio_path = os.path.join(tmp_dir, "merged.mp3")
+        with open(audio_path, 'wb') as f:
+            f.write(make_frames(2))
+        index = SegmentIndex(index_path_for(audio_path))
+        index.record("hus", "hus.mp3", 0, 192 * 50, 1.2)  # Longer than the file
+        
+        entry = SegmentIndex(index_path_for(audio_path)).cover(audio_path)
+        assert entry["offset"] == 0 and entry["length"] == 384
+        assert len(SegmentIndex(index_path_for(audio_path)).entries) == 1
+    
+    print("✅ A stale index is rebuilt")
+
+
+if __name__ == "__main__":
+    test_index_and_seek()
+    test_index_reset_on_mismatch()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Test bounded session history with daily/weekly rollups
+"""
+
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+
+def test_session_history_stays_bounded():
+    print("🧪 Testing Session History Rollups")
+    
+    from session_history import SessionHistory
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        history = SessionHistory(os.path.join(tmp_dir, "session_log.jsonl"),
+                                 max_recent=5, max_daily=3, max_weekly=2)
+        stats = {}
+        start = datetime(2025, 1, 1, 12, 0)
+        
+        # One session per day for 100 days
+        for day in range(100):
+            history.record(stats, {
+                "date": (start + timedelta(days=day)).isoformat(),
+                "total_words": 10,
+                "correct_words": 8,
+                "accuracy": 80.0,
+                "difficulty": "easy"
+            })
+        
+        assert len(stats["session_history"]) == 5
+        assert len(stats["accuracy_history"]) == 5
+        assert len(stats["daily_rollups"]) <= 3
+        assert len(stats["weekly_rollups"]) <= 2
+        print("✅ Stored history stays bounded")
+        
+        # Nothing is lost: totals still cover every session
+        totals = history.totals(stats)
+        assert totals["sessions"] == 100
+        assert totals["total_words"] == 1000
+        assert totals["correct_words"] == 800
+        assert abs(totals["average_accuracy"] - 80.0) < 1e-9
+        print("✅ Rollups preserve totals")
+        
+        # The append-only log keeps every session in full
+        assert len(history.read_log()) == 100
+        print("✅ Full history kept in session log")
+
+
+def test_session_history_migration():
+    print("🧪 Testing Legacy Stats Migration")
+    
+    from session_history import SessionHistory
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        history = SessionHistory(os.path.join(tmp_dir, "session_log.jsonl"), max_recent=2)
+        stats = {
+            "accuracy_history": [100.0, 50.0, 75.0],
+            "session_history": [
+                {"date": "2025-09-21T04:47:14", "total_words": 10, "correct_words": 10, "accuracy": 100.0},
+                {"date": "2025-09-26T00:20:57", "total_words": 2, "correct_words": 1, "accuracy": 50.0},
+                {"date": "2025-09-27T00:20:57", "total_words": 4, "correct_words": 3, "accuracy": 75.0}
+            ]
+        }
+        
+        assert history.migrate(stats)
+        assert len(stats["session_history"]) == 2
+        assert stats["daily_rollups"]["2025-09-21"]["sessions"] == 1
+        assert len(history.read_log()) == 3
+        
+        # Second start: nothing to do
+        assert not history.migrate(stats)
+        assert len(history.read_log()) == 3
+        print("✅ Legacy history logged once and compacted")
+
+
+if __name__ == "__main__":
+    test_session_history_stays_bounded()
+    test_session_history_migration()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Test the persistent translation cache
+"""
+
+import os
+import tempfile
+
+
+def test_translation_cache():
+    print("🧪 Testing Translation Cache")
+    
+    from translation_cache import TranslationCache, SECONDS_PER_DAY
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = TranslationCache(os.path.join(tmp_dir, "cache.db"), remote_ttl=SECONDS_PER_DAY,
+                                 miss_ttl=SECONDS_PER_DAY)
+        cache.set_dictionary_fingerprint("v1")
+        cache.put("Anlegg", "Facility", "fallback", now=1000)
+        cache.put("hus", "house", "remote", now=1000)
+        cache.put("xyz", None, "miss", now=1000)
+        
+        assert cache.get("Anlegg", now=1000 + 10 * SECONDS_PER_DAY) == ("Facility", "fallback")
+        assert cache.get("hus", now=1000 + 60) == ("house", "remote")
+        assert cache.get("hus", now=1000 + 2 * SECONDS_PER_DAY) is None
+        assert cache.get("xyz", now=1000 + 60) == (None, "miss")
+        print("✅ Provenance and TTLs applied")
+        
+        # A new dictionary drops only dictionary-derived entries
+        assert cache.set_dictionary_fingerprint("v2") == 1
+        assert cache.get("Anlegg") is None
+        assert cache.get("xyz", now=1000 + 60) == (None, "miss")
+        print("✅ Dictionary change invalidates fallback entries")
+        cache.close()
+
+
+def test_service_warm_run_without_network():
+    print("🧪 Testing Warm TranslationService Run")
+    
+    from translation_service import TranslationService
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache_path = os.path.join(tmp_dir, "cache.db")
+        calls = []
+        
+        def fake_remote(word):
+            calls.append(word)
+            return "ship" if word == "skip" else None
+        
+        cold = TranslationService(cache_path)
+        cold._try_google_translate = fake_remote
+        assert cold.get_translation("Anlegg") == "Facility"
+        assert cold.get_translation("skip") == "ship"
+        assert "not available" in cold.get_translation("qqqq")
+        assert calls == ["skip", "qqqq"]
+        cold.close()
+        
+        warm = TranslationService(cache_path)
+        warm._try_google_translate = fake_remote
+        assert warm.get_translation("skip") == "ship"
+        assert "not available" in warm.get_translation("qqqq")
+        assert warm.get_translation("Anlegg") == "Facility"
+        assert calls == ["skip", "qqqq"]  # No new remote lookups
+        print("✅ Warm run made no remote lookups")
+        
+        warm.add_translation("qqqq", "custom")
+        assert warm.get_translation("qqqq") == "custom"
+        warm.close()
+        
+        assert TranslationService(cache_path).persistent_cache.get("qqqq") == ("custom", "manual")
+        print("✅ Manual translations persisted")
+
+
+def test_service_unreachable_remote():
+    print("🧪 Testing TranslationService With the API Unreachable")
+    
+    import translation_service
+    from remote_translation import RemoteUnavailable
+    from translation_service import TranslationService
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache_path = os.path.join(tmp_dir, "cache.db")
+        calls = []
+        
+        def offline_remote(word):
+            calls.append(word)
+            raise RemoteUnavailable("connection refused")
+        
+        service = TranslationService(cache_path)
+        service._try_google_translate = offline_remote
+        assert "not available" in service.get_translation("qqqq")
+        assert "not available" in service.get_translation("qqqq")
+        assert calls == ["qqqq"]  # Not retried right away
+        assert service.persistent_cache.get("qqqq") is None  # Nor stored as a miss
+        print("✅ Transport failure remembered briefly, not persisted")
+        
+        # Retried once the short window has passed
+        service._unreachable["qqqq"] -= translation_service.UNREACHABLE_RETRY_SECONDS + 1
+        service._try_google_translate = lambda word: "found"
+        assert service.get_translation("qqqq") == "found"
+        service.close()
+        print("✅ Looked up again after the retry window")
+
+
+if __name__ == "__main__":
+    test_translation_cache()
+    test_service_warm_run_without_network()
+    test_service_unreachable_remote()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Test the indexed partial-match lookup against the original linear scan
+"""
+
+import random
+import time
+
+
+def linear_scan(translations, word):
+    """The partial-match loop TranslationService used before the index"""
+    for key in translations:
+        if key.lower() in word.lower() or word.lower() in key.lower():
+            return key
+    return None
+
+
+def test_matches_linear_scan():
+    print("🧪 Testing PhraseIndex Against Linear Scan")
+    
+    from translation_index import PhraseIndex
+    from translation_service import TranslationService
+    
+    translations = TranslationService(cache_path=None).fallback_translations
+    index = PhraseIndex(translations)
+    
+    queries = list(translations) + [
+        "anlegget", "FASE", "Markedet forandrer seg raskt", "å", "", "zzz",
+        "det er viktig", "Beslutninger", "ut", "produksjon"
+    ]
+    rng = random.Random(7)
+    keys = list(translations)
+    for _ in range(300):
+        key = rng.choice(keys).lower()
+        start = rng.randrange(len(key))
+        queries.append(key[start:start + rng.randrange(1, 8)])
+    
+    for query in queries:
+        assert index.find(query) == linear_scan(translations, query), query
+    print(f"✅ {len(queries)} queries match the linear scan")
+
+
+def test_large_dictionary_speed():
+    print("🧪 Testing PhraseIndex With 100k Phrases")
+    
+    from translation_index import PhraseIndex
+    
+    rng = random.Random(3)
+    letters = "abcdefghijklmnopqrstuvwxyzæøå "
+    phrases = ["".join(rng.choice(letters) for _ in range(rng.randrange(6, 24)))
+               for _ in range(100000)]
+    index = PhraseIndex(phrases)
+    
+    queries = [rng.choice(phrases)[2:9] for _ in range(200)]
+    queries += ["".join(rng.choice(letters) for _ in range(12)) for _ in range(200)]
+    
+    start = time.perf_counter()
+    results = [index.find(query) for query in queries]
+    per_lookup = (time.perf_counter() - start) / len(queries)
+    
+    for query, result in list(zip(queries, results))[::40]:
+        assert result == linear_scan(dict.fromkeys(phrases), query)
+    print(f"✅ {per_lookup * 1000:.3f} ms per lookup")
+    assert per_lookup < 0.001  # Sub-millisecond
+
+
+def test_service_add_translation_updates_index():
+    print("🧪 Testing Index Update on add_translation")
+    
+    from translation_service import TranslationService
+    
+    service = TranslationService(cache_path=None)
+    service._try_google_translate = lambda word: None
+    assert "not available" in service.get_translation("kvxq")
+    service.add_translation("kvxqord", "test word")
+    assert service.get_translation("kvxq") == "test word"
+    print("✅ New phrases are found by partial lookups")
+
+
+if __name__ == "__main__":
+    test_matches_linear_scan()
+    test_large_dictionary_speed()
+    test_service_add_translation_updates_index()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Test the TTS backend interface and offline bulk chapter generation
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+import wave
+from pathlib import Path
+
+
+def test_backend_selection():
+    print("🧪 Testing TTS Backend Selection")
+    
+    from tts_backends import create_tts_backend, FakeBackend
+    
+    backend = create_tts_backend("fake")
+    assert isinstance(backend, FakeBackend)
+    assert backend.voice_id == "fake"
+    
+    previous = os.environ.get("PREPP_TTS_BACKEND")
+    os.environ["PREPP_TTS_BACKEND"] = "fake"
+    try:
+        assert isinstance(create_tts_backend(), FakeBackend)
+    finally:
+        if previous is None:
+            del os.environ["PREPP_TTS_BACKEND"]
+        else:
+            os.environ["PREPP_TTS_BACKEND"] = previous
+    
+    try:
+        create_tts_backend("nonexistent")
+        assert False, "unknown backend should raise"
+    except ValueError:
+        pass
+    
+    print("✅ Backends are selected by name and environment")
+
+
+def test_fake_backend_batch():
+    print("🧪 Testing Fake Backend Batch Synthesis")
+    
+    from tts_backends import FakeBackend
+    
+    backend = FakeBackend()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        items = [(word, os.path.join(tmp_dir, f"{word}.wav")) for word in ["hus", "bil", "båt"]]
+        errors = backend.synthesize_batch(items)
+        assert errors == {"hus": None, "bil": None, "båt": None}
+        
+        with wave.open(items[0][1], 'rb') as wav_file:
+            assert wav_file.getnframes() > 0
+        
+        # Deterministic output for the same text
+        again = os.path.join(tmp_dir, "again.wav")
+        backend.synthesize("hus", again)
+        with open(items[0][1], 'rb') as a, open(again, 'rb') as b:
+            assert a.read() == b.read()
+    
+    print("✅ Fake backend synthesizes batches deterministically")
+
+
+def test_offline_chapter_generation():
+    print("🧪 Testing Offline Chapter Generation")
+    
+    try:
+        from generate_chapter_audio import ChapterAudioGenerator
+    except ImportError as e:
+        print(f"⚠️ Skipping: {e}")
+        return
+    from audio_store import AudioStore
+    from chapter_index import ChapterIndex
+    from tts_backends import FakeBackend
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        backend = FakeBackend()
+        backend.batch_size = 4
+        
+        # Batches must not overlap: local engines parallelize inside a batch
+        active = {"now": 0, "peak": 0}
+        lock = threading.Lock()
+        synthesize_batch = backend.synthesize_batch
+        def tracked_batch(items, lang="no"):
+            with lock:
+                active["now"] += 1
+                active["peak"] = max(active["peak"], active["now"])
+            time.sleep(0.02)
+            try:
+                return synthesize_batch(items, lang)
+            finally:
+                with lock:
+                    active["now"] -= 1
+        backend.synthesize_batch = tracked_batch
+        generator = ChapterAudioGenerator(tts_backend=backend)
+        generator.base_path = Path(tmp_dir)
+        generator.development_path = Path(tmp_dir)
+        generator.chapters_path = Path(tmp_dir) / "chapters"
+        generator.chapter_index = ChapterIndex(generator.chapters_path)
+        generator.audio_store = AudioStore(os.path.join(tmp_dir, "store"))
+        generator.translator.translate = lambda word: f"{word} (en)"
+        generator.auto_update = True
+        
+        words = [f"ord{i}" for i in range(10)]
+        chapter_file = Path(tmp_dir) / "merged_chapter_1.txt"
+        chapter_file.write_text("\n".join(words) + "\n", encoding="utf-8")
+        
+        assert generator.process_chapter_file(chapter_file)
+        assert backend.calls == len(words)
+        assert active["peak"] == 1
+        
+        audio_dir = generator.chapters_path / "capital_one" / "audio"
+        for word in words:
+            assert (audio_dir / f"{word}.mp3").stat().st_size > 0
+        
+        # Stored under the backend's voice, so a second chapter reuses it without synthesis
+        assert generator.audio_store.get("ord0", voice="fake")
+        assert not generator.audio_store.get("ord0")  # gTTS voice
+        shutil.rmtree(generator.chapters_path)
+        generator.chapter_index = ChapterIndex(generator.chapters_path)
+        assert generator.process_chapter_file(chapter_file)
+        assert backend.calls == len(words)
+    
+    print("✅ Chapters build offline in batches")
+
+
+def test_local_engines():
+    print("🧪 Testing Local TTS Engines")
+    
+    from tts_backends import EspeakBackend
+    
+    try:
+        backend = EspeakBackend()
+    except RuntimeError as e:
+        print(f"⚠️ Skipping: {e}")
+        return
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output_path = os.path.join(tmp_dir, "hei.wav")
+        assert backend.synthesize_batch([("hei", output_path)]) == {"hei": None}
+        assert os.path.getsize(output_path) > 0
+    
+    print("✅ espeak-ng synthesizes offline")
+
+
+if __name__ == "__main__":
+    test_backend_selection()
+    test_fake_backend_batch()
+    test_offline_chapter_generation()
+    test_local_engines()
@@ -0,0 +1,141 @@
+"""
+Persistent Translation Cache
+SQLite-backed translations shared by the game and the mobile export, so warm
+runs don't repeat dictionary scans or network lookups
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+# Where a cached translation came from
+PROVENANCE_FALLBACK = "fallback"  # Exact match in the built-in dictionary
+PROVENANCE_PARTIAL = "partial"  # Substring match in the built-in dictionary
+PROVENANCE_REMOTE = "remote"  # Online translation API
+PROVENANCE_MANUAL = "manual"  # Added with add_translation()
+PROVENANCE_MISS = "miss"  # Nothing found; cached so it isn't retried every run
+
+# Entries that are only valid for the dictionary they were computed from
+DICTIONARY_PROVENANCES = (PROVENANCE_FALLBACK, PROVENANCE_PARTIAL)
+
+SECONDS_PER_DAY = 24 * 60 * 60
+
+
+def dictionary_fingerprint(translations: Dict[str, str], extra: str = "") -> str:
+    """Hash of a translation dictionary's contents (plus e.g. a compiled
+    dictionary's checksum)"""
+    data = json.dumps([sorted(translations.items()), extra], ensure_ascii=False)
+    return hashlib.sha1(data.encode("utf-8")).hexdigest()
+
+
+class TranslationCache:
+    """
+    Cross-process translation cache. Remote entries expire after remote_ttl
+    seconds and misses after miss_ttl; dictionary-derived entries are dropped
+    whenever the dictionary fingerprint changes.
+    """
+
+    def __init__(self, db_path: str, remote_ttl: float = 90 * SECONDS_PER_DAY,
+                 miss_ttl: float = 7 * SECONDS_PER_DAY):
+        self.db_path = db_path
+        self.ttls = {PROVENANCE_REMOTE: remote_ttl, PROVENANCE_MISS: miss_ttl}
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, timeout=10, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+
+    def _create_schema(self):
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS translations (
+                    word TEXT PRIMARY KEY,
+                    translation TEXT,
+                    provenance TEXT NOT NULL,
+                    created REAL NOT NULL
+                )
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                )
+            """)
+
+    def set_dictionary_fingerprint(self, fingerprint: str) -> int:
+        """Record the dictionary in use, dropping entries derived from an older one.
+        Returns the number of entries dropped."""
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT value FROM meta WHERE key = 'dictionary_fingerprint'"
+            ).fetchone()
+            if row and row[0] == fingerprint:
+                return 0
+            dropped = self._conn.execute(
+                "DELETE FROM translations WHERE provenance IN (?, ?)", DICTIONARY_PROVENANCES
+            ).rowcount
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('dictionary_fingerprint', ?)",
+                (fingerprint,)
+            )
+        return dropped
+
+    def get(self, word: str, now: Optional[float] = None) -> Optional[Tuple[Optional[str], str]]:
+        """Get (translation, provenance) for a word, or None if not cached or expired.
+        Cached misses come back as (None, "miss")."""
+        now = time.time() if now is None else now
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT translation, provenance, created FROM translations WHERE word = ?",
+                (word,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            translation, provenance, created = row
+            ttl = self.ttls.get(provenance)
+            if ttl is not None and now - created > ttl:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return translation, provenance
+
+    def put(self, word: str, translation: Optional[str], provenance: str, now: Optional[float] = None):
+        """Store a translation (None for a miss)"""
+        now = time.time() if now is None else now
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO translations (word, translation, provenance, created) "
+                "VALUES (?, ?, ?, ?)",
+                (word, translation, provenance, now)
+            )
+
+    def delete(self, word: str):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM translations WHERE word = ?", (word,))
+
+    def clear(self):
+        """Drop every cached translation"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM translations")
+
+    def get_stats(self) -> dict:
+        """Get cache statistics, including entry counts per provenance"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT provenance, COUNT(*) FROM translations GROUP BY provenance"
+            ).fetchall()
+        return {
+            "entries": dict(rows),
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
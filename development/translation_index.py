@@ -0,0 +1,91 @@
+"""
+Phrase Index for Partial Translation Matches
+Answers "first dictionary key (in insertion order) that is contained in the
+word, or that contains the word", case-insensitively, without scanning the
+whole dictionary
+"""
+
+from typing import Dict, List, Optional
+
+NGRAM_SIZE = 3
+
+
+class PhraseIndex:
+    """
+    Precomputed lookup structures over a list of phrases:
+    - a lowercase phrase -> first position map, used for phrases contained in
+      the word by probing each of the word's substrings
+    - n-gram posting lists (positions in ascending order), used for phrases
+      containing the word by checking candidates from the rarest n-gram first
+    Results match a linear scan that returns the first phrase satisfying
+    either check.
+    """
+
+    def __init__(self, phrases=()):
+        self.phrases: List[str] = []
+        self._first_position: Dict[str, int] = {}  # lowercase phrase -> position
+        self._phrase_lengths = set()
+        self._postings: Dict[str, List[int]] = {}  # n-gram (or shorter phrase) -> positions
+        self._lowered: List[str] = []
+        for phrase in phrases:
+            self.add(phrase)
+
+    def __len__(self):
+        return len(self.phrases)
+
+    def add(self, phrase: str):
+        """Append a phrase at the next position"""
+        position = len(self.phrases)
+        lowered = phrase.lower()
+        self.phrases.append(phrase)
+        self._lowered.append(lowered)
+        self._first_position.setdefault(lowered, position)
+        self._phrase_lengths.add(len(lowered))
+
+        grams = {lowered[i:i + size]
+                 for size in range(1, NGRAM_SIZE + 1)
+                 for i in range(len(lowered) - size + 1)}
+        for gram in grams:
+            self._postings.setdefault(gram, []).append(position)
+
+    def _first_contained(self, word: str) -> Optional[int]:
+        """First position of a phrase that is a substring of the word"""
+        best = None
+        for length in self._phrase_lengths:
+            if length > len(word):
+                continue
+            for start in range(len(word) - length + 1):
+                position = self._first_position.get(word[start:start + length])
+                if position is not None and (best is None or position < best):
+                    best = position
+        return best
+
+    def _first_containing(self, word: str, limit: Optional[int]) -> Optional[int]:
+        """First position (below limit) of a phrase that contains the word"""
+        if not word:
+            return 0 if self.phrases else None
+
+        size = min(NGRAM_SIZE, len(word))
+        candidates = None
+        for i in range(len(word) - size + 1):
+            posting = self._postings.get(word[i:i + size])
+            if posting is None:
+                return None  # Some n-gram of the word appears in no phrase
+            if candidates is None or len(posting) < len(candidates):
+                candidates = posting
+
+        for position in candidates:
+            if limit is not None and position >= limit:
+                break
+            if word in self._lowered[position]:
+                return position
+        return None
+
+    def find(self, word: str) -> Optional[str]:
+        """Get the first phrase matching the word in either direction"""
+        lowered = word.lower()
+        best = self._first_contained(lowered)
+        containing = self._first_containing(lowered, best)
+        if containing is not None:
+            best = containing
+        return None if best is None else self.phrases[best]
@@ -1,11 +1,32 @@
-import requests
-import json
-import urllib.parse
-from typing import Optional
+import os
+import sqlite3
+import time
+from typing import Dict, Iterable, Optional
+
+from translation_cache import (
+    PROVENANCE_FALLBACK, PROVENANCE_MANUAL, PROVENANCE_MISS, PROVENANCE_PARTIAL,
+    PROVENANCE_REMOTE, TranslationCache, dictionary_fingerprint
+)
+from translation_index import PhraseIndex
+from remote_translation import RemoteTranslator, RemoteUnavailable
+from compiled_dictionary import CompiledDictionary
+
+# Shared by the game and mobile/export_words.py
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "translation_cache.db")
+
+# Built with compiled_dictionary.py (optional)
+DEFAULT_DICTIONARY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "translations.dict")
+
+# Words the API couldn't be asked about are retried after this long (kept in memory only)
+UNREACHABLE_RETRY_SECONDS = 5 * 60
 
 class TranslationService:
-    def __init__(self):
+    def __init__(self, cache_path: Optional[str] = DEFAULT_CACHE_PATH,
+                 remote: Optional[RemoteTranslator] = None,
+                 dictionary_path: Optional[str] = DEFAULT_DICTIONARY_PATH):
         self.cache = {}
+        self._unreachable = {}  # word -> time.monotonic() of the failed lookup
+        self.remote = remote if remote is not None else RemoteTranslator()
         self.fallback_translations = {
             # Common Norwegian words and their English translations
             "Anlegg": "Facility",
@@ -101,67 +122,202 @@ class TranslationService:
             "trekker til seg": "attracts",
             "å tåle problemer underveis": "to tolerate problems along the way"
         }
+        
+        self._phrase_index = None  # Built on the first partial lookup
+        
+        # Large vocabularies live in a compiled file, mapped on first lookup
+        self.compiled_dictionary = None
+        if dictionary_path and os.path.exists(dictionary_path):
+            self.compiled_dictionary = CompiledDictionary(dictionary_path)
+        
+        # Persistent cache (None disables it, e.g. for tests)
+        self.persistent_cache = None
+        if cache_path:
+            try:
+                self.persistent_cache = TranslationCache(cache_path)
+                self.persistent_cache.set_dictionary_fingerprint(self._dictionary_fingerprint())
+            except sqlite3.Error as e:
+                print(f"⚠️ Translation cache unavailable ({cache_path}): {e}")
+                self.persistent_cache = None
     
     def get_translation(self, norwegian_word: str) -> str:
         """Get English translation for Norwegian word"""
+        translation = self.lookup_local(norwegian_word)
+        if translation is not None:
+            return translation
+        
+        # Try Google Translate API (free version)
+        try:
+            translation = self._try_google_translate(norwegian_word)
+        except RemoteUnavailable:
+            return self._remember_unreachable(norwegian_word)
+        return self._store_remote_result(norwegian_word, translation)
+    
+    def get_translations(self, words: Iterable[str]) -> Dict[str, str]:
+        """Translate many words: duplicates are resolved once, cached and dictionary
+        words locally, and the rest through concurrent remote lookups"""
+        translations = {}
+        remote_words = []
+        for word in dict.fromkeys(words):
+            translation = self.lookup_local(word)
+            if translation is None:
+                remote_words.append(word)
+            else:
+                translations[word] = translation
+        
+        if remote_words:
+            results = self.remote.translate_many(remote_words)
+            for word in remote_words:
+                if word in results:
+                    translations[word] = self._store_remote_result(word, results[word])
+                else:
+                    translations[word] = self._remember_unreachable(word)
+        return translations
+    
+    def lookup_local(self, norwegian_word: str) -> Optional[str]:
+        """Get a translation from the caches or the built-in dictionary without
+        any network access; None if only a remote lookup could answer"""
         # Check cache first
         if norwegian_word in self.cache:
             return self.cache[norwegian_word]
         
+        # Recently unreachable: don't hit the network again on every redraw
+        failed_at = self._unreachable.get(norwegian_word)
+        if failed_at is not None:
+            if time.monotonic() - failed_at < UNREACHABLE_RETRY_SECONDS:
+                return self.missing_translation(norwegian_word)
+            del self._unreachable[norwegian_word]
+        
+        # Then the persistent cache from earlier runs
+        cached = self._get_persistent(norwegian_word)
+        if cached is not None:
+            translation, provenance = cached
+            if provenance == PROVENANCE_MISS:
+                translation = self.missing_translation(norwegian_word)
+            self.cache[norwegian_word] = translation
+            return translation
+        
         # Try exact match in fallback translations
         if norwegian_word in self.fallback_translations:
             translation = self.fallback_translations[norwegian_word]
-            self.cache[norwegian_word] = translation
-            return translation
+            return self._remember(norwegian_word, translation, PROVENANCE_FALLBACK)
+        
+        # Try the compiled dictionary (case-insensitive exact match)
+        translation = self._lookup_compiled(norwegian_word)
+        if translation is not None:
+            return self._remember(norwegian_word, translation, PROVENANCE_FALLBACK)
         
         # Try partial match in fallback translations
-        for key, value in self.fallback_translations.items():
-            if key.lower() in norwegian_word.lower() or norwegian_word.lower() in key.lower():
-                self.cache[norwegian_word] = value
-                return value
+        key = self._get_phrase_index().find(norwegian_word)
+        if key is not None:
+            return self._remember(norwegian_word, self.fallback_translations[key], PROVENANCE_PARTIAL)
         
-        # Try Google Translate API (free version)
-        translation = self._try_google_translate(norwegian_word)
+        return None
+    
+    def _store_remote_result(self, norwegian_word: str, translation: Optional[str]) -> str:
+        """Cache the API's answer and return the translation to show. Only for
+        answers: transport failures go through _remember_unreachable."""
         if translation:
-            self.cache[norwegian_word] = translation
-            return translation
+            return self._remember(norwegian_word, translation, PROVENANCE_REMOTE)
         
-        # Fallback message
-        translation = f"Translation for '{norwegian_word}' not available"
+        # The API answered without a translation: cached so it isn't looked up again every run
+        self._put_persistent(norwegian_word, None, PROVENANCE_MISS)
+        translation = self.missing_translation(norwegian_word)
         self.cache[norwegian_word] = translation
         return translation
     
+    def _remember_unreachable(self, norwegian_word: str) -> str:
+        """Placeholder for a word the API couldn't be asked about; remembered in
+        memory for a few minutes, never persisted"""
+        self._unreachable[norwegian_word] = time.monotonic()
+        return self.missing_translation(norwegian_word)
+    
+    def _lookup_compiled(self, norwegian_word: str) -> Optional[str]:
+        if self.compiled_dictionary is None:
+            return None
+        try:
+            return self.compiled_dictionary.get(norwegian_word)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Compiled dictionary unavailable: {e}")
+            self.compiled_dictionary = None
+            return None
+    
+    def _dictionary_fingerprint(self) -> str:
+        """Identifies the dictionaries that fallback/partial cache entries came from"""
+        compiled_checksum = ""
+        if self.compiled_dictionary is not None:
+            try:
+                compiled_checksum = self.compiled_dictionary.checksum
+            except OSError:
+                pass
+        return dictionary_fingerprint(self.fallback_translations, compiled_checksum)
+    
+    def _get_phrase_index(self) -> PhraseIndex:
+        """Index over the fallback dictionary keys, rebuilt if the dict was replaced"""
+        if self._phrase_index is None or len(self._phrase_index) != len(self.fallback_translations):
+            self._phrase_index = PhraseIndex(self.fallback_translations)
+        return self._phrase_index
+    
+    def missing_translation(self, norwegian_word: str) -> str:
+        """Placeholder shown for a word no lookup could translate"""
+        return f"Translation for '{norwegian_word}' not available"
+    
+    def is_missing_translation(self, norwegian_word: str, translation: str) -> bool:
+        """True if translation is the placeholder shown when no lookup succeeded"""
+        return translation == self.missing_translation(norwegian_word)
+    
+    def _remember(self, norwegian_word: str, translation: str, provenance: str) -> str:
+        """Store a translation in both caches and return it"""
+        self.cache[norwegian_word] = translation
+        self._put_persistent(norwegian_word, translation, provenance)
+        return translation
+    
+    def _get_persistent(self, norwegian_word: str):
+        if self.persistent_cache is None:
+            return None
+        try:
+            return self.persistent_cache.get(norwegian_word)
+        except sqlite3.Error as e:
+            print(f"⚠️ Translation cache read failed: {e}")
+            return None
+    
+    def _put_persistent(self, norwegian_word: str, translation: Optional[str], provenance: str):
+        if self.persistent_cache is None:
+            return
+        try:
+            self.persistent_cache.put(norwegian_word, translation, provenance)
+        except sqlite3.Error as e:
+            print(f"⚠️ Translation cache write failed: {e}")
+    
     def _try_google_translate(self, norwegian_word: str) -> Optional[str]:
         """Try to get translation from Google Translate API"""
-        try:
-            # Using Google Translate API (free version)
-            url = "https://translate.googleapis.com/translate_a/single"
-            params = {
-                "client": "gtx",
-                "sl": "no",  # Norwegian
-                "tl": "en",  # English
-                "dt": "t",
-                "q": norwegian_word
-            }
-            
-            response = requests.get(url, params=params, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                if data and len(data) > 0 and len(data[0]) > 0:
-                    translation = data[0][0][0]
-                    if translation and translation != norwegian_word:
-                        return translation
-            
-        except Exception as e:
-            print(f"Error with Google Translate for '{norwegian_word}': {e}")
-        
-        return None
+        return self.remote.translate(norwegian_word)
     
     def clear_cache(self):
         """Clear the translation cache"""
         self.cache.clear()
+        self._unreachable.clear()
+        if self.persistent_cache is not None:
+            self.persistent_cache.clear()
     
     def add_translation(self, norwegian_word: str, english_translation: str):
         """Add a custom translation to the fallback dictionary"""
+        is_new = norwegian_word not in self.fallback_translations
         self.fallback_translations[norwegian_word] = english_translation
-        self.cache[norwegian_word] = english_translation 
\ No newline at end of file
+        if is_new and self._phrase_index is not None:
+            self._phrase_index.add(norwegian_word)
+        
+        # Partial matches may resolve differently with the new entry
+        self.cache.clear()
+        if self.persistent_cache is not None:
+            self.persistent_cache.set_dictionary_fingerprint(self._dictionary_fingerprint())
+        self._remember(norwegian_word, english_translation, PROVENANCE_MANUAL)
+    
+    def close(self):
+        """Close the persistent cache and the HTTP session"""
+        self.remote.close()
+        if self.compiled_dictionary is not None:
+            self.compiled_dictionary.close()
+        if self.persistent_cache is not None:
+            self.persistent_cache.close()
+            self.persistent_cache = None
@@ -0,0 +1,225 @@
+"""
+Text-to-Speech Backends
+gTTS (online), espeak-ng and piper (local, offline) and a deterministic
+fake backend for tests, behind one interface with batch synthesis
+"""
+
+import hashlib
+import json
+import math
+import os
+import shutil
+import struct
+import subprocess
+import tempfile
+import wave
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+# (text, output path) pairs for batch synthesis
+BatchItems = List[Tuple[str, str]]
+
+
+def convert_wav(wav_path: str, output_path: str):
+    """Move or encode a WAV file to output_path's format (mp3 needs ffmpeg)"""
+    if output_path.lower().endswith(".wav"):
+        shutil.move(wav_path, output_path)
+        return
+    from pydub import AudioSegment
+    audio_format = os.path.splitext(output_path)[1].lstrip(".").lower() or "mp3"
+    AudioSegment.from_wav(wav_path).export(output_path, format=audio_format)
+    os.remove(wav_path)
+
+
+class TTSBackend:
+    """
+    Base class for text-to-speech backends
+    """
+
+    name = "base"
+    batch_size = 1  # Words per synthesize_batch call in bulk generation
+    rate_limited = False  # True for network services that need throttling
+
+    @property
+    def voice_id(self) -> str:
+        """Identifies the voice in audio store keys"""
+        return self.name
+
+    def synthesize(self, text: str, output_path: str, lang: str = "no"):
+        """Write speech for text to output_path"""
+        raise NotImplementedError
+
+    def synthesize_batch(self, items: BatchItems, lang: str = "no") -> Dict[str, Optional[str]]:
+        """Synthesize several texts; returns text -> error message (None on success)"""
+        errors = {}
+        for text, output_path in items:
+            try:
+                self.synthesize(text, output_path, lang)
+                errors[text] = None
+            except Exception as e:
+                errors[text] = str(e)
+        return errors
+
+
+class GTTSBackend(TTSBackend):
+    """
+    Google Text-to-Speech (needs network access)
+    """
+
+    name = "gtts"
+    rate_limited = True
+
+    def __init__(self, slow: bool = False):
+        from gtts import gTTS  # Fail early if gTTS isn't installed
+        self._gtts = gTTS
+        self.slow = slow
+
+    @property
+    def voice_id(self) -> str:
+        # Matches the key used for audio generated before backends existed
+        return "gtts" if not self.slow else "gtts:slow"
+
+    def synthesize(self, text: str, output_path: str, lang: str = "no"):
+        tts = self._gtts(text=text, lang=lang, slow=self.slow)
+        tts.save(output_path)
+
+
+class EspeakBackend(TTSBackend):
+    """
+    Local espeak-ng engine; batches run one process per word on all CPU cores
+    """
+
+    name = "espeak"
+
+    def __init__(self, voice: str = "nb", speed: int = 150, executable: Optional[str] = None,
+                 workers: Optional[int] = None):
+        self.executable = executable or shutil.which("espeak-ng") or shutil.which("espeak")
+        if not self.executable:
+            raise RuntimeError("espeak-ng is not installed")
+        self.voice = voice
+        self.speed = speed
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = self.workers * 4
+
+    @property
+    def voice_id(self) -> str:
+        return f"espeak:{self.voice}:{self.speed}"
+
+    def synthesize(self, text: str, output_path: str, lang: str = "no"):
+        fd, wav_path = tempfile.mkstemp(suffix=".wav", dir=os.path.dirname(os.path.abspath(output_path)))
+        os.close(fd)
+        try:
+            subprocess.run([self.executable, "-v", self.voice, "-s", str(self.speed), "-w", wav_path, text],
+                           check=True, capture_output=True)
+            convert_wav(wav_path, output_path)
+        finally:
+            if os.path.exists(wav_path):
+                os.remove(wav_path)
+
+    def synthesize_batch(self, items: BatchItems, lang: str = "no") -> Dict[str, Optional[str]]:
+        def run(item):
+            try:
+                self.synthesize(item[0], item[1], lang)
+                return None
+            except Exception as e:
+                return str(e)
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            return dict(zip((text for text, _ in items), executor.map(run, items)))
+
+
+class PiperBackend(TTSBackend):
+    """
+    Local piper neural TTS; a batch is synthesized by a single piper process
+    (the model is loaded once) using its JSON-lines input
+    """
+
+    name = "piper"
+    batch_size = 64
+
+    def __init__(self, model: Optional[str] = None, executable: Optional[str] = None):
+        self.executable = executable or shutil.which("piper")
+        if not self.executable:
+            raise RuntimeError("piper is not installed")
+        self.model = model or os.environ.get("PREPP_PIPER_MODEL")
+        if not self.model:
+            raise RuntimeError("no piper model configured (set PREPP_PIPER_MODEL)")
+
+    @property
+    def voice_id(self) -> str:
+        return f"piper:{os.path.basename(self.model)}"
+
+    def synthesize(self, text: str, output_path: str, lang: str = "no"):
+        error = self.synthesize_batch([(text, output_path)], lang)[text]
+        if error:
+            raise RuntimeError(error)
+
+    def synthesize_batch(self, items: BatchItems, lang: str = "no") -> Dict[str, Optional[str]]:
+        wav_paths = []
+        lines = []
+        for text, output_path in items:
+            fd, wav_path = tempfile.mkstemp(suffix=".wav", dir=os.path.dirname(os.path.abspath(output_path)))
+            os.close(fd)
+            wav_paths.append(wav_path)
+            lines.append(json.dumps({"text": text, "output_file": wav_path}, ensure_ascii=False))
+
+        errors = {}
+        try:
+            result = subprocess.run([self.executable, "--model", self.model, "--json-input"],
+                                    input="\n".join(lines) + "\n", text=True, capture_output=True)
+            for (text, output_path), wav_path in zip(items, wav_paths):
+                if os.path.getsize(wav_path) == 0:
+                    errors[text] = result.stderr.strip() or f"piper exited with {result.returncode}"
+                    continue
+                try:
+                    convert_wav(wav_path, output_path)
+                    errors[text] = None
+                except Exception as e:
+                    errors[text] = str(e)
+        finally:
+            for wav_path in wav_paths:
+                if os.path.exists(wav_path):
+                    os.remove(wav_path)
+        return errors
+
+
+class FakeBackend(TTSBackend):
+    """
+    Deterministic offline backend for tests: a short WAV tone derived from the
+    text's hash, whatever the output file's extension
+    """
+
+    name = "fake"
+    batch_size = 32
+
+    def __init__(self, sample_rate: int = 8000):
+        self.sample_rate = sample_rate
+        self.calls = 0
+
+    def synthesize(self, text: str, output_path: str, lang: str = "no"):
+        self.calls += 1
+        digest = hashlib.sha256(f"{lang}:{text}".encode("utf-8")).digest()
+        frequency = 200 + digest[0] * 2
+        frames = int(self.sample_rate * (0.2 + 0.02 * len(text)))
+        samples = b"".join(
+            struct.pack("<h", int(8000 * math.sin(2 * math.pi * frequency * i / self.sample_rate)))
+            for i in range(frames)
+        )
+        with wave.open(output_path, 'wb') as wav_file:
+            wav_file.setnchannels(1)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(self.sample_rate)
+            wav_file.writeframes(samples)
+
+
+def create_tts_backend(preferred: Optional[str] = None, **options) -> TTSBackend:
+    """Create the configured TTS backend: the argument, else $PREPP_TTS_BACKEND, else gTTS"""
+    backends = {
+        "gtts": GTTSBackend,
+        "espeak": EspeakBackend,
+        "piper": PiperBackend,
+        "fake": FakeBackend
+    }
+    name = (preferred or os.environ.get("PREPP_TTS_BACKEND") or "gtts").lower()
+    if name not in backends:
+        raise ValueError(f"Unknown TTS backend '{name}' (choose from {', '.join(backends)})")
+    return backends[name](**options)
@@ -1,18 +1,32 @@
-from gtts import gTTS
 import os
+import sys
+
+# The shared audio store and TTS backends live in development/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'development'))
+
+from audio_store import AudioStore
+from tts_backends import create_tts_backend
 
 AUDIO_DIR = "audio"
 os.makedirs(AUDIO_DIR, exist_ok=True)
 
+audio_store = AudioStore()
+tts_backend = create_tts_backend()  # $PREPP_TTS_BACKEND, else gTTS
+
 def generate_audio(word):
     filename = word.strip() + ".mp3"
     filepath = os.path.join(AUDIO_DIR, filename)
 
     if not os.path.exists(filepath):
-        print(f"💾 Generating: {filepath}")
-        tts = gTTS(text=word, lang='no')
-        tts.save(filepath)
+        def synthesize(store_path):
+            tts_backend.synthesize(word, store_path, lang='no')
+
+        if audio_store.materialize(word, filepath, synthesize, lang='no', voice=tts_backend.voice_id):
+            print(f"💾 Generating: {filepath}")
+        else:
+            print(f"♻️ Reused stored audio: {filepath}")
     else:
+        # Not adopted into the shared store: which backend made it is unknown
         print(f"✅ Exists: {filepath}")
 
 # Load words from file
@@ -1,64 +1,129 @@
 from pydub import AudioSegment
+import argparse
+import io
 import os
+import sys
+
+# The MP3 frame helpers and segment index live in development/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'development'))
+
+from mp3_frames import append_frames, audio_frames, duration_seconds, needs_cleanup, strip_file, stream_format
+from segment_index import SegmentIndex, index_path_for
 
 # Settings
 AUDIO_DIR = "audio"
 OUTPUT_FILE = "all_words_merged.mp3"
 MERGED_LOG = "merged_log.txt"
+INDEX_FILE = index_path_for(OUTPUT_FILE)  # Byte/time offsets of each word's block
 REPEAT_COUNT = 3
 SILENCE_BETWEEN_REPEATS_MS = 3000  # 3 seconds
+DEFAULT_SAMPLE_RATE = 24000  # gTTS output
+DEFAULT_CHANNELS = 1
+BITRATE = "64k"
+
+
+def load_merged_files():
+    """Load the log of already-merged files"""
+    if os.path.exists(MERGED_LOG):
+        with open(MERGED_LOG, "r", encoding="utf-8") as f:
+            return set(line.strip() for line in f if line.strip())
+    return set()
+
+
+def log_merged(filename):
+    with open(MERGED_LOG, "a", encoding="utf-8") as log_file:
+        log_file.write(filename + "\n")
 
-# Load or initialize the log of already-merged files
-if os.path.exists(MERGED_LOG):
-    with open(MERGED_LOG, "r", encoding="utf-8") as f:
-        merged_files = set(line.strip() for line in f if line.strip())
-else:
-    merged_files = set()
 
-# Silence segment between repeats
-silence = AudioSegment.silent(duration=SILENCE_BETWEEN_REPEATS_MS)
+def encode_block(filepath, sample_rate, channels):
+    """Encode one word's repeat block (word + silence, REPEAT_COUNT times) as bare
+    MP3 frames in the merged file's format. Only this block is held in memory."""
+    word_audio = AudioSegment.from_file(filepath).set_frame_rate(sample_rate).set_channels(channels)
+    silence = AudioSegment.silent(duration=SILENCE_BETWEEN_REPEATS_MS, frame_rate=sample_rate)
+    block = (word_audio + silence.set_channels(channels)) * REPEAT_COUNT
 
-# Start with existing merged audio if it exists, otherwise empty
-if os.path.exists(OUTPUT_FILE):
-    final_audio = AudioSegment.from_mp3(OUTPUT_FILE)
-else:
-    final_audio = AudioSegment.empty()
+    buffer = io.BytesIO()
+    block.export(buffer, format="mp3", bitrate=BITRATE, parameters=["-write_xing", "0"])
+    return audio_frames(buffer.getvalue())
 
-# Track new files added
-new_files_processed = []
 
-# Process audio files in the folder
-for filename in sorted(os.listdir(AUDIO_DIR)):
-    if not filename.endswith(".mp3"):
-        continue
+def merge(rebuild=False):
+    """Append repeat blocks for audio files not merged yet. Existing audio is
+    never decoded: new blocks are encoded on their own and their frames
+    appended, so run time depends only on the number of new files."""
+    if rebuild:
+        for path in (OUTPUT_FILE, MERGED_LOG, INDEX_FILE):
+            if os.path.exists(path):
+                os.remove(path)
 
-    filepath = os.path.join(AUDIO_DIR, filename)
+    # Match the existing stream so the appended frames decode as one file
+    output_format = stream_format(OUTPUT_FILE) if os.path.exists(OUTPUT_FILE) else None
+    if output_format:
+        if needs_cleanup(OUTPUT_FILE):
+            # One-time stream copy of a file written by a full re-encode
+            print(f"🧹 Removing tags from {OUTPUT_FILE} so it can be appended to")
+            strip_file(OUTPUT_FILE)
+        sample_rate, channels = output_format.sample_rate, output_format.channels
+    else:
+        sample_rate, channels = DEFAULT_SAMPLE_RATE, DEFAULT_CHANNELS
 
-    if filename in merged_files:
-        print(f"✅ Already merged: {filename}")
-        continue
+    # A block is committed once it is indexed: frames past the last entry come
+    # from a run that died mid-merge, and are merged again below
+    index = SegmentIndex(INDEX_FILE)
+    removed = index.drop_uncommitted(OUTPUT_FILE)
+    if removed:
+        print(f"🩹 Removed {removed} bytes left by an interrupted run from {OUTPUT_FILE}")
 
-    try:
-        word_audio = AudioSegment.from_mp3(filepath)
-        repeated_audio = AudioSegment.empty()
+    # Audio merged before the index existed becomes one unnamed region
+    if index.cover(OUTPUT_FILE):
+        print(f"📇 Indexed existing audio in {OUTPUT_FILE} as one region")
 
-        for _ in range(REPEAT_COUNT):
-            repeated_audio += word_audio + silence
+    # Blocks indexed by a run that died before logging them are merged already
+    merged_files = load_merged_files()
+    for entry in index.entries:
+        if entry["file"] and entry["file"] not in merged_files:
+            log_merged(entry["file"])
+            merged_files.add(entry["file"])
 
-        final_audio += repeated_audio
+    # Track new files added
+    new_files_processed = []
+
+    # Process audio files in the folder
+    for filename in sorted(os.listdir(AUDIO_DIR)):
+        if not filename.endswith(".mp3"):
+            continue
+
+        filepath = os.path.join(AUDIO_DIR, filename)
+
+        if filename in merged_files:
+            print(f"✅ Already merged: {filename}")
+            continue
+
+        try:
+            frames = encode_block(filepath, sample_rate, channels)
+            offset = append_frames(OUTPUT_FILE, frames)
+            index.record(os.path.splitext(filename)[0], filename, offset, len(frames),
+                         duration_seconds(frames))
+        except Exception as e:
+            print(f"❌ Error processing {filename}: {e}")
+            continue
+
+        # The index entry above commits the block; the log is brought in line
+        # with it at startup if a run dies before this line
+        log_merged(filename)
         new_files_processed.append(filename)
         print(f"🔄 Added: {filename}")
 
-    except Exception as e:
-        print(f"❌ Error processing {filename}: {e}")
+    if new_files_processed:
+        print(f"\n🎉 Updated {OUTPUT_FILE} with {len(new_files_processed)} new file(s).")
+    else:
+        print("\nℹ️ No new audio files to merge.")
+    return new_files_processed
 
-# Save the updated merged audio
-if new_files_processed:
-    final_audio.export(OUTPUT_FILE, format="mp3")
-    print(f"\n🎉 Updated {OUTPUT_FILE} with {len(new_files_processed)} new file(s).")
 
-    with open(MERGED_LOG, "a", encoding="utf-8") as log_file:
-        for filename in new_files_processed:
-            log_file.write(filename + "\n")
-else:
-    print("\nℹ️ No new audio files to merge.")
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Append new word audio to the merged listening track")
+    parser.add_argument("--rebuild", action="store_true",
+                        help=f"start {OUTPUT_FILE} and {MERGED_LOG} over from scratch")
+    args = parser.parse_args()
+    merge(rebuild=args.rebuild)
@@ -53,6 +53,8 @@ async function loadChapterWords(chapterId) {
         
         const data = await response.json();
         wordsDatabase = data;
+        tagSpriteWords(data);
+        loadChapterSprite(data);  // In the background; words play from files until it's ready
         console.log('✅ Loaded words from chapter system:', {
             chapter: chapterId,
             easy: data.easy.length,
@@ -352,6 +354,130 @@ function loadNextWord() {
     startTimer();
 }
 
+// Optimized encodings written by export_words.py --optimize-audio, best first
+const AUDIO_FORMATS = [
+    { name: 'opus', type: 'audio/ogg; codecs="opus"' },
+    { name: 'aac', type: 'audio/mp4; codecs="mp4a.40.2"' },
+    { name: 'mp3', type: 'audio/mpeg' }
+];
+let playableFormats = null;
+
+// Pick the smallest audio file this browser can play (falls back to the original MP3)
+function pickAudioSource(word) {
+    if (word.sources) {
+        if (playableFormats === null) {
+            const probe = document.createElement('audio');
+            playableFormats = AUDIO_FORMATS.filter(format => probe.canPlayType(format.type) !== '');
+        }
+        for (const format of playableFormats) {
+            if (word.sources[format.name]) {
+                return word.sources[format.name];
+            }
+        }
+    }
+    return word.audio || `audio/${encodeURIComponent(word.word)}.mp3`;
+}
+
+// Chapter audio sprite written by export_words.py: one request per chapter, decoded once
+const spriteState = {
+    url: null,
+    buffer: null,
+    context: null
+};
+
+// Remember which sprite each word's offsets refer to
+function tagSpriteWords(data) {
+    if (!data.sprite) return;
+    ['easy', 'medium', 'hard'].forEach(level => {
+        data[level].forEach(word => {
+            if (word.sprite) {
+                word.spriteUrl = data.sprite;
+            }
+        });
+    });
+}
+
+async function loadChapterSprite(data) {
+    if (!data.sprite || spriteState.url === data.sprite) return;
+    
+    const AudioContextClass = window.AudioContext || window.webkitAudioContext;
+    if (!AudioContextClass) return;
+    
+    spriteState.url = data.sprite;
+    spriteState.buffer = null;
+    try {
+        if (!spriteState.context) {
+            spriteState.context = new AudioContextClass();
+        }
+        const response = await fetch(data.sprite);
+        if (!response.ok) {
+            throw new Error(`HTTP ${response.status}: ${response.statusText}`);
+        }
+        const arrayBuffer = await response.arrayBuffer();
+        // Callback form for older Safari
+        const buffer = await new Promise((resolve, reject) => {
+            spriteState.context.decodeAudioData(arrayBuffer, resolve, reject);
+        });
+        if (spriteState.url === data.sprite) {
+            spriteState.buffer = buffer;
+            console.log('✅ Loaded audio sprite:', data.sprite, `(${buffer.duration.toFixed(1)}s)`);
+        }
+    } catch (error) {
+        // Words keep playing from their own files
+        console.error('❌ Could not load audio sprite:', data.sprite, error);
+    }
+}
+
+// Plays one word's slice of the sprite; behaves like the Audio elements it replaces
+class SpriteClip {
+    constructor(word) {
+        this.word = word;
+        this.src = `${word.spriteUrl}#t=${word.sprite[0]},${word.sprite[0] + word.sprite[1]}`;
+        this.source = null;
+        this.listeners = {};
+        this.currentTime = 0;
+    }
+    
+    addEventListener(type, callback) {
+        (this.listeners[type] = this.listeners[type] || []).push(callback);
+    }
+    
+    play() {
+        const context = spriteState.context;
+        const ready = context.state === 'suspended' ? context.resume() : Promise.resolve();
+        return ready.then(() => {
+            const source = context.createBufferSource();
+            source.buffer = spriteState.buffer;
+            source.connect(context.destination);
+            source.onended = () => {
+                // Not fired for pause(), like an Audio element
+                if (this.source === source) {
+                    this.source = null;
+                    (this.listeners.ended || []).forEach(callback => callback());
+                }
+            };
+            this.source = source;
+            source.start(0, this.word.sprite[0], this.word.sprite[1]);
+        });
+    }
+    
+    pause() {
+        if (this.source) {
+            const source = this.source;
+            this.source = null;
+            source.stop();
+        }
+    }
+}
+
+// Audio for a word: a slice of the loaded chapter sprite, else its own file
+function createWordAudio(word) {
+    if (word.sprite && word.spriteUrl === spriteState.url && spriteState.buffer) {
+        return new SpriteClip(word);
+    }
+    return new Audio(pickAudioSource(word));
+}
+
 function playAudio() {
     console.log('🎵🎵🎵 REAL AUDIO FUNCTION CALLED - NO ROBOTIC VOICE! 🎵🎵🎵');
     console.log('Current word:', gameState.currentWord);
@@ -370,9 +496,8 @@ function playAudio() {
         console.log('🎵 Playing REAL MP3 file:', gameState.currentWord.audio);
         console.log('Word object:', gameState.currentWord);
         
-        // Create NEW audio element every time to avoid caching issues
-        gameState.currentAudio = new Audio();
-        gameState.currentAudio.src = gameState.currentWord.audio;
+        // Create NEW audio element every time to avoid caching issues (sprite slices play from memory)
+        gameState.currentAudio = createWordAudio(gameState.currentWord);
         console.log('🎵 Audio element created with src:', gameState.currentAudio.src);
         
         // Add event listeners for debugging
@@ -980,6 +1105,12 @@ if ('serviceWorker' in navigator) {
     navigator.serviceWorker.register('sw.js').catch(() => {
         console.log('Service worker registration failed');
     });
+    // Pick up newly exported chapters and audio (only changed files are downloaded)
+    navigator.serviceWorker.ready.then(registration => {
+        if (registration.active) {
+            registration.active.postMessage({ type: 'sync-precache' });
+        }
+    });
 }
 
 // ===========================
@@ -1056,6 +1187,8 @@ async function loadListeningWords(chapterId) {
         }
         
         const data = await response.json();
+        tagSpriteWords(data);
+        loadChapterSprite(data);
         
         // Combine all difficulty levels
         const allWords = [
@@ -1201,8 +1334,8 @@ function playCurrentWord() {
     }
     
     // Create audio element
-    const audioPath = `audio/${encodeURIComponent(currentWord.word)}.mp3`;
-    listeningState.audio = new Audio(audioPath);
+    listeningState.audio = createWordAudio(currentWord);
+    const audioPath = listeningState.audio.src;
     
     // Play audio
     listeningState.audio.play().then(() => {
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Audio sprites for the mobile app
+Packs a chapter's MP3 clips into one file by concatenating their MPEG frames
+(a stream copy, no re-encode), with a table of where each word starts, so a
+chapter's audio loads in one request
+"""
+
+import hashlib
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'development'))
+
+from mp3_frames import audio_frames, duration_seconds, parse_frame_header
+
+SPRITE_DIR_NAME = "sprites"
+
+def build_sprite(clips, output_dir, name):
+    """Concatenate MP3 clips ({word: path}) into output_dir/<name>.<hash>.mp3.
+    Returns (file name, {word: [start seconds, duration seconds]}); clips
+    that can't join the sprite (unreadable, or a different sample rate or
+    channel count than the first clip) are left out."""
+    frames = bytearray()
+    offsets = {}
+    stream_format = None
+    position = 0.0
+    
+    for word, path in clips.items():
+        try:
+            with open(path, 'rb') as f:
+                clip = audio_frames(f.read())
+        except OSError as e:
+            print(f"   ⚠️ Not in sprite: {word} ({e})")
+            continue
+        if not clip:
+            print(f"   ⚠️ Not in sprite: {word} (not an MP3 file)")
+            continue
+        
+        header = parse_frame_header(clip[:4])
+        clip_format = (header.sample_rate, header.channels)
+        if stream_format is None:
+            stream_format = clip_format
+        elif clip_format != stream_format:
+            print(f"   ⚠️ Not in sprite: {word} ({header.sample_rate} Hz, {header.channels} channels)")
+            continue
+        
+        duration = duration_seconds(clip)
+        offsets[word] = [round(position, 4), round(duration, 4)]
+        position += duration
+        frames += clip
+    
+    if not offsets:
+        return None, {}
+    
+    data = bytes(frames)
+    filename = f"{name}.{hashlib.sha256(data).hexdigest()[:12]}.mp3"
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, filename)
+    if not os.path.exists(path):
+        with open(path + ".tmp", 'wb') as f:
+            f.write(data)
+        os.replace(path + ".tmp", path)
+    
+    # Older sprites of this chapter are no longer referenced
+    for old in os.listdir(output_dir):
+        if old != filename and old.startswith(f"{name}.") and old.endswith(".mp3"):
+            os.remove(os.path.join(output_dir, old))
+    return filename, offsets
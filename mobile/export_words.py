@@ -2,16 +2,29 @@
 """
 Export words from chapter system to mobile app format
 Creates separate JSON files for each chapter
+
+Exports are incremental: a chapter is only rebuilt when its words_metadata.json
+or audio files changed since the last export (tracked in export_manifest.json)
 """
 
+import argparse
+import hashlib
 import json
 import os
 import sys
+import time
 
 # Add parent directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'development'))
 
-from translation_service import TranslationService
+from persistence import atomic_write_json
+from translation_cache import PROVENANCE_MISS
+from optimize_audio import OUTPUT_DIR_NAME, optimize_audio
+from audio_sprite import SPRITE_DIR_NAME, build_sprite
+from precache_manifest import write_precache_manifest
+
+MANIFEST_FILE = "export_manifest.json"
+EXPORT_VERSION = 2  # Bump when the words_<chapter>.json format changes
 
 def load_chapter_words(chapter_path):
     """Load words from a chapter's metadata file"""
@@ -24,80 +37,255 @@ def load_chapter_words(chapter_path):
         data = json.load(f)
         return data.get('words', {})
 
-def export_to_mobile_format():
-    """Export words from each chapter to separate mobile-friendly JSON files"""
+def chapter_fingerprint(chapter_path):
+    """Hash of a chapter's words_metadata.json content and its audio file set
+    (names, sizes and modification times, so audio isn't read)"""
+    digest = hashlib.sha256()
+    metadata_file = os.path.join(chapter_path, 'data', 'words_metadata.json')
+    if os.path.exists(metadata_file):
+        with open(metadata_file, 'rb') as f:
+            digest.update(f.read())
+    
+    audio_dir = os.path.join(chapter_path, 'audio')
+    if os.path.isdir(audio_dir):
+        with os.scandir(audio_dir) as entries:
+            for entry in sorted(entries, key=lambda e: e.name):
+                stat = entry.stat()
+                digest.update(f"\0{entry.name}\0{stat.st_size}\0{stat.st_mtime_ns}".encode('utf-8'))
+    return digest.hexdigest()
+
+def load_manifest(mobile_dir):
+    """Fingerprints of the chapters as they were last exported"""
+    try:
+        with open(os.path.join(mobile_dir, MANIFEST_FILE), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get('version') != EXPORT_VERSION:
+        return {}
+    return manifest.get('chapters', {})
+
+def save_manifest(mobile_dir, chapters):
+    atomic_write_json(os.path.join(mobile_dir, MANIFEST_FILE),
+                      {'version': EXPORT_VERSION, 'chapters': chapters}, ensure_ascii=False)
+
+def resolve_missing_translations(chapter_path, words, translator):
+    """Translate words without a stored translation and store the results in
+    the chapter's metadata, so later exports don't look them up again.
+    Returns what to show for words that still have no translation."""
+    missing = [word for word, metadata in words.items() if not metadata.get('translation')]
+    unresolved = {}
+    if not missing:
+        return unresolved
     
-    # Initialize translation service
-    translator = TranslationService()
+    try:
+        translations = translator.get_translations(missing)
+    except Exception as e:
+        print(f"   ⚠️ Could not translate {len(missing)} words: {e}")
+        translations = {}
+    
+    resolved = 0
+    for word in missing:
+        translation = translations.get(word)
+        if translation and not translator.is_missing_translation(word, translation):
+            words[word]['translation'] = translation
+            resolved += 1
+        else:
+            unresolved[word] = translation or word
+    
+    if resolved:
+        # Rewrite only the words; other top-level keys (e.g. last_updated) are kept
+        metadata_file = os.path.join(chapter_path, 'data', 'words_metadata.json')
+        with open(metadata_file, 'r', encoding='utf-8') as f:
+            metadata = json.load(f)
+        metadata['words'] = words
+        atomic_write_json(metadata_file, metadata, ensure_ascii=False)
+        print(f"   💾 Stored {resolved} new translations in {chapter_path}")
+    return unresolved
+
+def unresolved_retry_time(translator, unresolved):
+    """When a chapter with untranslated words is worth exporting again: once
+    their cached misses expire, or at the next export if any of them wasn't
+    cached as a miss (e.g. the translation API couldn't be reached)"""
+    now = time.time()
+    cache = getattr(translator, 'persistent_cache', None)
+    if cache is None:
+        return now
+    for word in unresolved:
+        cached = cache.get(word)
+        if not cached or cached[1] != PROVENANCE_MISS:
+            return now
+    return now + cache.ttls.get(PROVENANCE_MISS, 0)
+
+def chapter_audio_sources(chapter_path, mobile_dir, words):
+    """Source audio file for each word: the chapter's own copy, else mobile/audio"""
+    sources = {}
+    for word, metadata in words.items():
+        audio_file = metadata.get('audio_file', f"{word}.mp3")
+        for path in (os.path.join(chapter_path, 'audio', audio_file), os.path.join(mobile_dir, 'audio', audio_file)):
+            if os.path.exists(path):
+                sources[word] = path
+                break
+    return sources
+
+def build_mobile_words(words, unresolved=None, optimized=None, sprite=None, sprite_offsets=None):
+    """Group a chapter's words by difficulty in the mobile app format.
+    optimized maps words to their transcoded files ({format: file name});
+    sprite_offsets maps words to [start, duration] in the chapter's sprite."""
+    unresolved = unresolved or {}
+    optimized = optimized or {}
+    sprite_offsets = sprite_offsets or {}
+    mobile_words = {
+        'easy': [],
+        'medium': [],
+        'hard': []
+    }
+    if sprite:
+        # One file with the whole chapter's audio; words without offsets play their own file
+        mobile_words['sprite'] = f"{SPRITE_DIR_NAME}/{sprite}"
+    
+    for word, metadata in words.items():
+        translation = metadata.get('translation') or unresolved.get(word)
+        
+        # Determine difficulty
+        difficulty = metadata.get('difficulty', 'medium')
+        
+        # Add to mobile format with audio file path
+        audio_file = metadata.get('audio_file', f"{word}.mp3")
+        word_entry = {
+            'word': word,
+            'translation': translation or 'translation not available',
+            'audio': f"audio/{audio_file}"  # Path to real MP3 file
+        }
+        if word in optimized:
+            # Smaller trimmed encodings; the app picks the first format it can play
+            word_entry['sources'] = {name: f"{OUTPUT_DIR_NAME}/{filename}"
+                                     for name, filename in optimized[word].items()}
+        if word in sprite_offsets:
+            word_entry['sprite'] = sprite_offsets[word]
+        
+        mobile_words[difficulty].append(word_entry)
+    return mobile_words
+
+def export_to_mobile_format(chapters_dir=None, mobile_dir=None, force=False, translator=None,
+                            optimize=False, workers=None, sprites=True):
+    """Export words from each chapter to separate mobile-friendly JSON files.
+    With optimize, chapter audio is also trimmed and transcoded (needs ffmpeg);
+    with sprites, each chapter's MP3s are also packed into one audio sprite.
+    Returns the names of the chapters that were (re)exported."""
     
     # Path to chapters
-    chapters_dir = os.path.join(os.path.dirname(__file__), '..', 'development', 'chapters')
-    mobile_dir = os.path.dirname(__file__)
+    chapters_dir = chapters_dir or os.path.join(os.path.dirname(__file__), '..', 'development', 'chapters')
+    mobile_dir = mobile_dir or os.path.dirname(os.path.abspath(__file__))
     
     if not os.path.exists(chapters_dir):
         print("❌ Chapters directory not found!")
-        return
+        return []
     
     print("🚀 Exporting words from each chapter separately...")
     print("=" * 60)
     
+    manifest = {} if force else load_manifest(mobile_dir)
+    exported_chapters = {}
+    exported = []
+    owns_translator = translator is None
+    
     # Process each chapter separately
     for chapter_name in sorted(os.listdir(chapters_dir)):
         chapter_path = os.path.join(chapters_dir, chapter_name)
         if not os.path.isdir(chapter_path):
             continue
-            
-        print(f"\n📚 Processing chapter: {chapter_name}...")
         
-        mobile_words = {
-            'easy': [],
-            'medium': [],
-            'hard': []
-        }
+        output_name = f'words_{chapter_name}.json'
+        output_file = os.path.join(mobile_dir, output_name)
+        fingerprint = chapter_fingerprint(chapter_path)
+        previous = manifest.get(chapter_name)
+        retry_unresolved = previous and previous.get('unresolved') \
+            and time.time() >= previous.get('retry_after', 0)
+        if previous and previous.get('fingerprint') == fingerprint and os.path.exists(output_file) \
+                and previous.get('optimized', False) == optimize and previous.get('sprites', False) == sprites \
+                and not retry_unresolved:
+            print(f"\n⏭️ Unchanged: {chapter_name}")
+            exported_chapters[chapter_name] = previous
+            continue
+        
+        print(f"\n📚 Processing chapter: {chapter_name}...")
         
         words = load_chapter_words(chapter_path)
         
         if not words:
             print(f"   ⚠️ No words found in {chapter_name}")
             continue
-            
-        for word, metadata in words.items():
-            # Get translation
-            translation = metadata.get('translation')
-            if not translation:
-                try:
-                    translation = translator.get_translation(word)
-                except Exception as e:
-                    print(f"   ⚠️ Could not translate '{word}': {e}")
-                    translation = word
-            
-            # Determine difficulty
-            difficulty = metadata.get('difficulty', 'medium')
-            
-            # Add to mobile format with audio file path
-            audio_file = metadata.get('audio_file', f"{word}.mp3")
-            word_entry = {
-                'word': word,
-                'translation': translation or 'translation not available',
-                'audio': f"audio/{audio_file}"  # Path to real MP3 file
+        
+        unresolved = {}
+        if any(not metadata.get('translation') for metadata in words.values()):
+            if translator is None:
+                # Only started when a chapter actually needs lookups
+                from translation_service import TranslationService
+                translator = TranslationService()
+            unresolved = resolve_missing_translations(chapter_path, words, translator)
+            fingerprint = chapter_fingerprint(chapter_path)
+        
+        optimized = {}
+        sources = chapter_audio_sources(chapter_path, mobile_dir, words) if optimize or sprites else {}
+        if optimize:
+            results = optimize_audio(list(sources.values()), os.path.join(mobile_dir, OUTPUT_DIR_NAME), workers)
+            optimized = {word: results[path] for word, path in sources.items() if path in results}
+            print(f"   🗜️ Optimized audio for {len(optimized)} of {len(words)} words")
+        
+        sprite, sprite_offsets = None, {}
+        if sprites:
+            # Prefer the trimmed MP3s; the sprite is a stream copy either way
+            clips = {
+                word: os.path.join(mobile_dir, OUTPUT_DIR_NAME, optimized[word]['mp3'])
+                if 'mp3' in optimized.get(word, {}) else path
+                for word, path in sources.items()
             }
-            
-            mobile_words[difficulty].append(word_entry)
+            sprite, sprite_offsets = build_sprite(clips, os.path.join(mobile_dir, SPRITE_DIR_NAME), chapter_name)
+            if sprite:
+                print(f"   🎞️ Packed {len(sprite_offsets)} of {len(words)} clips into {SPRITE_DIR_NAME}/{sprite}")
         
-        # Write chapter-specific file
-        output_file = os.path.join(mobile_dir, f'words_{chapter_name}.json')
+        mobile_words = build_mobile_words(words, unresolved, optimized, sprite, sprite_offsets)
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(mobile_words, f, indent=2, ensure_ascii=False)
+        # Write chapter-specific file
+        atomic_write_json(output_file, mobile_words, ensure_ascii=False)
+        exported_chapters[chapter_name] = {'fingerprint': fingerprint, 'output': output_name,
+                                           'optimized': optimize, 'sprites': sprites}
+        if unresolved:
+            # Still placeholders: looked up again once retrying can help
+            exported_chapters[chapter_name]['unresolved'] = sorted(unresolved)
+            exported_chapters[chapter_name]['retry_after'] = unresolved_retry_time(translator, unresolved)
+        exported.append(chapter_name)
         
-        total_words = sum(len(words) for words in mobile_words.values())
+        total_words = sum(len(mobile_words[level]) for level in ('easy', 'medium', 'hard'))
         print(f"   ✅ Exported {total_words} words to {output_file}")
         print(f"      - Easy: {len(mobile_words['easy'])} words")
-        print(f"      - Medium: {len(mobile_words['medium'])} words") 
+        print(f"      - Medium: {len(mobile_words['medium'])} words")
         print(f"      - Hard: {len(mobile_words['hard'])} words")
     
-    print(f"\n🎉 All chapters exported successfully!")
+    save_manifest(mobile_dir, exported_chapters)
+    
+    # Tells the service worker which files changed
+    write_precache_manifest(mobile_dir, [entry['output'] for entry in exported_chapters.values()])
+    
+    if owns_translator and translator is not None:
+        stats = translator.persistent_cache.get_stats() if translator.persistent_cache else None
+        translator.close()
+        if stats:
+            print(f"\n💾 Translation cache: {stats['hits']} hits, {stats['misses']} misses")
+    
+    print(f"\n🎉 Exported {len(exported)} changed chapters, "
+          f"{len(exported_chapters) - len(exported)} unchanged")
     print(f"📱 Your mobile app now loads words from the selected chapter!")
+    return exported
 
 if __name__ == "__main__":
-    export_to_mobile_format()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Export chapters to the mobile app")
+    parser.add_argument("--force", action="store_true", help="re-export every chapter")
+    parser.add_argument("--optimize-audio", action="store_true",
+                        help="trim and transcode audio to Opus/AAC/MP3 for phones (needs ffmpeg)")
+    parser.add_argument("--workers", type=int, help="audio optimization processes (default: CPU count)")
+    parser.add_argument("--no-sprites", action="store_true", help="don't pack chapter audio into sprites")
+    args = parser.parse_args()
+    export_to_mobile_format(force=args.force, optimize=args.optimize_audio, workers=args.workers,
+                            sprites=not args.no_sprites)
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Optimize word audio for the mobile app
+Trims leading/trailing silence and transcodes each clip to low-bitrate mono
+Opus and AAC with an MP3 fallback, using a local process pool. Outputs get
+content-hashed names, so browsers and the service worker can cache them forever.
+Needs pydub and ffmpeg.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'development'))
+
+from persistence import atomic_write_json
+
+OUTPUT_DIR_NAME = "audio_opt"
+MANIFEST_FILE = "optimize_manifest.json"
+
+# name: (file extension, ffmpeg codec, bitrate, pydub/ffmpeg container)
+FORMATS = {
+    "opus": ("ogg", "libopus", "24k", "ogg"),
+    "aac": ("m4a", "aac", "32k", "ipod"),
+    "mp3": ("mp3", "libmp3lame", "40k", "mp3")
+}
+SAMPLE_RATE = 24000
+SILENCE_THRESHOLD_DB = -45.0
+KEEP_SILENCE_MS = 40  # Left at each end so onsets aren't clipped
+
+# Changing any setting re-encodes every clip
+SETTINGS_KEY = json.dumps([FORMATS, SAMPLE_RATE, SILENCE_THRESHOLD_DB, KEEP_SILENCE_MS])
+
+def file_hash(path):
+    """SHA-256 of a file's content"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 16), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def hashed_name(data, extension):
+    """Content-addressed file name for encoded audio"""
+    return f"{hashlib.sha256(data).hexdigest()[:20]}.{extension}"
+
+def trim_silence(segment, threshold_db=SILENCE_THRESHOLD_DB, keep_ms=KEEP_SILENCE_MS):
+    """Remove leading and trailing silence from a pydub AudioSegment"""
+    from pydub.silence import detect_leading_silence
+    
+    start = detect_leading_silence(segment, silence_threshold=threshold_db)
+    end = len(segment) - detect_leading_silence(segment.reverse(), silence_threshold=threshold_db)
+    if start >= end:
+        return segment  # All silence (or too quiet to tell); leave it alone
+    return segment[max(0, start - keep_ms):min(len(segment), end + keep_ms)]
+
+def optimize_clip(source_path, output_dir):
+    """Trim and transcode one clip to every format. Runs in a worker process.
+    Returns {format: file name} (files already present aren't rewritten)."""
+    import io
+    from pydub import AudioSegment
+    
+    audio = AudioSegment.from_file(source_path).set_channels(1).set_frame_rate(SAMPLE_RATE)
+    audio = trim_silence(audio)
+    
+    outputs = {}
+    for name, (extension, codec, bitrate, container) in FORMATS.items():
+        buffer = io.BytesIO()
+        audio.export(buffer, format=container, codec=codec, bitrate=bitrate,
+                     parameters=["-map_metadata", "-1"])
+        data = buffer.getvalue()
+        filename = hashed_name(data, extension)
+        path = os.path.join(output_dir, filename)
+        if not os.path.exists(path):
+            with open(path + ".tmp", 'wb') as f:
+                f.write(data)
+            os.replace(path + ".tmp", path)
+        outputs[name] = filename
+    return outputs
+
+def load_manifest(output_dir):
+    """Earlier results: source content hash -> {format: file name}"""
+    try:
+        with open(os.path.join(output_dir, MANIFEST_FILE), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get('settings') != SETTINGS_KEY:
+        return {}
+    return manifest.get('clips', {})
+
+def optimize_audio(source_paths, output_dir, workers=None):
+    """Optimize clips in parallel, skipping sources optimized before.
+    Returns {source path: {format: file name}}; failed clips are left out."""
+    os.makedirs(output_dir, exist_ok=True)
+    clips = load_manifest(output_dir)
+    
+    source_hashes = {path: file_hash(path) for path in dict.fromkeys(source_paths)}
+    pending = {}
+    for path, content_hash in source_hashes.items():
+        outputs = clips.get(content_hash)
+        if not outputs or not all(os.path.exists(os.path.join(output_dir, name)) for name in outputs.values()):
+            pending.setdefault(content_hash, path)
+    
+    if pending:
+        print(f"🗜️ Optimizing {len(pending)} clips with {workers or os.cpu_count()} processes...")
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {content_hash: pool.submit(optimize_clip, path, output_dir)
+                       for content_hash, path in pending.items()}
+            for content_hash, future in futures.items():
+                try:
+                    clips[content_hash] = future.result()
+                except Exception as e:
+                    print(f"   ❌ Could not optimize {pending[content_hash]}: {e}")
+                    clips.pop(content_hash, None)
+        atomic_write_json(os.path.join(output_dir, MANIFEST_FILE),
+                          {'settings': SETTINGS_KEY, 'clips': clips}, ensure_ascii=False)
+    
+    return {path: clips[content_hash] for path, content_hash in source_hashes.items()
+            if content_hash in clips}
+
+def print_savings(results, output_dir):
+    """Compare source and optimized sizes"""
+    source_size = sum(os.path.getsize(path) for path in results)
+    for name in FORMATS:
+        size = sum(os.path.getsize(os.path.join(output_dir, outputs[name])) for outputs in results.values())
+        print(f"   {name}: {size / 1024:.0f} KB ({size * 100 / max(source_size, 1):.0f}% of "
+              f"{source_size / 1024:.0f} KB)")
+
+if __name__ == "__main__":
+    mobile_dir = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description="Trim and transcode mobile audio")
+    parser.add_argument("sources", nargs="*", help="audio files (default: everything in mobile/audio)")
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    args = parser.parse_args()
+    
+    sources = args.sources
+    if not sources:
+        audio_dir = os.path.join(mobile_dir, "audio")
+        sources = [os.path.join(audio_dir, name) for name in sorted(os.listdir(audio_dir))
+                   if name.lower().endswith(".mp3")]
+    output_dir = os.path.join(mobile_dir, OUTPUT_DIR_NAME)
+    results = optimize_audio(sources, output_dir, args.workers)
+    print(f"✅ {len(results)} of {len(sources)} clips optimized in {output_dir}")
+    if results:
+        print_savings(results, output_dir)
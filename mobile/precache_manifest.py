@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Service worker precache manifest
+Lists every file the app needs offline (app shell, chapter data and chapter
+audio) with a content hash, plus a version derived from all of them.
+sw.js downloads only the files whose hash changed.
+
+Word audio is precached in one format every browser plays (MP3); the other
+optimized formats are cached when first played, and the manifest maps them
+to the precached file for when they can't be fetched.
+"""
+
+import hashlib
+import json
+import os
+import sys
+from urllib.parse import quote
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'development'))
+
+from persistence import atomic_write_json
+
+MANIFEST_FILE = "precache-manifest.json"
+
+# Characters browsers leave unescaped in URL paths
+URL_SAFE = "/:@!$&'()*+,;=[]|^~"
+
+# Cached as "./" too, so the start page opens offline
+SHELL_FILES = ["index.html", "styles.css", "app.js", "manifest.json", "icon-192.png", "icon-512.png"]
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 16), b''):
+            digest.update(block)
+    return digest.hexdigest()[:16]
+
+def chapter_files(mobile_dir, output_name):
+    """Files a chapter needs: its words JSON, its sprite, and one audio file
+    (the optimized MP3, else the original) for every word the sprite doesn't
+    cover. Returns (files, {other format's path: precached path})."""
+    files = [output_name]
+    fallbacks = {}
+    with open(os.path.join(mobile_dir, output_name), 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if data.get('sprite'):
+        files.append(data['sprite'])
+    for level in ('easy', 'medium', 'hard'):
+        for word in data.get(level, []):
+            if data.get('sprite') and word.get('sprite'):
+                continue
+            sources = word.get('sources', {})
+            precached = sources.get('mp3') or word.get('audio')
+            if not precached:
+                continue
+            files.append(precached)
+            for path in [word.get('audio'), *sources.values()]:
+                if path and path != precached:
+                    fallbacks[path] = precached
+    return files, fallbacks
+
+def load_previous(mobile_dir):
+    """url -> entry from the last manifest, to reuse hashes of unchanged files"""
+    try:
+        with open(os.path.join(mobile_dir, MANIFEST_FILE), 'r', encoding='utf-8') as f:
+            return {entry['url']: entry for entry in json.load(f).get('files', [])}
+    except (OSError, ValueError, KeyError, TypeError):
+        return {}
+
+def write_precache_manifest(mobile_dir, chapter_outputs):
+    """Write precache-manifest.json for the shell and the given words_<chapter>.json
+    files. Files are only re-hashed when their size or modification time changed."""
+    previous = load_previous(mobile_dir)
+    paths = list(SHELL_FILES)
+    fallbacks = {}
+    for output_name in chapter_outputs:
+        files, chapter_fallbacks = chapter_files(mobile_dir, output_name)
+        paths.extend(files)
+        fallbacks.update(chapter_fallbacks)
+    
+    entries = []
+    for path in dict.fromkeys(paths):
+        full_path = os.path.join(mobile_dir, path)
+        if not os.path.exists(full_path):
+            print(f"   ⚠️ Not precached (missing): {path}")
+            continue
+        stat = os.stat(full_path)
+        url = quote(path, safe=URL_SAFE)  # The form browsers request, e.g. "audio/f%C3%B8re.mp3"
+        old = previous.get(url)
+        if old and old.get('size') == stat.st_size and old.get('mtime') == stat.st_mtime_ns:
+            content_hash = old['hash']
+        else:
+            content_hash = file_hash(full_path)
+        entries.append({'url': url, 'hash': content_hash, 'size': stat.st_size, 'mtime': stat.st_mtime_ns})
+    
+    index_entry = next((entry for entry in entries if entry['url'] == 'index.html'), None)
+    if index_entry:
+        entries.insert(0, dict(index_entry, url='./'))
+    
+    precached = {entry['url'] for entry in entries}
+    fallback_urls = {}
+    for path, target in sorted(fallbacks.items()):
+        target_url = quote(target, safe=URL_SAFE)
+        if target_url in precached:
+            fallback_urls[quote(path, safe=URL_SAFE)] = target_url
+    
+    lines = [f"{entry['url']} {entry['hash']}" for entry in entries]
+    lines.extend(f"{url} -> {target}" for url, target in fallback_urls.items())
+    version = hashlib.sha256("\n".join(lines).encode('utf-8')).hexdigest()[:12]
+    atomic_write_json(os.path.join(mobile_dir, MANIFEST_FILE),
+                      {'version': version, 'files': entries, 'fallbacks': fallback_urls}, ensure_ascii=False)
+    total = sum(entry['size'] for entry in entries)
+    print(f"📦 Precache manifest {version}: {len(entries)} files, {total / 1024 / 1024:.1f} MB")
+    return version
@@ -1,6 +1,18 @@
 // Service Worker for PREPP-Lingo PWA
+//
+// Precaches everything listed in precache-manifest.json (written by
+// export_words.py): app shell, chapter data and chapter audio. Each manifest
+// version gets its own cache; files whose hash didn't change are copied from
+// the previous cache, so an update only downloads changed files.
+// Word audio is precached as MP3 only; other formats are cached when played,
+// and offline they are answered with the precached MP3 (manifest "fallbacks").
 
-const CACHE_NAME = 'prepp-lingo-v1';
+const CACHE_PREFIX = 'prepp-lingo-';
+const SHELL_CACHE = 'prepp-lingo-shell';
+const RUNTIME_CACHE = 'prepp-lingo-runtime';
+const MANIFEST_URL = 'precache-manifest.json';
+
+// Used only when no precache manifest has been exported
 const urlsToCache = [
     './',
     './index.html',
@@ -9,33 +21,143 @@ const urlsToCache = [
     './manifest.json'
 ];
 
+// Audio not in the manifest (music, optimized formats) is cached when first played
+const RUNTIME_PATHS = ['/audio/', '/audio_opt/', '/sprites/', '/backgroundMusic/'];
+
+// Newest complete precache: the cache that holds its own manifest
+async function findCurrentCache() {
+    const names = (await caches.keys()).filter(name =>
+        name.startsWith(CACHE_PREFIX) && name !== SHELL_CACHE && name !== RUNTIME_CACHE);
+    for (const name of names.reverse()) {
+        const cache = await caches.open(name);
+        const response = await cache.match(MANIFEST_URL);
+        if (response) {
+            return { name, manifest: await response.json() };
+        }
+    }
+    return null;
+}
+
+// Bring the precache up to date with the server's manifest; true if it changed
+async function syncPrecache() {
+    const response = await fetch(MANIFEST_URL, { cache: 'no-store' });
+    if (!response.ok) {
+        throw new Error(`HTTP ${response.status}: ${response.statusText}`);
+    }
+    const manifest = await response.clone().json();
+    const cacheName = CACHE_PREFIX + manifest.version;
+    const current = await findCurrentCache();
+    if (current && current.name === cacheName) {
+        return false;
+    }
+
+    const cache = await caches.open(cacheName);
+    const previousCache = current ? await caches.open(current.name) : null;
+    const previousHashes = new Map(current ? current.manifest.files.map(file => [file.url, file.hash]) : []);
+
+    let downloaded = 0;
+    await Promise.all(manifest.files.map(async file => {
+        if (previousCache && previousHashes.get(file.url) === file.hash) {
+            const cached = await previousCache.match(file.url);
+            if (cached) {
+                await cache.put(file.url, cached);
+                return;
+            }
+        }
+        if (await cache.match(file.url)) {
+            return;  // Fetched by an interrupted earlier sync of this version
+        }
+        const fresh = await fetch(file.url, { cache: 'no-cache' });
+        if (!fresh.ok) {
+            throw new Error(`${file.url}: HTTP ${fresh.status}`);
+        }
+        await cache.put(file.url, fresh);
+        downloaded++;
+    }));
+
+    // Stored last: only a complete cache counts as current
+    await cache.put(MANIFEST_URL, response);
+    await deleteOldCaches(cacheName);
+    console.log(`📦 Precache ${manifest.version}: ${downloaded} of ${manifest.files.length} files downloaded`);
+    return true;
+}
+
+// Precached stand-in for an audio file that couldn't be fetched, or undefined
+async function precachedFallback(request) {
+    const current = await findCurrentCache();
+    const fallbacks = (current && current.manifest.fallbacks) || {};
+    const url = new URL(request.url);
+    url.search = '';
+    for (const [path, target] of Object.entries(fallbacks)) {
+        if (new URL(path, self.location).href === url.href) {
+            return caches.match(new URL(target, self.location).href);
+        }
+    }
+    return undefined;
+}
+
+async function deleteOldCaches(currentName) {
+    const names = await caches.keys();
+    await Promise.all(names
+        .filter(name => name !== currentName && name !== RUNTIME_CACHE)
+        .map(name => caches.delete(name)));
+}
+
 // Install Service Worker
 self.addEventListener('install', event => {
     event.waitUntil(
-        caches.open(CACHE_NAME)
-            .then(cache => cache.addAll(urlsToCache))
+        syncPrecache()
+            .catch(error => {
+                console.log('Precache manifest unavailable, caching the app shell only:', error);
+                return caches.open(SHELL_CACHE).then(cache => cache.addAll(urlsToCache));
+            })
+            .then(() => self.skipWaiting())
     );
 });
 
 // Fetch from cache
 self.addEventListener('fetch', event => {
+    if (event.request.method !== 'GET') {
+        return;
+    }
+    const url = new URL(event.request.url);
+    const sameOrigin = url.origin === self.location.origin;
+
     event.respondWith(
-        caches.match(event.request)
-            .then(response => response || fetch(event.request))
+        // Precache entries have no query string (index.html loads app.js?v=N)
+        caches.match(event.request, { ignoreSearch: sameOrigin })
+            .then(response => response || fetch(event.request).then(fresh => {
+                if (sameOrigin && fresh.status === 200 && RUNTIME_PATHS.some(path => url.pathname.includes(path))) {
+                    const copy = fresh.clone();
+                    caches.open(RUNTIME_CACHE).then(cache => cache.put(event.request, copy));
+                }
+                return fresh;
+            }).catch(async error => {
+                // Offline: another format of the same clip may be precached
+                const fallback = sameOrigin ? await precachedFallback(event.request) : undefined;
+                if (fallback) {
+                    return fallback;
+                }
+                throw error;
+            }))
     );
 });
 
+// The app asks for a sync on every start, so new exports reach installed apps
+// even though this file didn't change
+self.addEventListener('message', event => {
+    if (event.data && event.data.type === 'sync-precache') {
+        event.waitUntil(
+            syncPrecache().catch(error => console.log('Precache sync failed:', error))
+        );
+    }
+});
+
 // Update Service Worker
 self.addEventListener('activate', event => {
     event.waitUntil(
-        caches.keys().then(cacheNames => {
-            return Promise.all(
-                cacheNames.map(cacheName => {
-                    if (cacheName !== CACHE_NAME) {
-                        return caches.delete(cacheName);
-                    }
-                })
-            );
-        })
+        findCurrentCache()
+            .then(current => deleteOldCaches(current ? current.name : SHELL_CACHE))
+            .then(() => self.clients.claim())
     );
 });